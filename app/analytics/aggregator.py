@@ -1,64 +1,310 @@
 from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import DateTime, and_, cast, delete, func, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert as pg_insert
+from app.core.config import settings
 from app.models.news import News
 from app.models.sentiment_aggregate import SentimentAggregate
+from app.models.sector_sentiment_latest import SectorSentimentLatest
+from app.models.aggregator_state import AggregatorState
+from app.models.news_ticker import NewsTicker
+from app.models.ticker_sentiment_aggregate import TickerSentimentAggregate
+from app.analytics.rollups import covering_base_buckets, prune_tiers, update_rollups
 
-WINDOW_MINUTES = 120  # 2 hours
+JOB_NAME = "sector_buckets"
+BUCKET = timedelta(minutes=settings.AGG_BUCKET_MINUTES)
 
-async def compute_and_store_sentiment_aggregates(db: AsyncSession):
-    """
-    Create sector-level sentiment aggregates using latest processed news.
-    Corrected to use one consistent timestamp, avoid unknown sector 0, and include confidence scoring.
-    """
-    # 🔹 Use one consistent timestamp from Python for accuracy
-    now = datetime.now(timezone.utc)
-    window_start = now - timedelta(minutes=WINDOW_MINUTES)
+# Re-read a little before the watermark: processed_at is stamped before the
+# writing transaction commits, so rows can become visible slightly "late".
+# Buckets are recomputed from scratch, so the overlap never double counts.
+WATERMARK_LAG = timedelta(minutes=5)
+
+# Bounds the size of each recompute / upsert (first run backfills everything)
+BUCKETS_PER_PASS = 200
+
+# Articles land in the bucket of their publication time
+EVENT_TIME = func.coalesce(News.published_at, News.fetched_at)
+
+
+def bucket_start(ts):
+    """SQL expression flooring a timestamp to its aligned bucket."""
+    seconds = int(BUCKET.total_seconds())
+    return func.to_timestamp(func.floor(func.extract("epoch", ts) / seconds) * seconds)
+
+
+async def _load_watermark(db: AsyncSession) -> Optional[datetime]:
+    state = await db.get(AggregatorState, JOB_NAME)
+    return state.watermark if state else None  # type: ignore
 
-    print(f"\n📊 Aggregating data from {window_start} to {now}")
 
-    # 🔹 Aggregate only valid (processed) sentiment data
-    q = (
+async def _store_watermark(db: AsyncSession, watermark: datetime) -> None:
+    stmt = pg_insert(AggregatorState).values(name=JOB_NAME, watermark=watermark)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AggregatorState.name],
+        set_={"watermark": stmt.excluded.watermark, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+
+
+def _affected_buckets_query(since: Optional[datetime], until: datetime):
+    q = select(bucket_start(EVENT_TIME).label("bucket")).distinct().where(News.processed_at <= until)
+    if since is not None:
+        q = q.where(News.processed_at > since)
+    return q
+
+
+async def _affected_buckets(db: AsyncSession, since: Optional[datetime], until: datetime) -> List[datetime]:
+    rows = (await db.execute(_affected_buckets_query(since, until))).all()
+    return [r.bucket for r in rows if r.bucket is not None]
+
+
+def _bucket_starts(buckets: List[datetime]):
+    return (
+        select(func.unnest(cast(array(buckets), ARRAY(DateTime(timezone=True)))).label("start"))
+        .subquery()
+    )
+
+
+def _sector_buckets_query(buckets: List[datetime], now: datetime):
+    # 🔹 Range join on the buckets, served by ix_news_event_time
+    starts = _bucket_starts(buckets)
+    return (
         select(
             News.sector_id,
-            func.avg(News.sentiment_score).label("avg_sentiment"),
-            func.avg(News.impact_confidence).label("avg_confidence"),
+            starts.c.start.label("window_start"),
+            func.sum(News.sentiment_score).label("sentiment_sum"),
+            func.sum(News.impact_confidence).label("relevance_sum"),
             func.count(News.id).label("news_count"),
         )
-        .where(News.processed_at >= window_start)
-        .where(News.sector_id.isnot(None))  # avoid unassigned
+        .join(starts, and_(
+            EVENT_TIME >= starts.c.start,
+            EVENT_TIME < starts.c.start + BUCKET,
+        ))
+        .where(News.processed_at.isnot(None))
+        .where(News.processed_at <= now)
+        .where(News.sentiment_score.isnot(None))
+        .where(News.sector_id.isnot(None))
+        .where(News.sector_id != 0)  # avoid unassigned
         .where(func.cardinality(News.tickers) > 0)  # ensure relevance
-        .group_by(News.sector_id)
+        .group_by(News.sector_id, starts.c.start)
     )
 
-    result = await db.execute(q)
-    rows = result.all()
 
-    if not rows:
-        print("⚠ No relevant sentiment data found in this time window.")
-        return
+async def _recompute_buckets(db: AsyncSession, buckets: List[datetime], now: datetime) -> Tuple[int, Set[int]]:
+    """
+    Rebuild every sector row of these buckets from their articles.
+    Returns the rows written and every sector whose buckets changed.
+    """
+    rows = (await db.execute(_sector_buckets_query(buckets, now))).all()
+
+    values = [
+        {
+            "sector_id": r.sector_id,
+            "window_start": r.window_start,
+            "window_end": r.window_start + BUCKET,
+            "sentiment_sum": float(r.sentiment_sum or 0.0),
+            "relevance_sum": float(r.relevance_sum or 0.0),
+            "news_count": int(r.news_count),
+            "avg_sentiment": float(r.sentiment_sum or 0.0) / r.news_count,
+            "avg_relevance": float(r.relevance_sum or 0.0) / r.news_count,  # impact_confidence as relevance
+            "avg_price_change": 0.0,  # reserved for future price API integration
+        }
+        for r in rows
+    ]
+
+    # 🔹 Sectors that no longer have news in a recomputed bucket
+    stale = delete(SentimentAggregate).where(SentimentAggregate.window_start.in_(buckets))
+    if values:
+        stale = stale.where(
+            tuple_(SentimentAggregate.sector_id, SentimentAggregate.window_start).notin_(
+                [(v["sector_id"], v["window_start"]) for v in values]
+            )
+        )
+    removed = (await db.execute(stale.returning(SentimentAggregate.sector_id))).scalars().all()
 
-    saved = 0
-    for row in rows:
-        sector_id = row.sector_id
-        avg_sentiment = float(row.avg_sentiment or 0.0)
-        avg_confidence = float(row.avg_confidence or 0.0)
-        news_count = int(row.news_count or 0)
-
-        print(f"📁 Saving → Sector {sector_id}, Avg sentiment {avg_sentiment}, Confidence {avg_confidence}, Count {news_count}")
-
-        aggregate = SentimentAggregate(
-            sector_id=sector_id,
-            window_start=window_start,
-            window_end=now,
-            avg_sentiment=avg_sentiment,
-            avg_relevance=avg_confidence,   # reuse impact_confidence as relevance score
-            avg_price_change=0.0,           # reserved for future price API integration
-            news_count=news_count,
+    await _upsert(db, SentimentAggregate, ["sector_id", "window_start"], values)
+    return len(values), {v["sector_id"] for v in values} | set(removed)
+
+
+def _latest_query(sector_ids: List[int]):
+    # 🔹 One backward step on uq_sentiment_aggregates_sector_window per sector
+    return (
+        select(
+            SentimentAggregate.sector_id, SentimentAggregate.window_start, SentimentAggregate.window_end,
+            SentimentAggregate.avg_sentiment, SentimentAggregate.avg_relevance, SentimentAggregate.news_count,
         )
-        db.add(aggregate)
-        saved += 1
+        .distinct(SentimentAggregate.sector_id)
+        .where(SentimentAggregate.sector_id.in_(sector_ids))
+        .order_by(SentimentAggregate.sector_id, SentimentAggregate.window_start.desc())
+    )
+
+
+async def _refresh_latest(db: AsyncSession, sector_ids: Iterable[int]) -> int:
+    """Point sector_sentiment_latest at the newest remaining bucket of each sector."""
+    sector_ids = sorted(sector_ids)
+    if not sector_ids:
+        return 0
+
+    values = [dict(r._mapping) for r in (await db.execute(_latest_query(sector_ids))).all()]
+
+    # Sectors left without any bucket drop out of the snapshot
+    gone = set(sector_ids) - {v["sector_id"] for v in values}
+    if gone:
+        await db.execute(delete(SectorSentimentLatest).where(SectorSentimentLatest.sector_id.in_(gone)))
 
-    await db.commit()
-    print(f"💾 {saved} aggregates stored successfully.")
+    await _upsert(db, SectorSentimentLatest, ["sector_id"], values)
+    return len(values)
+
+
+async def _sectors_with_pruned_latest(db: AsyncSession) -> Set[int]:
+    """Sectors whose latest snapshot refers to a bucket no longer in sentiment_aggregates."""
+    q = select(SectorSentimentLatest.sector_id).where(
+        ~select(SentimentAggregate.sector_id)
+        .where(SentimentAggregate.sector_id == SectorSentimentLatest.sector_id)
+        .where(SentimentAggregate.window_start == SectorSentimentLatest.window_start)
+        .exists()
+    )
+    return set((await db.execute(q)).scalars().all())
+
+
+def _ticker_buckets_query(buckets: List[datetime], now: datetime):
+    starts = _bucket_starts(buckets)
+    confidence = func.coalesce(NewsTicker.impact_confidence, 0.0)
+    return (
+        select(
+            NewsTicker.ticker,
+            starts.c.start.label("window_start"),
+            func.count().label("news_count"),
+            func.sum(NewsTicker.sentiment_score).label("sentiment_sum"),
+            func.sum(confidence).label("confidence_sum"),
+            func.count(NewsTicker.impact_confidence).label("confidence_count"),
+            func.sum(NewsTicker.sentiment_score * confidence).label("weighted_sum"),
+        )
+        .join(starts, and_(
+            NewsTicker.published_at >= starts.c.start,
+            NewsTicker.published_at < starts.c.start + BUCKET,
+        ))
+        .where(NewsTicker.processed_at.isnot(None))
+        .where(NewsTicker.processed_at <= now)
+        .where(NewsTicker.sentiment_score.isnot(None))
+        .group_by(NewsTicker.ticker, starts.c.start)
+    )
+
+
+async def _recompute_ticker_buckets(db: AsyncSession, buckets: List[datetime], now: datetime) -> int:
+    """Rebuild every ticker row of these buckets from news_tickers."""
+    rows = (await db.execute(_ticker_buckets_query(buckets, now))).all()
+
+    values = [
+        {
+            "ticker": r.ticker,
+            "window_start": r.window_start,
+            "window_end": r.window_start + BUCKET,
+            "news_count": int(r.news_count),
+            "sentiment_sum": float(r.sentiment_sum),
+            "confidence_sum": float(r.confidence_sum),
+            "confidence_count": int(r.confidence_count),
+            "weighted_sum": float(r.weighted_sum),
+            "avg_sentiment": float(r.sentiment_sum) / r.news_count,
+            # Articles without an impact confidence don't count towards its average
+            "avg_confidence": float(r.confidence_sum) / r.confidence_count if r.confidence_count else None,
+            "weighted_score": float(r.weighted_sum) / float(r.confidence_sum) if r.confidence_sum else None,
+        }
+        for r in rows
+    ]
+
+    stale = delete(TickerSentimentAggregate).where(TickerSentimentAggregate.window_start.in_(buckets))
+    if values:
+        stale = stale.where(
+            tuple_(TickerSentimentAggregate.ticker, TickerSentimentAggregate.window_start).notin_(
+                [(v["ticker"], v["window_start"]) for v in values]
+            )
+        )
+    await db.execute(stale)
+
+    await _upsert(db, TickerSentimentAggregate, ["ticker", "window_start"], values)
+    return len(values)
+
+
+async def _upsert(db: AsyncSession, model, keys: List[str], values: List[dict]) -> None:
+    """INSERT ... ON CONFLICT (keys) DO UPDATE, in chunks below the bind-parameter limit."""
+    if not values:
+        return
+    per_chunk = max(1, 30000 // len(values[0]))
+    for i in range(0, len(values), per_chunk):
+        stmt = pg_insert(model).values(values[i:i + per_chunk])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={col: getattr(stmt.excluded, col) for col in values[0] if col not in keys}
+            | {"computed_at": func.now()},
+        )
+        await db.execute(stmt)
+
+
+async def compute_and_store_sentiment_aggregates(db: AsyncSession) -> dict:
+    """
+    Incrementally maintain sector and per-ticker sentiment in fixed,
+    aligned buckets (AGG_BUCKET_MINUTES wide, keyed on publication time).
+
+    Only news whose processed_at moved past the stored watermark is
+    considered; every bucket it touches is recomputed from its articles and
+    upserted, so late enrichment or sector assignment lands in the right
+    bucket and nothing is counted twice. The hourly / daily rollups over
+    those buckets, and the per-sector latest snapshot, are refreshed in the
+    same pass, before anything past retention is pruned. The caller commits.
+    """
+    now = datetime.now(timezone.utc)
+    watermark = await _load_watermark(db)
+    since = watermark - WATERMARK_LAG if watermark else None
+
+    buckets = await _affected_buckets(db, since, now)
+    if since is not None:
+        # Rollup spans reaching past base retention are rebuilt from news in
+        # full (a first run already covers every bucket that has news)
+        buckets = covering_base_buckets(buckets, now)
+    print(f"\n📊 Aggregating {len(buckets)} bucket(s) changed since {watermark or 'the beginning'}")
+
+    if not buckets:
+        await _store_watermark(db, now)
+        return {"buckets": 0, "rows": 0, "rollups": 0, "ticker_rows": 0, "latest": 0, "pruned": 0}
+
+    rows = rollups = ticker_rows = 0
+    touched: Set[int] = set()
+    for i in range(0, len(buckets), BUCKETS_PER_PASS):
+        chunk = buckets[i:i + BUCKETS_PER_PASS]
+        written, sectors = await _recompute_buckets(db, chunk, now)
+        rows += written
+        touched |= sectors
+        rollups += await update_rollups(db, chunk)
+        ticker_rows += await _recompute_ticker_buckets(db, chunk, now)
+
+    pruned = await prune_tiers(db) + await _prune_ticker_buckets(db, now)
+    # After pruning, so no snapshot points at a bucket that is gone
+    latest = await _refresh_latest(db, touched | await _sectors_with_pruned_latest(db))
+    await _store_watermark(db, now)
+    print(
+        f"💾 {rows} sector buckets, {rollups} rollups and {ticker_rows} ticker buckets "
+        f"upserted across {len(buckets)} bucket(s)."
+    )
+    if pruned:
+        print(f"🧹 Pruned {pruned} rows past tier retention")
+    return {
+        "buckets": len(buckets),
+        "rows": rows,
+        "rollups": rollups,
+        "ticker_rows": ticker_rows,
+        "latest": latest,
+        "pruned": pruned,
+    }
+
+
+async def _prune_ticker_buckets(db: AsyncSession, now: datetime) -> int:
+    if not settings.TICKER_AGG_RETENTION_DAYS:
+        return 0
+    cutoff = now - timedelta(days=settings.TICKER_AGG_RETENTION_DAYS)
+    result = await db.execute(
+        delete(TickerSentimentAggregate).where(TickerSentimentAggregate.window_start < cutoff)
+    )
+    return result.rowcount or 0
@@ -0,0 +1,229 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy import DateTime, and_, cast, delete, func, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.sentiment_aggregate import SentimentAggregate
+from app.models.sentiment_rollup import SentimentRollup
+
+
+@dataclass(frozen=True)
+class Tier:
+    name: str
+    width: timedelta
+    retention_days: int  # 0 = keep forever
+
+    def covers(self, since: datetime, now: datetime) -> bool:
+        return not self.retention_days or since >= now - timedelta(days=self.retention_days)
+
+
+# Finest first. The base tier is sentiment_aggregates itself.
+BASE_TIER = Tier(f"{settings.AGG_BUCKET_MINUTES}m", timedelta(minutes=settings.AGG_BUCKET_MINUTES),
+                 settings.ROLLUP_RETENTION_DAYS_BASE)
+ROLLUP_TIERS = [
+    Tier("1h", timedelta(hours=1), settings.ROLLUP_RETENTION_DAYS_HOURLY),
+    Tier("1d", timedelta(days=1), settings.ROLLUP_RETENTION_DAYS_DAILY),
+]
+TIERS = {t.name: t for t in [BASE_TIER, *ROLLUP_TIERS]}
+
+
+def floor_to(ts: datetime, width: timedelta) -> datetime:
+    seconds = int(width.total_seconds())
+    return datetime.fromtimestamp(int(ts.timestamp()) // seconds * seconds, tz=timezone.utc)
+
+
+def pick_tier(since: datetime, until: datetime, points: int, now: Optional[datetime] = None) -> Tier:
+    """
+    Coarsest tier still giving at least `points` buckets over the range,
+    among tiers whose retention reaches back to `since`.
+    """
+    now = now or datetime.now(timezone.utc)
+    span = until - since
+    available = [t for t in TIERS.values() if t.covers(since, now)] or [ROLLUP_TIERS[-1]]
+    fitting = [t for t in available if span / t.width >= points]
+    return fitting[-1] if fitting else available[0]
+
+
+# -------------------------------------------------------------
+# MAINTENANCE
+# -------------------------------------------------------------
+def covering_base_buckets(base_buckets: Iterable[datetime], now: Optional[datetime] = None) -> List[datetime]:
+    """
+    The base buckets to recompute so every rollup over `base_buckets` can be
+    re-summed from complete base rows. A bucket whose rollup span starts
+    before the base tier's retention pulls in every other base bucket of
+    that span, since their rows may already be pruned; they are rebuilt from
+    news and pruned again at the end of the pass.
+    """
+    buckets = set(base_buckets)
+    if not BASE_TIER.retention_days:
+        return sorted(buckets)
+
+    now = now or datetime.now(timezone.utc)
+    oldest = now - timedelta(days=BASE_TIER.retention_days)
+    spans = {
+        (tier, start)
+        for tier in ROLLUP_TIERS
+        for start in {floor_to(b, tier.width) for b in buckets}
+        if start < oldest
+    }
+    for tier, start in spans:
+        slots = int(tier.width / BASE_TIER.width)
+        buckets.update(start + BASE_TIER.width * k for k in range(slots))
+    return sorted(buckets)
+
+
+async def update_rollups(db: AsyncSession, base_buckets: Iterable[datetime]) -> int:
+    """
+    Re-sum every rollup bucket that contains one of the changed base
+    buckets, whatever its age. The base rows of those spans must all be
+    present: callers recompute covering_base_buckets() and prune afterwards.
+    """
+    base_buckets = list(base_buckets)
+    written = 0
+    for tier in ROLLUP_TIERS:
+        starts = sorted({floor_to(b, tier.width) for b in base_buckets})
+        if starts:
+            written += await _rebuild(db, tier, starts)
+    return written
+
+
+async def _rebuild(db: AsyncSession, tier: Tier, starts: List[datetime]) -> int:
+    spans = (
+        select(func.unnest(cast(array(starts), ARRAY(DateTime(timezone=True)))).label("start"))
+        .subquery()
+    )
+    q = (
+        select(
+            SentimentAggregate.sector_id,
+            spans.c.start.label("window_start"),
+            func.sum(SentimentAggregate.sentiment_sum).label("sentiment_sum"),
+            func.sum(SentimentAggregate.relevance_sum).label("relevance_sum"),
+            func.sum(SentimentAggregate.news_count).label("news_count"),
+        )
+        .join(spans, and_(
+            SentimentAggregate.window_start >= spans.c.start,
+            SentimentAggregate.window_start < spans.c.start + tier.width,
+        ))
+        .group_by(SentimentAggregate.sector_id, spans.c.start)
+    )
+    rows = [r for r in (await db.execute(q)).all() if r.news_count]
+
+    values = [
+        {
+            "resolution": tier.name,
+            "sector_id": r.sector_id,
+            "window_start": r.window_start,
+            "window_end": r.window_start + tier.width,
+            "sentiment_sum": float(r.sentiment_sum or 0.0),
+            "relevance_sum": float(r.relevance_sum or 0.0),
+            "news_count": int(r.news_count),
+            "avg_sentiment": float(r.sentiment_sum or 0.0) / int(r.news_count),
+            "avg_relevance": float(r.relevance_sum or 0.0) / int(r.news_count),
+        }
+        for r in rows
+    ]
+
+    stale = (
+        delete(SentimentRollup)
+        .where(SentimentRollup.resolution == tier.name)
+        .where(SentimentRollup.window_start.in_(starts))
+    )
+    if values:
+        stale = stale.where(
+            tuple_(SentimentRollup.sector_id, SentimentRollup.window_start).notin_(
+                [(v["sector_id"], v["window_start"]) for v in values]
+            )
+        )
+    await db.execute(stale)
+
+    if values:
+        stmt = pg_insert(SentimentRollup).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SentimentRollup.resolution, SentimentRollup.sector_id, SentimentRollup.window_start],
+            set_={
+                col: getattr(stmt.excluded, col)
+                for col in ("window_end", "sentiment_sum", "relevance_sum", "news_count",
+                            "avg_sentiment", "avg_relevance")
+            } | {"computed_at": func.now()},
+        )
+        await db.execute(stmt)
+
+    return len(values)
+
+
+async def prune_tiers(db: AsyncSession) -> int:
+    """Drop rows older than each tier's retention."""
+    now = datetime.now(timezone.utc)
+    removed = 0
+
+    if BASE_TIER.retention_days:
+        cutoff = now - timedelta(days=BASE_TIER.retention_days)
+        result = await db.execute(
+            delete(SentimentAggregate).where(SentimentAggregate.window_start < cutoff)
+        )
+        removed += result.rowcount or 0
+
+    for tier in ROLLUP_TIERS:
+        if tier.retention_days:
+            cutoff = now - timedelta(days=tier.retention_days)
+            result = await db.execute(
+                delete(SentimentRollup)
+                .where(SentimentRollup.resolution == tier.name)
+                .where(SentimentRollup.window_start < cutoff)
+            )
+            removed += result.rowcount or 0
+
+    return removed
+
+
+# -------------------------------------------------------------
+# READS
+# -------------------------------------------------------------
+def history_query(
+    sector_id: int,
+    tier: Tier,
+    since: datetime,
+    until: datetime,
+    limit: int,
+    after: Optional[datetime] = None,
+):
+    """SELECT behind fetch_history (also EXPLAINed by check_query_plans.py)."""
+    if tier is BASE_TIER:
+        table = SentimentAggregate
+        q = select(table.window_start, table.window_end, table.avg_sentiment, table.news_count)
+    else:
+        table = SentimentRollup
+        q = (
+            select(table.window_start, table.window_end, table.avg_sentiment, table.news_count)
+            .where(table.resolution == tier.name)
+        )
+
+    return (
+        q.where(table.sector_id == sector_id)
+        .where(table.window_start > after if after is not None else table.window_start >= since)
+        .where(table.window_start < until)
+        .order_by(table.window_start.asc())
+        .limit(limit)
+    )
+
+
+async def fetch_history(
+    db: AsyncSession,
+    sector_id: int,
+    tier: Tier,
+    since: datetime,
+    until: datetime,
+    limit: int,
+    after: Optional[datetime] = None,
+) -> list:
+    """
+    (window_start, window_end, avg_sentiment, news_count) rows of one tier,
+    oldest first; `after` resumes past the last window_start of a page.
+    """
+    return (await db.execute(history_query(sector_id, tier, since, until, limit, after))).all()
@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, String
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.dialects.postgresql import ARRAY
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
 from app.core.db import get_db
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.response_cache import response_cache
 from app.services.sector_service import SectorService
 from app.services.news_service import NewsService
 from app.services.news_signal_service import get_spotlight_signals
+from app.services import dashboard_service, export_service
 from app.api.schemas.sector import SectorRead
 from app.api.schemas.news import NewsCreate, NewsRead
 from app.models.sector import Sector
-from app.models.sentiment_aggregate import SentimentAggregate
+from app.models.sector_sentiment_latest import SectorSentimentLatest
 from app.models.news import News
+from app.models.ticker_sentiment_aggregate import TickerSentimentAggregate
+from app.core.config import settings
+from app.analytics.rollups import TIERS, fetch_history, pick_tier
+from app.ingestion.seen_urls import seen_urls
+from app.sentiment.backend import get_sentiment_backend
+from app.services.enrichment_cache import enrichment_cache
 
 router = APIRouter()
 
@@ -25,6 +35,44 @@ async def health():
     return {"status": "ok", "message": "API running successfully"}
 
 
+# ----------------------------------------------------
+# Cache Metrics
+# ----------------------------------------------------
+@router.get("/metrics/cache")
+async def cache_metrics():
+    return {
+        "seen_urls": seen_urls.stats(),
+        "sentiment": get_sentiment_backend().stats(),  # type: ignore[attr-defined]
+        "enrichment": enrichment_cache.stats(),
+        "responses": response_cache.stats(),
+    }
+
+
+def trending_cutoff(hours: int) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+def as_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    """Naive query timestamps are taken as UTC."""
+    return ts.replace(tzinfo=timezone.utc) if ts and ts.tzinfo is None else ts
+
+
+def read_cursor(cursor: Optional[str], **types: type) -> Optional[dict]:
+    """Decode a ?cursor= token from a previous page's X-Next-Cursor header."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, **types)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, rows: list, limit: int, **last_row: object) -> None:
+    """A full page may have a successor; point X-Next-Cursor at its last row."""
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(**last_row)
+
+
 # ----------------------------------------------------
 # Sector Endpoints
 # ----------------------------------------------------
@@ -35,7 +83,9 @@ async def get_sectors(db: AsyncSession = Depends(get_db)):
 
 @router.post("/sectors", response_model=SectorRead)
 async def create_sector(name: str, description: Optional[str] = None, db: AsyncSession = Depends(get_db)):
-    return await SectorService.create(db, name, description)
+    sector = await SectorService.create(db, name, description)
+    response_cache.bump("news", "aggregates")  # sector names appear in both
+    return sector
 
 
 # ----------------------------------------------------
@@ -43,41 +93,95 @@ async def create_sector(name: str, description: Optional[str] = None, db: AsyncS
 # ----------------------------------------------------
 @router.post("/news", response_model=NewsRead)
 async def ingest_news(payload: NewsCreate, db: AsyncSession = Depends(get_db)):
-    return await NewsService.create(db, payload.dict())
+    news = await NewsService.create(db, payload.dict())
+    response_cache.bump("news")
+    return news
+
+
+def _news_page_after(cursor: Optional[str]):
+    after = read_cursor(cursor, published_at=datetime, id=int)
+    return (after["published_at"], after["id"]) if after else None
 
 
 @router.get("/news/recent", response_model=List[NewsRead])
-async def recent_news(limit: int = 50, db: AsyncSession = Depends(get_db)):
-    return await NewsService.list_recent(db, limit)
+async def recent_news(
+    response: Response,
+    limit: int = Query(50, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Undated articles, then newest first; pass X-Next-Cursor back as ?cursor= for the next page."""
+    rows = await NewsService.list_recent(db, limit, after=_news_page_after(cursor))
+    if rows:
+        set_next_cursor(response, rows, limit, published_at=rows[-1].published_at, id=rows[-1].id)
+    return rows
 
 
 @router.get("/news/by-sector/{sector_id}", response_model=List[NewsRead])
-async def news_by_sector(sector_id: int, limit: int = 50, db: AsyncSession = Depends(get_db)):
-    q = select(News).where(News.sector_id == sector_id).order_by(News.published_at.desc()).limit(limit)
-    result = await db.execute(q)
-    return result.scalars().all()
+async def news_by_sector(
+    sector_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Undated articles, then newest first; pass X-Next-Cursor back as ?cursor= for the next page."""
+    rows = await NewsService.list_by_sector(db, sector_id, limit, after=_news_page_after(cursor))
+    if rows:
+        set_next_cursor(response, rows, limit, published_at=rows[-1].published_at, id=rows[-1].id)
+    return rows
 
 
 # ----------------------------------------------------
 # Historical Sentiment for Sector
 # ----------------------------------------------------
 @router.get("/aggregates/historical/{sector_id}")
-async def get_sector_history(sector_id: int, db: AsyncSession = Depends(get_db)):
-    q = (
-        select(
-            SentimentAggregate.window_start,
-            SentimentAggregate.window_end,
-            SentimentAggregate.avg_sentiment,
-            SentimentAggregate.news_count,
-        )
-        .where(SentimentAggregate.sector_id == sector_id)
-        .order_by(SentimentAggregate.window_start.asc())
-    )
-    rows = (await db.execute(q)).all()
-
-    if not rows:
+async def get_sector_history(
+    sector_id: int,
+    response: Response,
+    since: Optional[datetime] = Query(None, alias="from"),
+    until: Optional[datetime] = Query(None, alias="to"),
+    resolution: str = "auto",
+    points: int = Query(settings.HISTORY_DEFAULT_POINTS, ge=1, le=settings.HISTORY_MAX_POINTS),
+    limit: int = Query(settings.HISTORY_MAX_POINTS, ge=1, le=settings.HISTORY_MAX_POINTS),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Sector sentiment over [from, to) (default: the last 30 days), served
+    from the 15m / 1h / 1d tier. resolution=auto picks the coarsest tier
+    that still yields `points` buckets; the chosen tier is returned in the
+    X-Resolution header. At most `limit` buckets per page; a full page sets
+    X-Next-Cursor, which pins the tier and range for the following pages.
+    """
+    page = read_cursor(cursor, tier=str, after=datetime, until=datetime)
+    if page is not None:
+        if page["tier"] not in TIERS or page["after"] is None or page["until"] is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        tier, after, until = TIERS[page["tier"]], page["after"], page["until"]
+        since = after
+    else:
+        after = None
+        until = as_utc(until) or datetime.now(timezone.utc)
+        since = as_utc(since) or until - timedelta(days=30)
+        if since >= until:
+            raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+
+        if resolution == "auto":
+            tier = pick_tier(since, until, points)
+        elif resolution in TIERS:
+            tier = TIERS[resolution]
+        else:
+            raise HTTPException(status_code=400, detail=f"resolution must be auto or one of {list(TIERS)}")
+
+    rows = await fetch_history(db, sector_id, tier, since, until, limit=limit, after=after)
+
+    if not rows and page is None:
         raise HTTPException(status_code=404, detail="No historical data found")
 
+    response.headers["X-Resolution"] = tier.name
+    if rows:
+        set_next_cursor(response, rows, limit, tier=tier.name, after=rows[-1][0], until=until)
     return [
         {
             "timestamp": r[0] or r[1],
@@ -92,21 +196,13 @@ async def get_sector_history(sector_id: int, db: AsyncSession = Depends(get_db))
 # Latest Aggregates
 # ----------------------------------------------------
 @router.get("/aggregates/latest")
+@response_cache.cached("aggregates")
 async def get_latest_aggregates(db: AsyncSession = Depends(get_db)):
-    subq = (
-        select(
-            SentimentAggregate.sector_id,
-            func.max(SentimentAggregate.id).label("max_id")
-        )
-        .group_by(SentimentAggregate.sector_id)
-        .subquery()
-    )
-
+    # One row per sector, kept current by the aggregator — no scan of bucket history
     q = (
-        select(SentimentAggregate, Sector.name)
-        .join(subq, SentimentAggregate.id == subq.c.max_id)
-        .join(Sector, Sector.id == SentimentAggregate.sector_id, isouter=True)
-        .order_by(SentimentAggregate.avg_sentiment.desc())
+        select(SectorSentimentLatest, Sector.name)
+        .join(Sector, Sector.id == SectorSentimentLatest.sector_id, isouter=True)
+        .order_by(SectorSentimentLatest.avg_sentiment.desc())
     )
 
     rows = (await db.execute(q)).all()
@@ -128,102 +224,74 @@ async def get_latest_aggregates(db: AsyncSession = Depends(get_db)):
 
 
 # ----------------------------------------------------
-# Dashboard Overview (🚀 FIXED query issue)
+# Dashboard Overview
+# ----------------------------------------------------
 @router.get("/dashboard/overview")
-async def dashboard_overview(ticker: str, db: AsyncSession = Depends(get_db)):
-    ticker = ticker.upper().strip()
-
-    # 🔥 Trending Stocks
-    trending_query = (
-        select(func.unnest(News.tickers).label("ticker"), func.count(News.id).label("mentions"))
-        .where(News.tickers != None)
-        .group_by("ticker")
-        .order_by(func.count(News.id).desc())
-        .limit(10)
-    )
-    trending = [
-        {"ticker": row[0], "mentions": row[1]}
-        for row in (await db.execute(trending_query)).all() if row[0]
-    ]
-
-    # 📰 News for this ticker
-    news_query = (
-        select(News)
-        .where(func.upper(ticker) == func.any(func.cast(News.tickers, ARRAY(String))))
-        .order_by(News.processed_at.desc())
-        .limit(10)
-    )
-    news = [
-        {
-            "id": n.id,
-            "title": n.title,
-            "source": n.source,
-            "url": n.url,
-            "tickers": n.tickers,
-            "sentiment_score": n.sentiment_score,
-            "impact_label": n.impact_label,
-            "impact_confidence": n.impact_confidence,
-            "impact_summary": n.impact_summary,
-            "published_at": n.published_at,
-            "sector_id": n.sector_id,
-        }
-        for n in (await db.execute(news_query)).scalars().all()
-    ]
-
-    # 📊 Ticker sentiment averages
-    sentiment_query = (
-        select(
-            func.avg(News.sentiment_score),
-            func.avg(News.impact_confidence)
+@response_cache.cached("news", "aggregates")
+async def dashboard_overview(ticker: str):
+    """
+    Sub-queries run concurrently on their own sessions; see dashboard_service.
+    The ticker averages cover the ticker buckets kept by the aggregator (the
+    last TICKER_AGG_RETENTION_DAYS), not every article ever stored.
+    """
+    return await dashboard_service.overview(ticker.upper().strip())
+
+
+@router.get("/dashboard/overview/batch")
+@response_cache.cached("news", "aggregates")
+async def dashboard_overview_batch(tickers: List[str] = Query(...)):
+    """Overview of a whole watchlist: ?tickers=A&tickers=B or ?tickers=A,B."""
+    symbols = dashboard_service.normalize_tickers(tickers)
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    if len(symbols) > settings.DASHBOARD_BATCH_MAX_TICKERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.DASHBOARD_BATCH_MAX_TICKERS} tickers per request",
         )
-        .where(func.upper(ticker) == func.any(func.cast(News.tickers, ARRAY(String))))
-    )
-    avg_sentiment, avg_confidence = (await db.execute(sentiment_query)).one_or_none() or (0, 0)
+    return await dashboard_service.overview_many(symbols)
 
-    sentiment_label = (
-        "Bullish" if avg_sentiment > 0.15 else
-        "Bearish" if avg_sentiment < -0.15 else
-        "Neutral"
-    )
-
-    spotlight = await get_spotlight_signals(db, min_confidence=0.6)
-
-    return {
-        "ticker": ticker,
-        "avg_sentiment": round(avg_sentiment or 0, 3),
-        "impact_confidence": round(avg_confidence or 0, 3),
-        "sentiment_label": sentiment_label,
-        "news": news,
-        "spotlight": spotlight,
-        "trending": trending,
-    }
 
 # ----------------------------------------------------
 # Ticker Sentiment History (🚀 FIXED)
 # ----------------------------------------------------
-@router.get("/ticker/sentiment-history")
-async def get_sentiment_history(ticker: str, db: AsyncSession = Depends(get_db)):
-    ticker = ticker.upper().strip()
-
+def ticker_history_query(ticker: str, limit: int, before: Optional[datetime] = None):
     q = (
-        select(
-            News.processed_at.label("timestamp"),
-            News.sentiment_score,
-            News.impact_confidence,
-            News.impact_label,
-        )
-        .where(func.upper(ticker) == func.any(func.cast(News.tickers, ARRAY(String))))
-        .order_by(News.processed_at.desc())
-        .limit(50)
+        select(TickerSentimentAggregate)
+        .where(TickerSentimentAggregate.ticker == ticker)
+        .order_by(TickerSentimentAggregate.window_start.desc())
+        .limit(limit)
     )
-    rows = (await db.execute(q)).all()
+    if before is not None:
+        q = q.where(TickerSentimentAggregate.window_start < before)
+    return q
+
 
+@router.get("/ticker/sentiment-history")
+async def get_sentiment_history(
+    ticker: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Latest per-ticker sentiment buckets, newest first. window_start is
+    unique per ticker, so it alone is the keyset, read off the primary key.
+    """
+    page = read_cursor(cursor, before=datetime)
+    before = page["before"] if page is not None else None
+    rows = (await db.execute(ticker_history_query(ticker.upper().strip(), limit, before))).scalars().all()
+
+    if rows:
+        set_next_cursor(response, rows, limit, before=rows[-1].window_start)
     return [
         {
-            "timestamp": r.timestamp,
-            "sentiment_score": r.sentiment_score,
-            "impact_label": r.impact_label,
-            "impact_confidence": r.impact_confidence,
+            "timestamp": r.window_start,
+            "sentiment_score": r.avg_sentiment,
+            "impact_confidence": r.avg_confidence,
+            "weighted_score": r.weighted_score,
+            "news_count": r.news_count,
         }
         for r in rows
     ]
@@ -233,6 +301,7 @@ async def get_sentiment_history(ticker: str, db: AsyncSession = Depends(get_db))
 # Sector Summary
 # ----------------------------------------------------
 @router.get("/insights/sector-summary")
+@response_cache.cached("news")
 async def sector_summary(db: AsyncSession = Depends(get_db)):
     q = (
         select(
@@ -260,15 +329,23 @@ async def sector_summary(db: AsyncSession = Depends(get_db)):
 # Top Bullish / Bearish Stocks
 # ----------------------------------------------------
 @router.get("/insights/top-stocks")
-async def get_top_stocks(db: AsyncSession = Depends(get_db), limit: int = 5):
+@response_cache.cached("aggregates")
+async def get_top_stocks(
+    db: AsyncSession = Depends(get_db),
+    limit: int = 5,
+    hours: int = settings.TRENDING_WINDOW_HOURS,
+):
+    mentions = func.sum(TickerSentimentAggregate.news_count)
     q = (
         select(
-            func.unnest(News.tickers).label("ticker"),
-            func.avg(News.sentiment_score),
-            func.count(News.id).label("mentions"),
+            TickerSentimentAggregate.ticker,
+            func.sum(TickerSentimentAggregate.sentiment_sum) / mentions,
+            mentions.label("mentions"),
         )
-        .group_by("ticker")
-        .having(func.count(News.id) >= 2)
+        .where(TickerSentimentAggregate.window_start >= trending_cutoff(hours))
+        .group_by(TickerSentimentAggregate.ticker)
+        .having(mentions >= 2)
+        .order_by(mentions.desc())
         .limit(limit * 2)
     )
 
@@ -285,12 +362,13 @@ async def get_top_stocks(db: AsyncSession = Depends(get_db), limit: int = 5):
 # Spotlight Signals
 # ----------------------------------------------------
 @router.get("/signals/spotlight")
+@response_cache.cached("news")
 async def get_spotlight(
     limit: int = 20,
     min_confidence: float = 0.6,
     db: AsyncSession = Depends(get_db),
 ):
-    data = await get_spotlight_signals(db, min_confidence=min_confidence)
+    data = await get_spotlight_signals(db, min_confidence=min_confidence, limit=limit)
     if not data:
         raise HTTPException(status_code=404, detail="No signals found")
     return {"results": data}
@@ -300,15 +378,22 @@ async def get_spotlight(
 # Hot Stocks (Trending + Sentiment)
 # ----------------------------------------------------
 @router.get("/signals/hot")
-async def get_hot_stocks(db: AsyncSession = Depends(get_db), limit: int = 10):
+@response_cache.cached("aggregates")
+async def get_hot_stocks(
+    db: AsyncSession = Depends(get_db),
+    limit: int = 10,
+    hours: int = settings.TRENDING_WINDOW_HOURS,
+):
+    mentions = func.sum(TickerSentimentAggregate.news_count)
     q = (
         select(
-            func.unnest(News.tickers).label("ticker"),
-            func.count(News.id).label("mentions"),
-            func.coalesce(func.avg(News.sentiment_score), 0).label("avg_sentiment")
+            TickerSentimentAggregate.ticker,
+            mentions.label("mentions"),
+            (func.sum(TickerSentimentAggregate.sentiment_sum) / mentions).label("avg_sentiment")
         )
-        .group_by("ticker")
-        .order_by(func.count(News.id).desc())
+        .where(TickerSentimentAggregate.window_start >= trending_cutoff(hours))
+        .group_by(TickerSentimentAggregate.ticker)
+        .order_by(mentions.desc())
         .limit(limit)
     )
 
@@ -322,3 +407,37 @@ async def get_hot_stocks(db: AsyncSession = Depends(get_db), limit: int = 10):
         }
         for r in rows if r[0]
     ]
+
+
+# ----------------------------------------------------
+# Bulk Export (streamed; constant memory)
+# ----------------------------------------------------
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = "ndjson",
+    since: Optional[datetime] = Query(None, alias="from"),
+    until: Optional[datetime] = Query(None, alias="to"),
+    tickers: List[str] = Query([]),
+    sector_id: Optional[int] = None,
+):
+    """
+    Stream `news` or `aggregates` as ndjson, csv or parquet, read through a
+    server-side cursor in EXPORT_BATCH_SIZE batches.
+    """
+    filters = export_service.ExportFilters(
+        since=as_utc(since),
+        until=as_utc(until),
+        tickers=dashboard_service.normalize_tickers(tickers),
+        sector_id=sector_id,
+    )
+    try:
+        export_format, body = export_service.export(dataset, format, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        body,
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{export_format.extension}"'},
+    )
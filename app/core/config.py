@@ -7,8 +7,80 @@ class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL","")
     HF_API_TOKEN: str = os.getenv("HF_API_TOKEN","")
     HF_MODEL: str = os.getenv("HF_MODEL","ProsusAI/finbert")
+    HF_BATCH_SIZE: int = int(os.getenv("HF_BATCH_SIZE","16"))
+    HF_MAX_CONCURRENCY: int = int(os.getenv("HF_MAX_CONCURRENCY","4"))
+
+    # Sentiment backend: "hf" (hosted inference API) or "local" (in-process CPU)
+    SENTIMENT_BACKEND: str = os.getenv("SENTIMENT_BACKEND","hf").lower()
+    LOCAL_MODEL_PATH: str = os.getenv("LOCAL_MODEL_PATH","")
+    LOCAL_MAX_BATCH: int = int(os.getenv("LOCAL_MAX_BATCH","32"))
+    LOCAL_MAX_WAIT_MS: int = int(os.getenv("LOCAL_MAX_WAIT_MS","10"))
+    LOCAL_MAX_LENGTH: int = int(os.getenv("LOCAL_MAX_LENGTH","256"))
+    LOCAL_ACCELERATION: str = os.getenv("LOCAL_ACCELERATION","none").lower()  # none | int8 | onnx
+    LOCAL_NUM_THREADS: int = int(os.getenv("LOCAL_NUM_THREADS","0"))  # 0 → torch default
     NEWS_API_KEY: str = os.getenv("NEWS_API_KEY","")
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY","")
     ALPHA_VANTAGE_API_KEY: str = os.getenv("ALPHA_VANTAGE_API_KEY","")
 
+    # Sentiment result cache (in-process LRU + optional sentiment_cache table)
+    SENTIMENT_CACHE_SIZE: int = int(os.getenv("SENTIMENT_CACHE_SIZE","20000"))
+    SENTIMENT_CACHE_TTL_HOURS: int = int(os.getenv("SENTIMENT_CACHE_TTL_HOURS","720"))
+    SENTIMENT_CACHE_PERSIST: bool = os.getenv("SENTIMENT_CACHE_PERSIST","1") == "1"
+    SENTIMENT_CACHE_MAX_ROWS: int = int(os.getenv("SENTIMENT_CACHE_MAX_ROWS","500000"))
+
+    # News ingestion schedule (the shared HTTP pool outlives one interval)
+    INGEST_INTERVAL_MINUTES: int = int(os.getenv("INGEST_INTERVAL_MINUTES","30"))
+
+    # Ingestion dedupe
+    SEEN_URL_CAPACITY: int = int(os.getenv("SEEN_URL_CAPACITY","50000"))
+    NEAR_DUP_WINDOW_HOURS: int = int(os.getenv("NEAR_DUP_WINDOW_HOURS","48"))
+    NEAR_DUP_MAX_DISTANCE: int = int(os.getenv("NEAR_DUP_MAX_DISTANCE","6"))
+
+    # Zero-shot sector detection
+    SECTOR_BATCH_SIZE: int = int(os.getenv("SECTOR_BATCH_SIZE","8"))
+    SECTOR_MAX_CONCURRENCY: int = int(os.getenv("SECTOR_MAX_CONCURRENCY","3"))
+    SECTOR_LABELS_TTL_SECONDS: int = int(os.getenv("SECTOR_LABELS_TTL_SECONDS","600"))
+    STOCK_INDEX_TTL_SECONDS: int = int(os.getenv("STOCK_INDEX_TTL_SECONDS","600"))
+
+    # Gemini enrichment backlog driver
+    ENRICH_BATCH_SIZE: int = int(os.getenv("ENRICH_BATCH_SIZE","40"))
+    ENRICH_MAX_CONCURRENCY: int = int(os.getenv("ENRICH_MAX_CONCURRENCY","3"))
+    ENRICH_TIME_BUDGET_SECONDS: int = int(os.getenv("ENRICH_TIME_BUDGET_SECONDS","300"))
+    ENRICH_MAX_CALLS: int = int(os.getenv("ENRICH_MAX_CALLS","30"))
+
+    # Reuse of Gemini results for repeated headlines
+    ENRICH_CACHE_SIZE: int = int(os.getenv("ENRICH_CACHE_SIZE","10000"))
+    ENRICH_CACHE_TTL_HOURS: int = int(os.getenv("ENRICH_CACHE_TTL_HOURS","24"))
+
+    # Gemini prompt packing (estimated tokens per request)
+    GEMINI_PROMPT_TOKEN_BUDGET: int = int(os.getenv("GEMINI_PROMPT_TOKEN_BUDGET","6000"))
+    GEMINI_OUTPUT_TOKEN_BUDGET: int = int(os.getenv("GEMINI_OUTPUT_TOKEN_BUDGET","2400"))
+    GEMINI_SNIPPET_TOKENS: int = int(os.getenv("GEMINI_SNIPPET_TOKENS","150"))
+
+    # Sector aggregation: fixed, aligned buckets (also the job interval)
+    AGG_BUCKET_MINUTES: int = int(os.getenv("AGG_BUCKET_MINUTES","15"))
+
+    # Rollup tiers over the buckets: retention in days per tier (0 = keep forever)
+    ROLLUP_RETENTION_DAYS_BASE: int = int(os.getenv("ROLLUP_RETENTION_DAYS_BASE","30"))
+    ROLLUP_RETENTION_DAYS_HOURLY: int = int(os.getenv("ROLLUP_RETENTION_DAYS_HOURLY","365"))
+    ROLLUP_RETENTION_DAYS_DAILY: int = int(os.getenv("ROLLUP_RETENTION_DAYS_DAILY","0"))
+    TICKER_AGG_RETENTION_DAYS: int = int(os.getenv("TICKER_AGG_RETENTION_DAYS","180"))
+    HISTORY_DEFAULT_POINTS: int = int(os.getenv("HISTORY_DEFAULT_POINTS","200"))
+    HISTORY_MAX_POINTS: int = int(os.getenv("HISTORY_MAX_POINTS","5000"))
+
+    # Largest page the keyset-paginated list endpoints return
+    PAGE_MAX_LIMIT: int = int(os.getenv("PAGE_MAX_LIMIT","200"))
+
+    # Read-endpoint response cache (invalidated by scheduler version bumps)
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES","512"))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS","900"))
+
+    # Look-back for trending / hot / top-stock rankings over news_tickers
+    TRENDING_WINDOW_HOURS: int = int(os.getenv("TRENDING_WINDOW_HOURS","168"))
+
+    # Upper bound on tickers per /dashboard/overview/batch request
+    DASHBOARD_BATCH_MAX_TICKERS: int = int(os.getenv("DASHBOARD_BATCH_MAX_TICKERS","50"))
+    # Pooled connections all dashboard sub-queries may hold at once (pool is 5 + 10 overflow)
+    DASHBOARD_MAX_CONNECTIONS: int = int(os.getenv("DASHBOARD_MAX_CONNECTIONS","4"))
+
 settings = Settings()
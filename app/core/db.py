@@ -57,9 +57,13 @@ Base = declarative_base()
 # DATABASE INITIALIZATION
 # -----------------------------
 async def init_db():
-    """Create all tables on application startup."""
+    """Create all tables on application startup, then apply pending migrations."""
+    from app.core.migrations import apply_migrations
+    from app.models import news, sector, sentiment_aggregate, stock, sentiment_cache, news_ticker, aggregator_state, sentiment_rollup, ticker_sentiment_aggregate, sector_sentiment_latest  # noqa: F401 — register tables
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await apply_migrations(conn)
 
 
 # -----------------------------
@@ -0,0 +1,37 @@
+# app/core/migrations.py
+
+from pathlib import Path
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent.parent / "migrations"
+
+
+async def apply_migrations(conn: AsyncConnection) -> list[str]:
+    """
+    Apply pending migrations/NNNN_*.sql files in order, once each.
+    Runs inside the caller's transaction, after create_all() — so every
+    statement must be idempotent (IF NOT EXISTS) for fresh databases.
+    """
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version VARCHAR(128) PRIMARY KEY,"
+        " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ))
+    applied = set((await conn.execute(text("SELECT version FROM schema_migrations"))).scalars())
+
+    raw = await conn.get_raw_connection()
+    newly_applied = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        if path.stem in applied:
+            continue
+
+        # asyncpg runs multi-statement scripts when called without arguments
+        await raw.driver_connection.execute(path.read_text(encoding="utf-8"))  # type: ignore[union-attr]
+        await conn.execute(
+            text("INSERT INTO schema_migrations (version) VALUES (:v)"), {"v": path.stem}
+        )
+        newly_applied.append(path.stem)
+        print(f"🗄 Applied migration {path.name}")
+
+    return newly_applied
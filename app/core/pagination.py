@@ -0,0 +1,44 @@
+# app/core/pagination.py
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def encode_cursor(**fields: Any) -> str:
+    """Opaque, URL-safe token for the sort key of the last row of a page."""
+    raw = json.dumps(
+        {k: v.isoformat() if isinstance(v, datetime) else v for k, v in fields.items()},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, **types: type) -> Dict[str, Optional[Any]]:
+    """
+    Inverse of encode_cursor. `types` names the expected fields and their
+    types (datetime, int or str); any field may be null. Raises ValueError
+    on a token this module did not produce.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("malformed cursor") from e
+    if not isinstance(data, dict) or set(data) != set(types):
+        raise ValueError("malformed cursor")
+
+    fields: Dict[str, Optional[Any]] = {}
+    for name, kind in types.items():
+        value = data[name]
+        if value is None:
+            fields[name] = None
+        elif kind is datetime and isinstance(value, str):
+            fields[name] = datetime.fromisoformat(value)  # ValueError on junk
+        elif kind in (int, str) and type(value) is kind:
+            fields[name] = value
+        else:
+            raise ValueError("malformed cursor")
+    return fields
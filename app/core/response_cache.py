@@ -0,0 +1,113 @@
+# app/core/response_cache.py
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+# Injected objects that never belong in a cache key
+_UNKEYED = (AsyncSession, Request, Response)
+
+
+class ResponseCache:
+    """
+    Memoizes read endpoints on (route, query params, namespace versions).
+
+      • bounded LRU with TTL (RESPONSE_CACHE_MAX_ENTRIES / _TTL_SECONDS)
+      • bump(namespace) invalidates every entry depending on it — stale
+        keys are never hit again and age out of the LRU
+      • concurrent misses on one key share a single computation, so an
+        invalidation doesn't send every waiting client to Postgres
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.RESPONSE_CACHE_MAX_ENTRIES,
+        ttl: float = settings.RESPONSE_CACHE_TTL_SECONDS,
+    ):
+        self._entries: LRUCache[Any] = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._versions: Dict[str, int] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    def bump(self, *namespaces: str) -> None:
+        for ns in namespaces:
+            self._versions[ns] = self.version(ns) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def key(self, route: str, namespaces: Tuple[str, ...], kwargs: dict) -> Hashable:
+        params = tuple(sorted(
+            (name, value if isinstance(value, Hashable) else repr(value))
+            for name, value in kwargs.items()
+            if not isinstance(value, _UNKEYED)
+        ))
+        return (route, tuple(self.version(ns) for ns in namespaces), params)
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        hit = self._entries.get(key)
+        if hit is not None:
+            return hit
+
+        while (pending := self._inflight.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this request was cancelled, not the shared computation
+                # the leading request was cancelled — follow the next one or lead
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody was waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        if value is not None:
+            self._entries.set(key, value)
+        future.set_result(value)
+        return value
+
+    def cached(self, *namespaces: str):
+        """Decorator for FastAPI endpoints whose result depends on `namespaces`."""
+        def decorator(endpoint):
+            route = f"{endpoint.__module__}.{endpoint.__qualname__}"
+
+            @functools.wraps(endpoint)  # keeps the signature FastAPI inspects
+            async def wrapper(*args, **kwargs):
+                key = self.key(route, namespaces, kwargs)
+                return await self.get_or_compute(key, lambda: endpoint(*args, **kwargs))
+
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        return {
+            **self._entries.stats(),
+            "memory_bytes": self._entries.memory_bytes(),
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "versions": dict(self._versions),
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,135 @@
+import re
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from hashlib import blake2b
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.news import News
+
+HASH_BITS = 64
+BANDS = 8  # with max distance < BANDS, near-duplicates share at least one 8-bit band
+BAND_BITS = HASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(title: Optional[str], summary: Optional[str]) -> List[str]:
+    return _WORD_RE.findall(f"{title or ''} {summary or ''}".lower())
+
+
+def simhash(words: Sequence[str], shingle: int = 2) -> int:
+    """
+    64-bit SimHash over word shingles (single words for very short texts).
+    Bigrams keep headline-length texts sensitive to order without making
+    one edited word flip too many bits.
+    """
+    if len(words) < shingle:
+        features = list(words)
+    else:
+        features = [" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)]
+
+    weights = [0] * HASH_BITS
+    for feature in features:
+        h = int.from_bytes(blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(HASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+class NearDuplicateIndex:
+    """
+    Rolling-window SimHash index over normalized title + summary.
+
+    Each hash is split into BANDS buckets; a new article is compared only
+    against entries sharing a band, and counts as a near-duplicate when
+    the Hamming distance is within max_distance.
+    """
+
+    def __init__(
+        self,
+        window: timedelta = timedelta(hours=settings.NEAR_DUP_WINDOW_HOURS),
+        max_distance: int = settings.NEAR_DUP_MAX_DISTANCE,
+    ):
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be < {BANDS} for banded lookup")
+        self.window = window
+        self.max_distance = max_distance
+        self._bands: List[Dict[int, List[Tuple[int, int]]]] = [{} for _ in range(BANDS)]
+        self._entries: Deque[Tuple[datetime, int, int]] = deque()  # (seen_at, news_id, hash)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _band_keys(h: int) -> List[int]:
+        return [(h >> (i * BAND_BITS)) & BAND_MASK for i in range(BANDS)]
+
+    def _evict(self, now: datetime) -> None:
+        cutoff = now - self.window
+        while self._entries and self._entries[0][0] < cutoff:
+            _, news_id, h = self._entries.popleft()
+            for band, key in zip(self._bands, self._band_keys(h)):
+                bucket = band.get(key)
+                if bucket:
+                    bucket[:] = [e for e in bucket if e[0] != news_id]
+                    if not bucket:
+                        del band[key]
+
+    def find(self, h: int) -> Optional[int]:
+        """Canonical news_id of the closest indexed near-duplicate, if any."""
+        best: Optional[Tuple[int, int]] = None
+        for band, key in zip(self._bands, self._band_keys(h)):
+            for news_id, other in band.get(key, ()):
+                distance = (h ^ other).bit_count()
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, news_id)
+        return best[1] if best else None
+
+    def add(self, news_id: int, h: int, seen_at: Optional[datetime] = None) -> None:
+        seen_at = seen_at or datetime.now(timezone.utc)
+        self._evict(seen_at)
+        self._entries.append((seen_at, news_id, h))
+        for band, key in zip(self._bands, self._band_keys(h)):
+            band.setdefault(key, []).append((news_id, h))
+
+    def partition(self, rows: Sequence) -> Tuple[list, List[Tuple[int, int]]]:
+        """
+        Split freshly inserted rows (id, title, content) into canonical rows
+        and (duplicate_id, canonical_id) links. Canonical rows are indexed.
+        """
+        now = datetime.now(timezone.utc)
+        self._evict(now)
+
+        canonical, duplicates = [], []
+        for row in rows:
+            h = simhash(normalize_text(row.title, row.content))
+            match = self.find(h)
+            if match is not None:
+                duplicates.append((row.id, match))
+            else:
+                canonical.append(row)
+                self.add(row.id, h, now)
+        return canonical, duplicates
+
+    async def warm(self, db: AsyncSession) -> int:
+        """Index canonical articles fetched within the window."""
+        cutoff = datetime.now(timezone.utc) - self.window
+        q = (
+            select(News.id, News.title, News.content, News.fetched_at)
+            .where(News.fetched_at >= cutoff)
+            .where(News.duplicate_of.is_(None))
+            .order_by(News.fetched_at.asc())
+        )
+        rows = (await db.execute(q)).all()
+        for row in rows:
+            self.add(row.id, simhash(normalize_text(row.title, row.content)), row.fetched_at)
+        return len(rows)
+
+
+near_duplicates = NearDuplicateIndex()
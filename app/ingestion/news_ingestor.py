@@ -1,3 +1,4 @@
+import asyncio
 import httpx
 import yfinance as yf
 from datetime import datetime
@@ -7,10 +8,16 @@ from app.api.schemas import news
 from app.core.config import settings
 from app.services.news_service import NewsService
 from app.core.db import AsyncSessionLocal
+from app.ingestion.seen_urls import seen_urls
 
 MEDIASTACK_ENDPOINT = "http://api.mediastack.com/v1/news"
 ALPHA_VANTAGE_ENDPOINT = "https://www.alphavantage.co/query"
 
+SOURCE_TIMEOUT_SECONDS = 30
+
+# Idle connections must survive the gap between scheduled runs to be reused
+KEEPALIVE_EXPIRY_SECONDS = (settings.INGEST_INTERVAL_MINUTES + 5) * 60
+
 
 class NewsIngestor:
     def __init__(
@@ -20,6 +27,75 @@ class NewsIngestor:
     ):
         self.mediastack_key = mediastack_key
         self.alpha_key = alpha_key
+        self._client: httpx.AsyncClient | None = None
+
+    # ----------- SHARED HTTP CLIENT -------------
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        One keep-alive connection pool shared by every provider and kept
+        open across scheduled runs (closed on app shutdown). Providers that
+        drop idle connections sooner just cost a fresh handshake.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(SOURCE_TIMEOUT_SECONDS, connect=10),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ----------- CONCURRENT FETCH -------------
+    async def fetch_all(
+        self,
+        *,
+        mediastack_limit: int = 10,
+        timeout: float = SOURCE_TIMEOUT_SECONDS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch every provider concurrently and return normalized articles
+        not already stored. A slow or failing source is dropped without
+        delaying the others.
+        """
+        sources = {
+            "mediastack": (self.fetch_from_mediastack(limit=mediastack_limit), self.normalize_mediastack),
+            "alpha_vantage": (self.fetch_from_alpha_vantage(), self.normalize_alpha),
+            "yahoo": (self.fetch_from_yahoo(), self.normalize_yahoo),
+        }
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(fetch, timeout) for fetch, _ in sources.values()),
+            return_exceptions=True,
+        )
+
+        articles: List[Dict[str, Any]] = []
+        for (name, (_, normalize)), result in zip(sources.items(), results):
+            if isinstance(result, BaseException):
+                reason = "timed out" if isinstance(result, asyncio.TimeoutError) else result
+                print(f"⚠ {name} fetch failed: {reason}")
+                continue
+            skipped = 0
+            for item in result:
+                try:
+                    articles.append(normalize(item))
+                except Exception as e:
+                    skipped += 1
+                    print(f"⚠ {name}: skipping malformed item: {e}")
+            if skipped:
+                print(f"⚠ {name}: {skipped}/{len(result)} items skipped")
+
+        # Drop articles we already stored before any DB or inference work
+        fresh = seen_urls.filter_unseen(articles)
+        stats = seen_urls.stats()
+        print(
+            f"🔁 Seen-URL filter: dropped {len(articles) - len(fresh)}/{len(articles)} "
+            f"(hit rate {stats['hit_rate']:.0%}, {stats['size']} urls, {stats['memory_bytes'] / 1024:.0f} KiB)"
+        )
+        return fresh
 
     # ----------- MEDIASTACK FETCH -------------
     async def fetch_from_mediastack(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -30,11 +106,10 @@ class NewsIngestor:
             "categories": "business",
             "limit": limit,
         }
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.get(MEDIASTACK_ENDPOINT, params=params)
-            r.raise_for_status()
-            print("Fetched Mediastack news")
-            return r.json().get("data", [])
+        r = await self.client.get(MEDIASTACK_ENDPOINT, params=params)
+        r.raise_for_status()
+        print("Fetched Mediastack news")
+        return r.json().get("data", [])
 
     def normalize_mediastack(self, item: Dict[str, Any]) -> Dict[str, Any]:
         return {
@@ -59,11 +134,10 @@ class NewsIngestor:
         if tickers:
             params["tickers"] = tickers
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.get(ALPHA_VANTAGE_ENDPOINT, params=params)
-            r.raise_for_status()
-            print("Fetched AlphaVantage news")
-            return r.json().get("feed", [])
+        r = await self.client.get(ALPHA_VANTAGE_ENDPOINT, params=params)
+        r.raise_for_status()
+        print("Fetched AlphaVantage news")
+        return r.json().get("feed", [])
 
     def normalize_alpha(self, item: Dict[str, Any]) -> Dict[str, Any]:
         # Convert timestamp (YYYYMMDDTHHMM -> datetime)
@@ -83,6 +157,17 @@ class NewsIngestor:
                 key=lambda x: float(x.get("relevance_score", 0)),
             ).get("ticker")
 
+        # Per-ticker sentiment as scored by AlphaVantage
+        ticker_sentiments = {}
+        for ts in item.get("ticker_sentiment") or []:
+            try:
+                ticker_sentiments[ts["ticker"].upper()] = {
+                    "score": float(ts.get("ticker_sentiment_score", 0)),
+                    "confidence": float(ts.get("relevance_score", 0)),
+                }
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+
         return {
             "source": item.get("source"),
             "title": item.get("title"),
@@ -93,6 +178,7 @@ class NewsIngestor:
             "language": "en",
             "sentiment_score": item.get("overall_sentiment_score"),
             "sentiment_label": item.get("overall_sentiment_label"),
+            "ticker_sentiments": ticker_sentiments or None,
             # Keep the entire AlphaVantage item for future use
             "raw_payload": item,
         }
@@ -100,7 +186,8 @@ class NewsIngestor:
     # ----------- YAHOO FINANCE FETCH -------------
     async def fetch_from_yahoo(self) -> List[Dict[str, Any]]: 
         try:
-            news=yf.Ticker("^NSEI").news
+            # yfinance is blocking — keep it off the event loop
+            news = await asyncio.to_thread(lambda: yf.Ticker("^NSEI").news)
             print("Fetched Yahoo news")
             return news[:10] if news else []
         except Exception:
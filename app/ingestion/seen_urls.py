@@ -0,0 +1,81 @@
+from typing import Any, Dict, Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.news import News
+
+# Click-tracking params added by share links; they never select a different page
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    URL with click-tracking params removed, everything else kept as is:
+    news.url is unique on the raw string, so anything more aggressive would
+    drop articles the database accepts as distinct.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.query:
+        return url
+
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [
+        (k, v) for k, v in params
+        if not k.lower().startswith(TRACKING_PREFIXES) and k.lower() not in TRACKING_PARAMS
+    ]
+    if len(kept) == len(params):
+        return url
+    return urlunsplit(parts._replace(query=urlencode(kept)))
+
+
+class SeenUrlFilter:
+    """
+    Bounded LRU set of normalized article URLs already stored in `news`.
+    Lets the ingestor drop known articles before any DB or inference work.
+    """
+
+    def __init__(self, capacity: int = settings.SEEN_URL_CAPACITY):
+        self._urls: LRUCache[bool] = LRUCache(maxsize=capacity)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def seen(self, url: str) -> bool:
+        return normalize_url(url) in self._urls
+
+    def add_many(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            if url:
+                self._urls.set(normalize_url(url), True)
+
+    def filter_unseen(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Articles whose URL is not known yet (URL-less articles pass through)."""
+        return [a for a in articles if not a.get("url") or not self.seen(a["url"])]
+
+    async def warm(self, db: AsyncSession, limit: int = settings.SEEN_URL_CAPACITY) -> int:
+        """Load the most recently fetched URLs from the news table."""
+        q = (
+            select(News.url)
+            .where(News.url.isnot(None))
+            .order_by(News.fetched_at.desc())
+            .limit(limit)
+        )
+        urls = (await db.execute(q)).scalars().all()
+        # Oldest first so the newest end up most-recently-used
+        self.add_many(reversed(urls))
+        return len(urls)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._urls.stats(), "memory_bytes": self._urls.memory_bytes()}
+
+
+seen_urls = SeenUrlFilter()
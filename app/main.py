@@ -3,8 +3,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router as api_router
-from app.core.db import init_db
-from app.tasks.scheduler import start_scheduler
+from app.core.db import init_db, AsyncSessionLocal
+from app.tasks.scheduler import start_scheduler, ingestor
+from app.services.sector_detection import sector_detector
+from app.services.ticker_matcher import reload_matcher_from_db
+from app.ingestion.seen_urls import seen_urls
+from app.ingestion.near_duplicates import near_duplicates
+from app.services.enrichment_cache import enrichment_cache
+from app.sentiment.backend import close_sentiment_backend
 from datetime import datetime
 
 
@@ -56,6 +62,35 @@ async def on_startup():
     # Create DB tables if not already
     await init_db()
 
+    # Build ticker matcher once: alias file + stocks table
+    try:
+        async with AsyncSessionLocal() as db:
+            await reload_matcher_from_db(db)
+    except Exception as e:
+        print(f"⚠ Ticker matcher DB load failed, using alias file only: {e}")
+
+    # Warm seen-URL filter so the first ingest run skips stored articles
+    try:
+        async with AsyncSessionLocal() as db:
+            warmed = await seen_urls.warm(db)
+        print(f"🔁 Seen-URL filter warmed with {warmed} urls")
+    except Exception as e:
+        print(f"⚠ Seen-URL filter warm-up failed: {e}")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            indexed = await near_duplicates.warm(db)
+        print(f"🪞 Near-duplicate index warmed with {indexed} articles")
+    except Exception as e:
+        print(f"⚠ Near-duplicate index warm-up failed: {e}")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            reusable = await enrichment_cache.warm(db)
+        print(f"♻ Enrichment cache warmed with {reusable} results")
+    except Exception as e:
+        print(f"⚠ Enrichment cache warm-up failed: {e}")
+
     # Start Background Scheduled Jobs (News Ingestion + Aggregation)
     start_scheduler()
 
@@ -67,4 +102,7 @@ async def on_startup():
 @app.on_event("shutdown")
 async def on_shutdown():
     print("🛑 Shutting down News Sentiment Trading Backend...")
+    await ingestor.aclose()
+    await sector_detector.aclose()
+    await close_sentiment_backend()
     print("✔ Shutdown complete.")
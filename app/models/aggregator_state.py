@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime, func
+from app.core.db import Base
+
+class AggregatorState(Base):
+    """Watermarks of the incremental aggregation jobs."""
+    __tablename__ = "aggregator_state"
+
+    name = Column(String(64), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,6 +1,6 @@
 from email.mime import image
 from pydoc_data import topics
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, Index, func, text
 from sqlalchemy import ARRAY
 from sqlalchemy.orm import relationship
 from app.core.db import Base
@@ -29,3 +29,25 @@ class News(Base):
     impact_summary = Column(Text, nullable=True)
     image_url = Column(String(1000), nullable=True)
     ticker_sentiments= Column(JSON, nullable=True)
+    duplicate_of = Column(Integer, nullable=True)  # canonical news.id for near-duplicates
+    enriched_at = Column(DateTime(timezone=True), nullable=True)  # last Gemini enrichment
+    llm_tickers = Column(ARRAY(String), nullable=True)  # Gemini's own tickers, before the merge
+
+    # Mirrored in migrations/0002_news_query_indexes.sql,
+    # 0007_keyset_pagination.sql and 0009_news_enriched_at.sql for existing databases
+    __table_args__ = (
+        Index("ix_news_tickers_gin", "tickers", postgresql_using="gin"),
+        Index("ix_news_published_at_id", published_at.desc(), id.desc()),  # keyset pages
+        Index("ix_news_processed_at", processed_at.desc()),
+        Index("ix_news_sector_published_at_id", sector_id, published_at.desc(), id.desc()),
+        Index("ix_news_undated", id.desc(), postgresql_where=text("published_at IS NULL")),
+        Index("ix_news_impact_confidence", impact_confidence),
+        Index("ix_news_event_time", func.coalesce(published_at, fetched_at)),  # aggregation buckets
+        Index(
+            "ix_news_unenriched",
+            processed_at.desc(),
+            postgresql_where=text(
+                "processed_at IS NOT NULL AND duplicate_of IS NULL AND enriched_at IS NULL"
+            ),
+        ),
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index
+from app.core.db import Base
+
+class NewsTicker(Base):
+    """One row per (article, ticker), kept in sync by NewsService.sync_tickers."""
+    __tablename__ = "news_tickers"
+
+    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), primary_key=True)
+    ticker = Column(String, primary_key=True)
+    published_at = Column(DateTime(timezone=True), nullable=True)  # coalesce(published_at, fetched_at)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    sentiment_score = Column(Float, nullable=True)
+    impact_confidence = Column(Float, nullable=True)
+
+    # Mirrored in migrations/0003_news_tickers.sql for existing databases
+    __table_args__ = (
+        Index("ix_news_tickers_ticker_published_at", ticker, published_at.desc()),
+        Index("ix_news_tickers_ticker_processed_at", ticker, processed_at.desc()),
+        Index("ix_news_tickers_published_at", published_at.desc()),
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Float, DateTime, func
+from app.core.db import Base
+
+class SectorSentimentLatest(Base):
+    """
+    Newest sentiment_aggregates bucket of each sector, kept current by the
+    aggregator so /aggregates/latest never scans bucket history.
+    """
+    __tablename__ = "sector_sentiment_latest"
+
+    sector_id = Column(Integer, primary_key=True)
+    window_start = Column(DateTime(timezone=True), nullable=False)
+    window_end = Column(DateTime(timezone=True), nullable=False)
+    avg_sentiment = Column(Float, nullable=True)
+    avg_relevance = Column(Float, nullable=True)
+    news_count = Column(Integer, nullable=True)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
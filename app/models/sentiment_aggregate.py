@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, func
 from app.core.db import Base
 
 class SentimentAggregate(Base):
@@ -13,3 +13,13 @@ class SentimentAggregate(Base):
     avg_relevance = Column(Float, nullable=True)
     avg_price_change = Column(Float, nullable=True)
     computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Running totals of the bucket; the averages above are derived from them
+    sentiment_sum = Column(Float, nullable=True)
+    relevance_sum = Column(Float, nullable=True)
+
+    # One row per (sector, aligned bucket); mirrored in migrations/0004 and 0005
+    __table_args__ = (
+        Index("uq_sentiment_aggregates_sector_window", sector_id, window_start, unique=True),
+        Index("ix_sentiment_aggregates_window_start", window_start),  # rollups + retention
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Float, DateTime, func
+from app.core.db import Base
+
+class SentimentCacheEntry(Base):
+    # Mirrored in migrations/0011_sentiment_cache.sql for existing databases
+    __tablename__ = "sentiment_cache"
+
+    model = Column(String(256), primary_key=True)
+    text_hash = Column(String(64), primary_key=True)
+    sentiment = Column(Float, nullable=False)
+    confidence = Column(Float, nullable=False)
+    label = Column(String(32), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
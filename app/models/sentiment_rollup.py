@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, Index, func
+from app.core.db import Base
+
+class SentimentRollup(Base):
+    """Coarser tiers (hourly, daily) summed from sentiment_aggregates buckets."""
+    __tablename__ = "sentiment_rollups"
+
+    resolution = Column(String(8), primary_key=True)
+    sector_id = Column(Integer, primary_key=True)
+    window_start = Column(DateTime(timezone=True), primary_key=True)
+    window_end = Column(DateTime(timezone=True), nullable=False)
+    sentiment_sum = Column(Float, nullable=False)
+    relevance_sum = Column(Float, nullable=False)
+    news_count = Column(Integer, nullable=False)
+    avg_sentiment = Column(Float, nullable=True)
+    avg_relevance = Column(Float, nullable=True)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Retention pruning; mirrored in migrations/0005_sentiment_rollups.sql
+    __table_args__ = (
+        Index("ix_sentiment_rollups_resolution_window", resolution, window_start),
+    )
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, Index, func
+from app.core.db import Base
+
+class TickerSentimentAggregate(Base):
+    """Per-ticker sentiment in the same aligned buckets as the sector aggregates."""
+    __tablename__ = "ticker_sentiment_aggregates"
+
+    ticker = Column(String, primary_key=True)
+    window_start = Column(DateTime(timezone=True), primary_key=True)
+    window_end = Column(DateTime(timezone=True), nullable=False)
+    news_count = Column(Integer, nullable=False)
+    sentiment_sum = Column(Float, nullable=False)
+    confidence_sum = Column(Float, nullable=False)
+    confidence_count = Column(Integer, nullable=False, server_default="0")  # rows with a confidence
+    weighted_sum = Column(Float, nullable=False)  # Σ score × confidence
+    avg_sentiment = Column(Float, nullable=True)
+    avg_confidence = Column(Float, nullable=True)
+    weighted_score = Column(Float, nullable=True)  # weighted_sum / confidence_sum
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Trending windows and retention; mirrored in migrations/0006_ticker_sentiment_aggregates.sql
+    # and 0010_ticker_confidence_count.sql
+    __table_args__ = (
+        Index("ix_ticker_sentiment_aggregates_window_start", window_start),
+    )
@@ -0,0 +1,66 @@
+from typing import Any, List, Protocol
+
+from app.core.config import settings
+
+NEUTRAL = {"sentiment": 0.0, "confidence": 0.0, "label": "neutral"}
+
+
+def to_sentiment_result(scores: Any) -> dict:
+    """
+    Convert one FinBERT output ([{label, score}, ...] or {label, score})
+    into the -1 .. +1 sentiment shape.
+    """
+    top = max(scores, key=lambda s: float(s["score"])) if isinstance(scores, list) else scores
+    label = top["label"].lower()
+    confidence = float(top["score"])
+
+    # Convert positive/negative/neutral → -1 .. +1
+    if label == "positive":
+        sentiment = confidence
+    elif label == "negative":
+        sentiment = -confidence
+    else:
+        sentiment = 0.0
+
+    return {
+        "sentiment": sentiment,
+        "confidence": confidence,
+        "label": label
+    }
+
+
+class SentimentBackend(Protocol):
+    async def analyze_text(self, text: str) -> dict: ...
+
+    async def analyze_batch(self, texts: List[str], batch_size: int | None = None) -> List[dict]: ...
+
+
+_backend: SentimentBackend | None = None
+
+
+def get_sentiment_backend() -> SentimentBackend:
+    """
+    Backend chosen by SENTIMENT_BACKEND ("hf" or "local"), behind the
+    result cache. Both return {"sentiment", "confidence", "label"} per text.
+    """
+    global _backend
+    if _backend is None:
+        from app.sentiment.cache import CachedSentimentBackend
+
+        if settings.SENTIMENT_BACKEND == "local":
+            from app.sentiment.local_engine import LocalSentimentEngine
+            _backend = CachedSentimentBackend(LocalSentimentEngine(), f"local:{settings.LOCAL_MODEL_PATH}")
+        elif settings.SENTIMENT_BACKEND == "hf":
+            from app.sentiment.llm_client import HFClient
+            _backend = CachedSentimentBackend(HFClient(), f"hf:{settings.HF_MODEL}")
+        else:
+            raise ValueError(f"Unknown SENTIMENT_BACKEND: {settings.SENTIMENT_BACKEND!r}")
+    return _backend
+
+
+async def close_sentiment_backend() -> None:
+    """Release the backend's workers on shutdown, if one was created."""
+    global _backend
+    if _backend is not None:
+        await _backend.aclose()  # type: ignore[attr-defined]
+        _backend = None
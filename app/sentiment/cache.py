@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy import delete, func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.models.sentiment_cache import SentimentCacheEntry
+
+_WS_RE = re.compile(r"\s+")
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of NFKC-normalized, whitespace-collapsed text."""
+    normalized = _WS_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class CachedSentimentBackend:
+    """
+    Memoizes a sentiment backend on (model, normalized text hash).
+
+      • tier 1: in-process LRU (SENTIMENT_CACHE_SIZE entries)
+      • tier 2: optional `sentiment_cache` table (SENTIMENT_CACHE_PERSIST)
+
+    Both tiers honour SENTIMENT_CACHE_TTL_HOURS; the table is also capped
+    at SENTIMENT_CACHE_MAX_ROWS by prune(). Failed scores (confidence 0)
+    are never cached.
+    """
+
+    def __init__(self, backend, model_name: str):
+        self.backend = backend
+        self.model_name = model_name
+        self.ttl = timedelta(hours=settings.SENTIMENT_CACHE_TTL_HOURS)
+        self.persist = settings.SENTIMENT_CACHE_PERSIST
+        self._memory: LRUCache[dict] = LRUCache(
+            maxsize=settings.SENTIMENT_CACHE_SIZE, ttl=self.ttl.total_seconds()
+        )
+        self.db_hits = 0
+        self.db_misses = 0
+
+    async def analyze_text(self, text: str) -> dict:
+        # Misses go through backend.analyze_text so the local engine can coalesce them
+        return (await self._analyze([text], lambda ts: asyncio.gather(
+            *(self.backend.analyze_text(t) for t in ts)
+        )))[0]
+
+    async def analyze_batch(self, texts: List[str], batch_size: int | None = None) -> List[dict]:
+        return await self._analyze(texts, lambda ts: self.backend.analyze_batch(ts, batch_size))
+
+    async def aclose(self) -> None:
+        close = getattr(self.backend, "aclose", None)
+        if close is not None:
+            await close()
+
+    async def _analyze(self, texts: List[str], score: Callable[[List[str]], Awaitable[List[dict]]]) -> List[dict]:
+        if not texts:
+            return []
+
+        keys = [text_hash(t) for t in texts]
+        found: Dict[str, dict] = {}
+
+        for key in dict.fromkeys(keys):
+            hit = self._memory.get(key)
+            if hit is not None:
+                found[key] = hit
+
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        if missing and self.persist:
+            stored = await self._load(missing)
+            self.db_hits += len(stored)
+            self.db_misses += len(missing) - len(stored)
+            for key, result in stored.items():
+                self._memory.set(key, result)
+            found.update(stored)
+            missing = [k for k in missing if k not in found]
+
+        if missing:
+            # One inference per distinct text, even if repeated within the batch
+            text_for = dict(zip(keys, texts))
+            scored = list(await score([text_for[k] for k in missing]))
+
+            fresh = {k: r for k, r in zip(missing, scored) if r.get("confidence")}
+            for key, result in fresh.items():
+                self._memory.set(key, result)
+            if fresh and self.persist:
+                await self._store(fresh)
+
+            found.update(zip(missing, scored))
+
+        return [dict(found[k]) for k in keys]
+
+    # -------------------------------------------------------------
+    # PERSISTENT TIER
+    # -------------------------------------------------------------
+    async def _load(self, keys: List[str]) -> Dict[str, dict]:
+        cutoff = datetime.now(timezone.utc) - self.ttl
+        q = (
+            select(SentimentCacheEntry)
+            .where(SentimentCacheEntry.model == self.model_name)
+            .where(SentimentCacheEntry.text_hash.in_(keys))
+            .where(SentimentCacheEntry.created_at >= cutoff)
+        )
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(q)).scalars().all()
+        except Exception as e:
+            print(f"⚠ Sentiment cache read failed: {e}")
+            return {}
+
+        return {
+            r.text_hash: {"sentiment": r.sentiment, "confidence": r.confidence, "label": r.label}
+            for r in rows
+        }
+
+    async def _store(self, results: Dict[str, dict]) -> None:
+        stmt = pg_insert(SentimentCacheEntry).values([
+            {
+                "model": self.model_name,
+                "text_hash": key,
+                "sentiment": r["sentiment"],
+                "confidence": r["confidence"],
+                "label": r["label"],
+            }
+            for key, r in results.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SentimentCacheEntry.model, SentimentCacheEntry.text_hash],
+            set_={
+                "sentiment": stmt.excluded.sentiment,
+                "confidence": stmt.excluded.confidence,
+                "label": stmt.excluded.label,
+                "created_at": func.now(),
+            },
+        )
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            print(f"⚠ Sentiment cache write failed: {e}")
+
+    async def prune(self) -> int:
+        """Drop expired rows, then the oldest rows beyond SENTIMENT_CACHE_MAX_ROWS."""
+        if not self.persist:
+            return 0
+
+        cutoff = datetime.now(timezone.utc) - self.ttl
+        async with AsyncSessionLocal() as db:
+            expired = await db.execute(
+                delete(SentimentCacheEntry).where(SentimentCacheEntry.created_at < cutoff)
+            )
+
+            # By key, not by timestamp: rows stored together share created_at
+            overflow_keys = (
+                select(SentimentCacheEntry.model, SentimentCacheEntry.text_hash)
+                .order_by(SentimentCacheEntry.created_at.desc(), SentimentCacheEntry.text_hash)
+                .offset(settings.SENTIMENT_CACHE_MAX_ROWS)
+            )
+            overflow = await db.execute(
+                delete(SentimentCacheEntry).where(
+                    tuple_(SentimentCacheEntry.model, SentimentCacheEntry.text_hash).in_(overflow_keys)
+                )
+            )
+            await db.commit()
+
+        return (expired.rowcount or 0) + (overflow.rowcount or 0)
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "memory": self._memory.stats(),
+            "db_hits": self.db_hits,
+            "db_misses": self.db_misses,
+        }
@@ -1,5 +1,11 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 from huggingface_hub import InferenceClient
 from app.core.config import settings
+from app.sentiment.backend import NEUTRAL, to_sentiment_result
 
 # Create properly configured inference client
 client = InferenceClient(
@@ -7,38 +13,62 @@ client = InferenceClient(
     provider="hf-inference"
 )
 
+# InferenceClient is synchronous — run it in a worker pool, never on the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=settings.HF_MAX_CONCURRENCY,
+    thread_name_prefix="finbert",
+)
+_inflight = asyncio.Semaphore(settings.HF_MAX_CONCURRENCY)
+
+def _classify_batch(texts: List[str]) -> List[dict]:
+    raw = client.post(
+        json={"inputs": texts, "options": {"wait_for_model": True}},
+        model=settings.HF_MODEL,
+        task="text-classification",
+    )
+    outputs = json.loads(raw)
+
+    # A single input may come back un-nested
+    if len(texts) == 1 and outputs and isinstance(outputs[0], dict):
+        outputs = [outputs]
+
+    if len(outputs) != len(texts):
+        raise ValueError(f"expected {len(texts)} results, got {len(outputs)}")
+
+    return [to_sentiment_result(o) for o in outputs]
+
+
 class HFClient:
 
     @staticmethod
     async def analyze_text(text: str) -> dict:
         """
         Use ProsusAI/finbert for sentiment (no prompts, no JSON).
-        """        
-        try:
-            results = client.text_classification(
-                model=settings.HF_MODEL,
-                text=text
-            )
-
-            # Pick the top result
-            top = results[0]
-            label = top["label"].lower()
-            confidence = float(top["score"])
-
-            # Convert positive/negative/neutral → -1 .. +1
-            if label == "positive":
-                sentiment = confidence
-            elif label == "negative":
-                sentiment = -confidence
-            else:
-                sentiment = 0.0
-
-            return {
-                "sentiment": sentiment,
-                "confidence": confidence,
-                "label": label
-            }
-
-        except Exception as e:
-            print("FinBERT error:", e)
-            return {"sentiment": 0.0, "confidence": 0.0, "label": "neutral"}
+        """
+        return (await HFClient.analyze_batch([text]))[0]
+
+    @staticmethod
+    async def analyze_batch(texts: List[str], batch_size: int | None = None) -> List[dict]:
+        """
+        Score many texts with FinBERT in batched requests.
+
+        Batches run in the worker pool with at most HF_MAX_CONCURRENCY in
+        flight. Results keep input order; a failed batch scores neutral.
+        """
+        if not texts:
+            return []
+
+        size = batch_size or settings.HF_BATCH_SIZE
+        batches = [texts[i:i + size] for i in range(0, len(texts), size)]
+        loop = asyncio.get_running_loop()
+
+        async def run(batch: List[str]) -> List[dict]:
+            async with _inflight:
+                try:
+                    return await loop.run_in_executor(_executor, _classify_batch, batch)
+                except Exception as e:
+                    print("FinBERT error:", e)
+                    return [dict(NEUTRAL) for _ in batch]
+
+        results = await asyncio.gather(*(run(b) for b in batches))
+        return [r for batch in results for r in batch]
@@ -0,0 +1,191 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.sentiment.backend import NEUTRAL, to_sentiment_result
+
+
+class LocalSentimentEngine:
+    """
+    In-process CPU FinBERT engine.
+
+    Loads any FinBERT-compatible sequence-classification checkpoint from
+    LOCAL_MODEL_PATH (a directory written by `save_pretrained`, so a tiny
+    randomly initialised BERT works for smoke tests).
+
+      • analyze_batch() sorts texts by token length and pads per bucket,
+        so short headlines don't pay for the longest article in the batch
+      • analyze_text() calls are coalesced by a dynamic batcher that waits
+        at most LOCAL_MAX_WAIT_MS to fill a batch of LOCAL_MAX_BATCH
+      • LOCAL_ACCELERATION=int8 applies dynamic quantization to Linear
+        layers; =onnx runs the model through onnxruntime (optimum)
+
+    torch / transformers / optimum are imported lazily so the hosted
+    backend doesn't need them installed.
+    """
+
+    def __init__(
+        self,
+        model_path: str = settings.LOCAL_MODEL_PATH,
+        *,
+        max_batch: int = settings.LOCAL_MAX_BATCH,
+        max_wait_ms: int = settings.LOCAL_MAX_WAIT_MS,
+        max_length: int = settings.LOCAL_MAX_LENGTH,
+        acceleration: str = settings.LOCAL_ACCELERATION,
+        num_threads: int = settings.LOCAL_NUM_THREADS,
+    ):
+        if not model_path:
+            raise ValueError("LOCAL_MODEL_PATH must be set for the local sentiment backend")
+
+        self.model_path = model_path
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_length = max_length
+        self.acceleration = acceleration
+        self.num_threads = num_threads
+
+        self._tokenizer = None
+        self._model = None
+        self._labels: List[str] = []
+
+        # One inference thread; torch parallelises inside each forward pass
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finbert-local")
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+
+    # -------------------------------------------------------------
+    # MODEL LOADING
+    # -------------------------------------------------------------
+    def _load(self) -> None:
+        if self._model is not None:
+            return
+
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+
+        if self.acceleration == "onnx":
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            model = ORTModelForSequenceClassification.from_pretrained(self.model_path, export=True)
+        else:
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
+            model.eval()
+            if self.acceleration == "int8":
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        id2label = model.config.id2label
+        self._labels = [str(id2label[i]).lower() for i in range(len(id2label))]
+        self._model = model
+        print(f"🧠 Local sentiment model loaded from {self.model_path} ({self.acceleration})")
+
+    # -------------------------------------------------------------
+    # SYNC INFERENCE (worker thread)
+    # -------------------------------------------------------------
+    def _buckets(self, lengths: List[int], bucket_size: int) -> List[List[int]]:
+        """Indices grouped into batches of similar token length."""
+        order = sorted(range(len(lengths)), key=lengths.__getitem__)
+        return [order[i:i + bucket_size] for i in range(0, len(order), bucket_size)]
+
+    def _forward(self, features: dict) -> List[List[float]]:
+        """Class probabilities for one padded bucket."""
+        import torch
+
+        with torch.inference_mode():
+            logits = self._model(**features).logits  # type: ignore[misc]
+            return torch.softmax(torch.as_tensor(logits), dim=-1).tolist()
+
+    def _infer(self, texts: List[str], bucket_size: int) -> List[dict]:
+        self._load()
+        results: List[dict] = [dict(NEUTRAL) for _ in texts]
+
+        # Tokenize once; each bucket is only padded to its own longest text
+        encoded = self._tokenizer(texts, truncation=True, max_length=self.max_length)  # type: ignore[misc]
+        keys = list(encoded.keys())
+
+        for bucket in self._buckets([len(ids) for ids in encoded["input_ids"]], bucket_size):
+            features = self._tokenizer.pad(  # type: ignore[union-attr]
+                [{k: encoded[k][i] for k in keys} for i in bucket],
+                padding="longest",
+                return_tensors="pt",
+            )
+            for i, row in zip(bucket, self._forward(features)):
+                results[i] = to_sentiment_result(
+                    [{"label": label, "score": p} for label, p in zip(self._labels, row)]
+                )
+
+        return results
+
+    # -------------------------------------------------------------
+    # ASYNC API (same shape as HFClient)
+    # -------------------------------------------------------------
+    async def analyze_batch(self, texts: List[str], batch_size: int | None = None) -> List[dict]:
+        """`batch_size` caps the padded bucket size (default LOCAL_MAX_BATCH)."""
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor, self._infer, list(texts), batch_size or self.max_batch
+            )
+        except Exception as e:
+            print("Local FinBERT error:", e)
+            return [dict(NEUTRAL) for _ in texts]
+
+    async def analyze_text(self, text: str) -> dict:
+        if self._batcher is None or self._batcher.done():
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._run_batcher())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))  # type: ignore[union-attr]
+        return await future
+
+    async def aclose(self) -> None:
+        """Stop the batcher; callers still waiting on it are cancelled."""
+        if self._batcher is not None and not self._batcher.done():
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        self._batcher = None
+        self._executor.shutdown(wait=False)
+
+    async def _run_batcher(self) -> None:
+        """Coalesce single-text requests into batches (size- or time-bounded)."""
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        assert queue is not None
+        pending: List[Tuple[str, asyncio.Future]] = []
+
+        try:
+            while True:
+                pending = [await queue.get()]
+                deadline = loop.time() + self.max_wait
+
+                while len(pending) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        pending.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                results = await self.analyze_batch([text for text, _ in pending])
+                for (_, future), result in zip(pending, results):
+                    if not future.done():
+                        future.set_result(result)
+                pending = []
+        except asyncio.CancelledError:
+            # Don't leave callers awaiting futures nobody will resolve
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+            for _, future in pending:
+                future.cancel()
+            raise
@@ -0,0 +1,212 @@
+# app/services/dashboard_service.py
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Sequence, TypeVar
+
+from sqlalchemy import String, cast, func, true
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.core.response_cache import response_cache
+from app.models.news import News
+from app.models.news_ticker import NewsTicker
+from app.models.ticker_sentiment_aggregate import TickerSentimentAggregate
+from app.services.news_signal_service import get_spotlight_signals
+
+T = TypeVar("T")
+
+TRENDING_LIMIT = 10
+TICKER_NEWS_LIMIT = 10
+SPOTLIGHT_MIN_CONFIDENCE = 0.6
+
+
+# Shared by every dashboard request, so concurrent overviews cannot drain
+# the engine pool for the rest of the API
+_connections = asyncio.Semaphore(settings.DASHBOARD_MAX_CONNECTIONS)
+
+
+async def _on_own_session(query: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """
+    Run one sub-query on its own pooled connection, so siblings run
+    concurrently; at most DASHBOARD_MAX_CONNECTIONS are held at a time.
+    """
+    async with _connections:
+        async with AsyncSessionLocal() as db:
+            return await query(db)
+
+
+def sentiment_label(avg_sentiment: float) -> str:
+    return (
+        "Bullish" if avg_sentiment > 0.15 else
+        "Bearish" if avg_sentiment < -0.15 else
+        "Neutral"
+    )
+
+
+# -------------------------------------------------------------
+# SHARED PARTS (identical for every ticker)
+# -------------------------------------------------------------
+def _trending_query():
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    mentions = func.sum(TickerSentimentAggregate.news_count)
+    return (
+        select(TickerSentimentAggregate.ticker, mentions.label("mentions"))
+        .where(TickerSentimentAggregate.window_start >= cutoff)
+        .group_by(TickerSentimentAggregate.ticker)
+        .order_by(mentions.desc())
+        .limit(TRENDING_LIMIT)
+    )
+
+
+async def _trending(db: AsyncSession) -> List[dict]:
+    return [
+        {"ticker": row.ticker, "mentions": row.mentions}
+        for row in (await db.execute(_trending_query())).all() if row.ticker
+    ]
+
+
+async def trending() -> List[dict]:
+    """Most mentioned tickers; computed once per aggregator pass."""
+    key = response_cache.key("dashboard.trending", ("aggregates",), {})
+    return await response_cache.get_or_compute(key, lambda: _on_own_session(_trending))
+
+
+async def spotlight() -> List[dict]:
+    """High-confidence signals; computed once per ingest cycle."""
+    key = response_cache.key("dashboard.spotlight", ("news",), {})
+    return await response_cache.get_or_compute(
+        key,
+        lambda: _on_own_session(
+            lambda db: get_spotlight_signals(db, min_confidence=SPOTLIGHT_MIN_CONFIDENCE)
+        ),
+    )
+
+
+# -------------------------------------------------------------
+# PER-TICKER PARTS (one set-based query for any number of tickers)
+# -------------------------------------------------------------
+def normalize_tickers(tickers: Sequence[str]) -> List[str]:
+    """Upper-cased, de-duplicated, order kept; accepts "A,B" as well as repeated params."""
+    seen: Dict[str, None] = {}
+    for raw in tickers:
+        for t in raw.split(","):
+            t = t.upper().strip()
+            if t:
+                seen.setdefault(t, None)
+    return list(seen)
+
+
+def _tickers_news_query(tickers: List[str]):
+    wanted = select(func.unnest(cast(array(tickers), ARRAY(String))).label("ticker")).subquery()
+    # 🔹 LATERAL top-N per ticker: one index range read on (ticker, processed_at desc) each
+    latest = (
+        select(NewsTicker.news_id, NewsTicker.processed_at)
+        .where(NewsTicker.ticker == wanted.c.ticker)
+        .order_by(NewsTicker.processed_at.desc())
+        .limit(TICKER_NEWS_LIMIT)
+        .lateral()
+    )
+    return (
+        select(
+            wanted.c.ticker.label("for_ticker"),
+            News.id, News.title, News.source, News.url, News.tickers, News.sentiment_score,
+            News.impact_label, News.impact_confidence, News.impact_summary,
+            News.published_at, News.sector_id,
+        )
+        .select_from(wanted)
+        .join(latest, true())
+        .join(News, News.id == latest.c.news_id)
+        .order_by(wanted.c.ticker, latest.c.processed_at.desc())
+    )
+
+
+async def _tickers_news(db: AsyncSession, tickers: List[str]) -> Dict[str, List[dict]]:
+    """Latest TICKER_NEWS_LIMIT articles of each ticker."""
+    news: Dict[str, List[dict]] = {t: [] for t in tickers}
+    for row in (await db.execute(_tickers_news_query(tickers))).all():
+        item = dict(row._mapping)
+        news[item.pop("for_ticker")].append(item)
+    return news
+
+
+def _tickers_averages_query(tickers: List[str]):
+    count = func.sum(TickerSentimentAggregate.news_count)
+    return (
+        select(
+            TickerSentimentAggregate.ticker,
+            func.sum(TickerSentimentAggregate.sentiment_sum) / func.nullif(count, 0),
+            func.sum(TickerSentimentAggregate.confidence_sum)
+            / func.nullif(func.sum(TickerSentimentAggregate.confidence_count), 0),
+        )
+        .where(TickerSentimentAggregate.ticker.in_(tickers))
+        .group_by(TickerSentimentAggregate.ticker)
+    )
+
+
+async def _tickers_averages(db: AsyncSession, tickers: List[str]) -> Dict[str, tuple]:
+    """
+    (avg_sentiment, avg_confidence) of each ticker over its buckets, i.e.
+    the last TICKER_AGG_RETENTION_DAYS. Like an AVG over its articles,
+    those without an impact confidence are left out of avg_confidence.
+    """
+    averages = {t: (0, 0) for t in tickers}
+    for ticker, avg_sentiment, avg_confidence in (await db.execute(_tickers_averages_query(tickers))).all():
+        averages[ticker] = (avg_sentiment or 0, avg_confidence or 0)
+    return averages
+
+
+# -------------------------------------------------------------
+# OVERVIEW
+# -------------------------------------------------------------
+async def _overview_parts(tickers: List[str]) -> tuple:
+    """Per-ticker news and averages plus the shared sections, all concurrently."""
+    return await asyncio.gather(
+        _on_own_session(lambda db: _tickers_news(db, tickers)),
+        _on_own_session(lambda db: _tickers_averages(db, tickers)),
+        spotlight(),
+        trending(),
+    )
+
+
+def _ticker_summary(ticker: str, averages: tuple, news: List[dict]) -> dict:
+    avg_sentiment, avg_confidence = averages
+    return {
+        "ticker": ticker,
+        "avg_sentiment": round(avg_sentiment, 3),
+        "impact_confidence": round(avg_confidence, 3),
+        "sentiment_label": sentiment_label(avg_sentiment),
+        "news": news,
+    }
+
+
+async def overview(ticker: str) -> dict:
+    """
+    Dashboard payload for one ticker. The four parts run concurrently, each
+    on its own (bounded) session; trending and spotlight are shared across
+    tickers through the response cache, so only the two per-ticker lookups
+    usually reach Postgres.
+    """
+    news, averages, spotlight_items, trending_items = await _overview_parts([ticker])
+    return {
+        **_ticker_summary(ticker, averages[ticker], news[ticker]),
+        "spotlight": spotlight_items,
+        "trending": trending_items,
+    }
+
+
+async def overview_many(tickers: List[str]) -> dict:
+    """
+    Watchlist payload: the same per-ticker sections for every ticker, from
+    two grouped queries regardless of the list length, with trending and
+    spotlight included once.
+    """
+    news, averages, spotlight_items, trending_items = await _overview_parts(tickers)
+    return {
+        "tickers": [_ticker_summary(t, averages[t], news[t]) for t in tickers],
+        "spotlight": spotlight_items,
+        "trending": trending_items,
+    }
@@ -0,0 +1,106 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.ingestion.near_duplicates import normalize_text
+from app.models.news import News
+
+SNIPPET_WORDS = 60  # headline + lead is enough to tell syndicated copies apart
+
+
+def fingerprint(title: Optional[str], content: Optional[str]) -> Optional[str]:
+    """
+    Hash of the lower-cased word sequence of the headline and the start of
+    the body, so punctuation, casing and trailing boilerplate don't matter.
+    """
+    title_words = normalize_text(title, None)
+    if not title_words:
+        return None
+    words = title_words + ["|"] + normalize_text(None, content)[:SNIPPET_WORDS]
+    return hashlib.blake2b(" ".join(words).encode(), digest_size=16).hexdigest()
+
+
+class EnrichmentCache:
+    """
+    Gemini enrichment results (tickers, impact, summary, topics) keyed on
+    the article fingerprint. LRU-bounded at ENRICH_CACHE_SIZE entries and
+    expired after ENRICH_CACHE_TTL_HOURS. Tickers are the LLM's own; source
+    and matcher tickers are merged in again wherever a result is applied.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.ENRICH_CACHE_SIZE,
+        ttl: timedelta = timedelta(hours=settings.ENRICH_CACHE_TTL_HOURS),
+    ):
+        self.ttl = ttl
+        self._entries: LRUCache[dict] = LRUCache(maxsize=maxsize, ttl=ttl.total_seconds())
+        self.articles_reused = 0
+        self.llm_calls_saved = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, articles: Sequence[News]) -> Tuple[Dict[int, dict], List[News]]:
+        """Split articles into {news_id: cached result} and those still to enrich."""
+        hits: Dict[int, dict] = {}
+        misses: List[News] = []
+        for n in articles:
+            key = fingerprint(n.title, n.content)  # type: ignore
+            cached = self._entries.get(key) if key else None
+            if cached is not None:
+                hits[n.id] = cached  # type: ignore
+            else:
+                misses.append(n)
+        self.articles_reused += len(hits)
+        return hits, misses
+
+    def store(self, article: News, result: dict) -> None:
+        key = fingerprint(article.title, article.content)  # type: ignore
+        if key:
+            self._entries.set(key, result)
+
+    async def warm(self, db: AsyncSession) -> int:
+        """
+        Load results for articles enriched within the TTL. Rows enriched
+        before llm_tickers was stored are skipped: their merged tickers
+        can't be told apart from the LLM's.
+        """
+        cutoff = datetime.now(timezone.utc) - self.ttl
+        q = (
+            select(
+                News.title, News.content, News.llm_tickers, News.impact_label,
+                News.impact_confidence, News.impact_summary, News.topics,
+            )
+            .where(News.enriched_at >= cutoff)
+            .where(News.llm_tickers.isnot(None))
+            .where(News.duplicate_of.is_(None))
+            .order_by(News.enriched_at.asc())
+        )
+        rows = (await db.execute(q)).all()
+        for row in rows:
+            key = fingerprint(row.title, row.content)
+            if key:
+                self._entries.set(key, {
+                    "tickers": list(row.llm_tickers),
+                    "impact_label": row.impact_label,
+                    "impact_confidence": row.impact_confidence,
+                    "impact_summary": row.impact_summary or "",
+                    "topics": list(row.topics or []),
+                })
+        return len(rows)
+
+    def stats(self) -> dict:
+        return {
+            **self._entries.stats(),
+            "articles_reused": self.articles_reused,
+            "llm_calls_saved": self.llm_calls_saved,
+        }
+
+
+enrichment_cache = EnrichmentCache()
@@ -0,0 +1,250 @@
+# app/services/export_service.py
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import ARRAY, DateTime, Float, Integer
+from sqlalchemy.future import select
+from sqlalchemy.sql import ColumnElement
+
+from app.core.db import AsyncSessionLocal
+from app.models.news import News
+from app.models.news_ticker import NewsTicker
+from app.models.sentiment_aggregate import SentimentAggregate
+
+# Rows fetched per round trip from the server-side cursor; also the
+# Parquet row-group size. Memory stays bounded by one batch.
+EXPORT_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    tickers: Sequence[str] = ()
+    sector_id: Optional[int] = None
+
+
+# -------------------------------------------------------------
+# DATASETS
+# -------------------------------------------------------------
+NEWS_COLUMNS = [
+    News.id, News.source, News.url, News.title, News.published_at, News.processed_at,
+    News.sector_id, News.tickers, News.sentiment_score, News.sentiment_label,
+    News.impact_label, News.impact_confidence, News.topics, News.duplicate_of,
+]
+
+AGGREGATE_COLUMNS = [
+    SentimentAggregate.sector_id, SentimentAggregate.window_start, SentimentAggregate.window_end,
+    SentimentAggregate.news_count, SentimentAggregate.avg_sentiment, SentimentAggregate.avg_relevance,
+    SentimentAggregate.sentiment_sum, SentimentAggregate.relevance_sum,
+]
+
+
+def news_query(f: ExportFilters):
+    """Articles in [since, until) on published_at, oldest first (ix_news_published_at_id)."""
+    q = select(*NEWS_COLUMNS)
+    if f.tickers:
+        # Each article once, however many of the requested tickers it mentions
+        q = q.where(News.id.in_(
+            select(NewsTicker.news_id).where(NewsTicker.ticker.in_([t.upper() for t in f.tickers]))
+        ))
+    if f.sector_id is not None:
+        q = q.where(News.sector_id == f.sector_id)
+    if f.since is not None:
+        q = q.where(News.published_at >= f.since)
+    if f.until is not None:
+        q = q.where(News.published_at < f.until)
+    return q.order_by(News.published_at.asc(), News.id.asc())
+
+
+def aggregates_query(f: ExportFilters):
+    """Sector buckets in [since, until) on window_start, oldest first."""
+    if f.tickers:
+        raise ValueError("aggregates are per sector; filter them with sector_id")
+    q = select(*AGGREGATE_COLUMNS)
+    if f.sector_id is not None:
+        q = q.where(SentimentAggregate.sector_id == f.sector_id)
+    if f.since is not None:
+        q = q.where(SentimentAggregate.window_start >= f.since)
+    if f.until is not None:
+        q = q.where(SentimentAggregate.window_start < f.until)
+    return q.order_by(SentimentAggregate.window_start.asc(), SentimentAggregate.sector_id.asc())
+
+
+DATASETS: Dict[str, Callable[[ExportFilters], object]] = {
+    "news": news_query,
+    "aggregates": aggregates_query,
+}
+
+
+# -------------------------------------------------------------
+# SERVER-SIDE CURSOR
+# -------------------------------------------------------------
+async def stream_batches(query, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[List[tuple]]:
+    """
+    Yield the result in lists of at most `batch_size` rows, read through a
+    server-side cursor on its own session — nothing is buffered beyond the
+    current batch.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+
+# -------------------------------------------------------------
+# ENCODERS (batches of rows → bytes)
+# -------------------------------------------------------------
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _iso(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# C encoder; datetimes are the only values it needs help with
+_encode_json = json.JSONEncoder(separators=(",", ":"), default=_iso).encode
+
+
+async def ndjson_chunks(columns: Sequence[ColumnElement], batches: AsyncIterator[List[tuple]]) -> AsyncIterator[bytes]:
+    names = [c.name for c in columns]
+    async for batch in batches:
+        yield "".join(_encode_json(dict(zip(names, row))) + "\n" for row in batch).encode()
+
+
+def _csv_cell(value):
+    if isinstance(value, (list, tuple)):
+        return ";".join(map(str, value))
+    return _plain(value)
+
+
+async def csv_chunks(columns: Sequence[ColumnElement], batches: AsyncIterator[List[tuple]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([c.name for c in columns])
+    async for batch in batches:
+        writer.writerows([_csv_cell(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()  # header of an empty export
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file for ParquetWriter whose bytes are handed out as they are written."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ValueError("parquet export needs pyarrow installed (pip install pyarrow)") from e
+
+
+def _arrow_type(sql_type):
+    import pyarrow as pa
+
+    if isinstance(sql_type, ARRAY):
+        return pa.list_(_arrow_type(sql_type.item_type))
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if sql_type.timezone else None)
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    return pa.string()
+
+
+async def parquet_chunks(columns: Sequence[ColumnElement], batches: AsyncIterator[List[tuple]]) -> AsyncIterator[bytes]:
+    """
+    One row group per batch; the footer is written once the cursor is
+    exhausted. The schema comes from the SQL column types, so batches whose
+    values happen to be all null still line up.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c.name, _arrow_type(c.type)) for c in columns])
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    async for batch in batches:
+        writer.write_table(pa.Table.from_pydict(
+            {c.name: [row[i] for row in batch] for i, c in enumerate(columns)}, schema=schema,
+        ))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    media_type: str
+    extension: str
+    encode: Callable[[Sequence[ColumnElement], AsyncIterator[List[tuple]]], AsyncIterator[bytes]]
+    check: Optional[Callable[[], None]] = None
+
+
+FORMATS: Dict[str, ExportFormat] = {
+    "ndjson": ExportFormat("application/x-ndjson", "ndjson", ndjson_chunks),
+    "csv": ExportFormat("text/csv", "csv", csv_chunks),
+    "parquet": ExportFormat("application/vnd.apache.parquet", "parquet", parquet_chunks, require_pyarrow),
+}
+
+
+# -------------------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------------------
+def export(
+    dataset: str,
+    fmt: str,
+    filters: ExportFilters,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    Validate the request and return (ExportFormat, async byte iterator).
+    Raises ValueError for an unknown dataset / format or unusable filters,
+    before any row is read.
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"dataset must be one of {list(DATASETS)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {list(FORMATS)}")
+    export_format = FORMATS[fmt]
+    if export_format.check:
+        export_format.check()
+
+    query = DATASETS[dataset](filters)
+    return export_format, export_format.encode(list(query.selected_columns), stream_batches(query, batch_size))
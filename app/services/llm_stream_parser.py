@@ -0,0 +1,159 @@
+# app/services/llm_stream_parser.py
+
+from __future__ import annotations
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_RESULTS_RE = re.compile(r'"results"\s*:\s*\[')
+_BARE_ARRAY_RE = re.compile(r'^\s*(?:```(?:json)?\s*)?\[')
+_ITEM_START_RE = re.compile(r'\{\s*"id"\s*:')
+_ID_RE = re.compile(r'"id"\s*:\s*"?(\d+)')
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+def _salvage_id(fragment: str) -> Optional[int]:
+    m = _ID_RE.search(fragment)
+    return int(m.group(1)) if m else None
+
+
+class ResultsStreamParser:
+    """
+    Incremental parser for `{"results": [ {...}, {...} ]}` LLM responses.
+
+    Feed text chunks as they stream in; every element of `results` is
+    emitted as soon as its closing brace arrives, independently of the
+    others. Elements that don't parse are skipped and their ids (when
+    recoverable) collected in `failed_ids`, so one bad item never costs
+    the whole batch. Tolerates markdown fences, prose around the JSON and
+    a bare top-level array.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        self._state = "seek"  # seek → between ⇄ item → done
+        self._item_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.failed_ids: List[int] = []
+
+    # -------------------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------------------
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._buf += chunk
+        return self._scan()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish the stream, recovering what we can from a truncated tail."""
+        items = self._scan()
+
+        if self._state == "seek":
+            items.extend(self._parse_whole())
+        elif self._state == "item":
+            items.extend(self._recover_tail(self._buf[self._item_start:]))
+
+        self._state = "done"
+        return items
+
+    # -------------------------------------------------------------
+    # SCANNER
+    # -------------------------------------------------------------
+    def _scan(self) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        buf = self._buf
+
+        if self._state == "seek":
+            m = _RESULTS_RE.search(buf) or _BARE_ARRAY_RE.match(buf)
+            if not m:
+                return items
+            self._pos = m.end()
+            self._state = "between"
+
+        i, n = self._pos, len(buf)
+        while i < n and self._state != "done":
+            ch = buf[i]
+
+            if self._state == "between":
+                if ch == "]":
+                    self._state = "done"
+                elif ch == "{":
+                    self._state = "item"
+                    self._item_start = i
+                    self._depth = 1
+                    self._in_string = self._escape = False
+                # whitespace, commas and stray text between items are skipped
+
+            else:  # inside an item
+                if self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif ch == "\\":
+                        self._escape = True
+                    elif ch == '"':
+                        self._in_string = False
+                elif ch == '"':
+                    self._in_string = True
+                elif ch in "{[":
+                    self._depth += 1
+                elif ch in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        items.extend(self._parse_item(buf[self._item_start:i + 1]))
+                        self._state = "between"
+            i += 1
+
+        self._pos = i
+        return items
+
+    def _parse_item(self, fragment: str) -> List[Dict[str, Any]]:
+        for candidate in (fragment, _TRAILING_COMMA_RE.sub(r"\1", fragment)):
+            try:
+                item = json.loads(candidate)
+            except ValueError:
+                continue
+            if isinstance(item, dict):
+                return [item]
+
+        # A broken item can swallow its neighbours; split on `{"id":` boundaries
+        return self._recover_tail(fragment)
+
+    # -------------------------------------------------------------
+    # RECOVERY
+    # -------------------------------------------------------------
+    def _recover_tail(self, tail: str) -> List[Dict[str, Any]]:
+        """
+        An item never closed (truncated output, or an unbalanced quote that
+        swallowed what followed). Retry from every `{"id":` boundary.
+        """
+        items: List[Dict[str, Any]] = []
+        starts = [m.start() for m in _ITEM_START_RE.finditer(tail)] or [0]
+        decoder = json.JSONDecoder()
+
+        for start in starts:
+            try:
+                item, _ = decoder.raw_decode(tail, start)
+                if isinstance(item, dict):
+                    items.append(item)
+                    continue
+            except ValueError:
+                pass
+            news_id = _salvage_id(tail[start:start + 64])
+            if news_id is not None:
+                self.failed_ids.append(news_id)
+
+        return items
+
+    def _parse_whole(self) -> List[Dict[str, Any]]:
+        """No `results` array found while streaming — try the classic parse."""
+        raw = self._buf.strip()
+        for candidate in (raw, *re.findall(r"(\{.*\}|\[.*\])", raw, re.DOTALL)):
+            try:
+                data = json.loads(candidate)
+            except ValueError:
+                continue
+            results = data.get("results", []) if isinstance(data, dict) else data
+            return [r for r in results if isinstance(r, dict)] if isinstance(results, list) else []
+        return self._recover_tail(raw)
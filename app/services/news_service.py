@@ -1,11 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import Float, case, cast, delete, update, func, or_, bindparam, tuple_, Row
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import json
 from sqlalchemy.exc import IntegrityError
 
 from app.models.news import News
+from app.models.news_ticker import NewsTicker
+
+# Keeps each multi-row INSERT well under the 32k bind-parameter limit
+INSERT_CHUNK_SIZE = 1000
 
 
 class NewsService:
@@ -17,10 +24,10 @@ class NewsService:
         return await db.get(News, news_id)
 
     # -------------------------------------------------------------
-    # CREATE / INSERT NEWS
+    # BUILD ROW FROM RAW ARTICLE PAYLOAD
     # -------------------------------------------------------------
     @staticmethod
-    async def create(db: AsyncSession, payload: dict) -> Optional[News]:
+    def _build_row(payload: dict) -> dict:
         # 🔹 Ensure JSON-safe raw_payload
         safe_payload: dict = {}
         for key, value in payload.items():
@@ -43,7 +50,7 @@ class NewsService:
         if not isinstance(raw_tickers, list):
             raw_tickers = []
 
-        news = News(
+        return dict(
             source=safe_payload.get("source"),
             url=safe_payload.get("url"),
             title=safe_payload.get("title"),
@@ -53,36 +60,118 @@ class NewsService:
             sector_id=payload.get("sector_id", 0),
             language=safe_payload.get("language"),
             raw_payload=safe_payload,
+            ticker_sentiments=payload.get("ticker_sentiments"),
             sentiment_score=None,
             sentiment_label=None,
             impact_label=None,
             impact_confidence=None,
             impact_summary=None,
             processed_at=None,
+            enriched_at=None,
         )
 
+    # -------------------------------------------------------------
+    # CREATE / INSERT NEWS
+    # -------------------------------------------------------------
+    @staticmethod
+    async def create(db: AsyncSession, payload: dict) -> Optional[News]:
+        news = News(**NewsService._build_row(payload))
+
         db.add(news)
         try:
             await db.commit()
             await db.refresh(news)
+            await NewsService.sync_tickers(db, [news.id])  # type: ignore
             return news
         except IntegrityError:
             # ⚠ Duplicate URL (unique constraint) → ignore and rollback
             await db.rollback()
             return None
 
+    # -------------------------------------------------------------
+    # BULK INSERT (duplicates skipped by the database)
+    # -------------------------------------------------------------
+    @staticmethod
+    async def create_many(db: AsyncSession, payloads: List[dict]) -> List[Row]:
+        """
+        Insert many articles with INSERT ... ON CONFLICT (url) DO NOTHING.
+        Returns (id, title, content) for the rows actually inserted.
+        """
+        rows: dict = {}
+        for payload in payloads:
+            row = NewsService._build_row(payload)
+            if row["url"]:
+                rows.setdefault(row["url"], row)  # dedupe within the batch too
+
+        if not rows:
+            return []
+
+        values = list(rows.values())
+        inserted: List[Row] = []
+        for i in range(0, len(values), INSERT_CHUNK_SIZE):
+            stmt = (
+                pg_insert(News)
+                .values(values[i:i + INSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing(index_elements=[News.url])
+                .returning(News.id, News.title, News.content)
+            )
+            inserted.extend((await db.execute(stmt)).all())
+
+        await db.commit()
+        return inserted
+
+    # -------------------------------------------------------------
+    # KEYSET PAGES (newest first on published_at, id)
+    # -------------------------------------------------------------
+    @staticmethod
+    async def _page_by_published(
+        db: AsyncSession,
+        q,
+        limit: int,
+        after: Optional[Tuple[Optional[datetime], int]],
+    ) -> List[News]:
+        """
+        Rows strictly after `after` = (published_at, id) of the previous
+        page's last row, in the order of ORDER BY published_at DESC, id DESC:
+        undated articles first (Postgres sorts NULLs first on DESC), by id,
+        then dated ones off the (published_at DESC, id DESC) indexes.
+        Every page is a single index range scan, however deep.
+        """
+        rows: List[News] = []
+        if after is None or after[0] is None:
+            undated = NewsService._undated_page_query(q, limit, after)
+            rows = list((await db.execute(undated)).scalars().all())
+
+        if len(rows) < limit:
+            dated = NewsService._dated_page_query(q, limit - len(rows), after)
+            rows += (await db.execute(dated)).scalars().all()
+
+        return rows
+
+    @staticmethod
+    def _undated_page_query(q, limit: int, after: Optional[Tuple[Optional[datetime], int]]):
+        q = q.where(News.published_at.is_(None))
+        if after is not None:
+            q = q.where(News.id < after[1])
+        return q.order_by(News.id.desc()).limit(limit)
+
+    @staticmethod
+    def _dated_page_query(q, limit: int, after: Optional[Tuple[Optional[datetime], int]]):
+        q = q.where(News.published_at.isnot(None))
+        if after is not None and after[0] is not None:
+            q = q.where(tuple_(News.published_at, News.id) < tuple_(*after))
+        return q.order_by(News.published_at.desc(), News.id.desc()).limit(limit)
+
     # -------------------------------------------------------------
     # LIST RECENT NEWS
     # -------------------------------------------------------------
     @staticmethod
-    async def list_recent(db: AsyncSession, limit: int = 50) -> List[News]:
-        q = (
-            select(News)
-            .order_by(News.published_at.desc())
-            .limit(limit)
-        )
-        result = await db.execute(q)
-        return result.scalars().all()  # type: ignore
+    async def list_recent(
+        db: AsyncSession,
+        limit: int = 50,
+        after: Optional[Tuple[Optional[datetime], int]] = None,
+    ) -> List[News]:
+        return await NewsService._page_by_published(db, select(News), limit, after)
 
     # -------------------------------------------------------------
     # LIST NEWS BY SECTOR
@@ -91,16 +180,14 @@ class NewsService:
     async def list_by_sector(
         db: AsyncSession,
         sector_id: int,
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[Tuple[Optional[datetime], int]] = None,
     ) -> List[News]:
-        q = (
-            select(News)
-            .where(News.sector_id == sector_id)
-            .order_by(News.published_at.desc())
-            .limit(limit)
-        )
-        result = await db.execute(q)
-        return result.scalars().all()  # type: ignore
+        return await NewsService._page_by_published(db, NewsService._sector_query(sector_id), limit, after)
+
+    @staticmethod
+    def _sector_query(sector_id: int):
+        return select(News).where(News.sector_id == sector_id)
 
     # -------------------------------------------------------------
     # UPDATE SENTIMENT
@@ -123,8 +210,37 @@ class NewsService:
         db.add(news)
         await db.commit()
         await db.refresh(news)
+        await NewsService.sync_tickers(db, [news_id])
         return news
 
+    # -------------------------------------------------------------
+    # BULK UPDATE SENTIMENT
+    # -------------------------------------------------------------
+    @staticmethod
+    async def update_sentiment_many(db: AsyncSession, scores: List[dict]) -> int:
+        """
+        scores: [{"id": news_id, "score": float, "label": str}, ...]
+        """
+        if not scores:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        await db.execute(
+            update(News),
+            [
+                {
+                    "id": s["id"],
+                    "sentiment_score": s["score"],
+                    "sentiment_label": s["label"],
+                    "processed_at": now,
+                }
+                for s in scores
+            ],
+        )
+        await db.commit()
+        await NewsService.sync_tickers(db, [s["id"] for s in scores])
+        return len(scores)
+
     # -------------------------------------------------------------
     # UPDATE ENRICHMENT (Tickers, Impact, Sector)
     # -------------------------------------------------------------
@@ -159,6 +275,7 @@ class NewsService:
         # 🔹 Save impact fields
         if impact_label is not None:
             news.impact_label = impact_label  # type: ignore
+            news.enriched_at = datetime.now(timezone.utc)  # type: ignore
 
         if impact_confidence is not None:
             news.impact_confidence = impact_confidence  # type: ignore
@@ -175,4 +292,144 @@ class NewsService:
         db.add(news)
         await db.commit()
         await db.refresh(news)
+        await NewsService.sync_tickers(db, [news_id])
         return news
+
+    # -------------------------------------------------------------
+    # BULK UPDATE SECTOR (only where not yet assigned)
+    # -------------------------------------------------------------
+    @staticmethod
+    async def update_sectors_many(db: AsyncSession, sectors: dict) -> int:
+        """
+        sectors: {news_id: sector_id}
+
+        processed_at is the time of this write, not the start of the
+        session's transaction, so rows never land behind the aggregator
+        watermark.
+        """
+        if not sectors:
+            return 0
+
+        table = News.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("news_id"))
+            .where(or_(table.c.sector_id.is_(None), table.c.sector_id == 0))
+            .values(sector_id=bindparam("new_sector_id"), processed_at=datetime.now(timezone.utc))
+        )
+        await db.execute(
+            stmt,
+            [{"news_id": nid, "new_sector_id": sid} for nid, sid in sectors.items()],
+        )
+        await db.commit()
+        return len(sectors)
+
+    # -------------------------------------------------------------
+    # NEAR-DUPLICATES (inherit results from the canonical row)
+    # -------------------------------------------------------------
+    @staticmethod
+    async def link_duplicates(db: AsyncSession, links: List[tuple]) -> int:
+        """
+        links: [(duplicate_id, canonical_id), ...]
+        """
+        if not links:
+            return 0
+
+        await db.execute(
+            update(News),
+            [{"id": dup_id, "duplicate_of": canonical_id} for dup_id, canonical_id in links],
+        )
+        await NewsService.propagate_from_canonical(db, list({c for _, c in links}))
+        return len(links)
+
+    @staticmethod
+    async def propagate_from_canonical(db: AsyncSession, canonical_ids: List[int]) -> None:
+        """
+        Copy sentiment, tickers, sector and impact from canonical rows to their
+        duplicates. Duplicates are stamped with the time of the copy, not the
+        canonical's processed_at, so they land after the aggregator watermark;
+        a canonical without tickers leaves the duplicate's own tickers alone.
+        """
+        if not canonical_ids:
+            return
+
+        canon = aliased(News)
+        stmt = (
+            update(News)
+            .where(News.duplicate_of == canon.id)
+            .where(canon.id.in_(canonical_ids))
+            .values(
+                sentiment_score=canon.sentiment_score,
+                sentiment_label=canon.sentiment_label,
+                tickers=case((func.cardinality(canon.tickers) > 0, canon.tickers), else_=News.tickers),
+                sector_id=func.coalesce(func.nullif(canon.sector_id, 0), News.sector_id),
+                topics=canon.topics,
+                ticker_sentiments=canon.ticker_sentiments,
+                impact_label=canon.impact_label,
+                impact_confidence=canon.impact_confidence,
+                impact_summary=canon.impact_summary,
+                enriched_at=canon.enriched_at,
+                processed_at=func.now(),
+            )
+            .returning(News.id)
+            .execution_options(synchronize_session=False)
+        )
+        duplicate_ids = (await db.execute(stmt)).scalars().all()
+        await db.commit()
+        await NewsService.sync_tickers(db, [*canonical_ids, *duplicate_ids])
+
+    # -------------------------------------------------------------
+    # NEWS_TICKERS (one row per article × ticker)
+    # -------------------------------------------------------------
+    @staticmethod
+    async def sync_tickers(db: AsyncSession, news_ids: List[int]) -> None:
+        """
+        Rewrite the news_tickers rows of these articles from news.tickers,
+        taking each ticker's score from news.ticker_sentiments when present.
+        """
+        if not news_ids:
+            return
+
+        unnested = (
+            select(
+                News.id.label("news_id"),
+                func.unnest(News.tickers).label("ticker"),
+                func.coalesce(News.published_at, News.fetched_at).label("published_at"),
+                News.processed_at,
+                News.sentiment_score,
+                News.impact_confidence,
+                News.ticker_sentiments,
+            )
+            .where(News.id.in_(news_ids))
+            .subquery()
+        )
+
+        # Per-ticker score / confidence from ticker_sentiments, else the article's own
+        ticker = func.upper(unnested.c.ticker)
+
+        def per_ticker(field: str, fallback):
+            value = func.json_extract_path_text(unnested.c.ticker_sentiments, ticker, field)
+            return func.coalesce(cast(value, Float), fallback)
+
+        rows = (
+            select(
+                unnested.c.news_id,
+                ticker,
+                unnested.c.published_at,
+                unnested.c.processed_at,
+                per_ticker("score", unnested.c.sentiment_score),
+                per_ticker("confidence", unnested.c.impact_confidence),
+            )
+            .where(unnested.c.ticker != "")
+        )
+
+        await db.execute(delete(NewsTicker).where(NewsTicker.news_id.in_(news_ids)))
+        await db.execute(
+            pg_insert(NewsTicker)
+            .from_select(
+                ["news_id", "ticker", "published_at", "processed_at", "sentiment_score", "impact_confidence"],
+                rows,
+            )
+            .on_conflict_do_nothing()
+        )
+        await db.commit()
@@ -1,13 +1,14 @@
 # app/services/news_signal_service.py
 
 from __future__ import annotations
+import asyncio
 import json
 import textwrap
 import logging
-import re
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -16,13 +17,21 @@ from sqlalchemy import func
 from google.genai import Client
 from app.models.news import News
 from app.services.sector_service import SectorService
+from app.services.news_service import NewsService
+from app.services.ticker_matcher import get_matcher
+from app.services.llm_stream_parser import ResultsStreamParser
+from app.services.enrichment_cache import enrichment_cache
 from app.core.config import settings
+from app.core.db import AsyncSessionLocal
 
 logger = logging.getLogger(__name__)
 
 # Gemini Async Client
 client = Client(api_key=settings.GEMINI_API_KEY).aio
 
+# Caps concurrent Gemini calls across every enrichment worker
+_gemini_slots = asyncio.Semaphore(settings.ENRICH_MAX_CONCURRENCY)
+
 
 @dataclass
 class NewsSignal:
@@ -38,309 +47,313 @@ class NewsSignal:
 # Fallback ticker detection
 # ----------------------------------------------
 def detect_tickers_from_text(text: str) -> List[str]:
-    text_upper = text.upper()
-
-    mapping = {
-        "BANK OF BARODA": "BANKBARODA.NS", #Banking stocks 
-        "BOB": "BANKBARODA.NS",
-        "AXIS BANK": "AXISBANK.NS",
-        "AXIS": "AXISBANK.NS",
-        "KOTAK": "KOTAKBANK.NS",
-        "KOTAK BANK": "KOTAKBANK.NS",
-        "ICICI": "ICICIBANK.NS",
-        "ICICI BANK": "ICICIBANK.NS",
-        "HDFC BANK": "HDFCBANK.NS",
-        "HDFC": "HDFCBANK.NS",
-        "SBI": "SBIN.NS",
-        "STATE BANK OF INDIA": "SBIN.NS",
-        "PNB": "PNB.NS",
-        "PUNJAB NATIONAL BANK": "PNB.NS",
-        "CANARA": "CANBK.NS",
-        "CANARA BANK": "CANBK.NS",
-        "IDBI": "IDBI.NS",
-        "IDFC": "IDFC.NS",
-        "IDFC FIRST": "IDFCFIRSTB.NS",
-        "IDFC FIRST BANK": "IDFCFIRSTB.NS",
-        "YES BANK": "YESBANK.NS",
-        "YES": "YESBANK.NS",
-        "INDUSIND": "INDUSINDBK.NS",
-        "INDUSIND BANK": "INDUSINDBK.NS",
-        "BANDHAN": "BANDHANBNK.NS",
-        "BANDHAN BANK": "BANDHANBNK.NS",
-        "FEDERAL BANK": "FEDERALBNK.NS",
-        "RBL BANK": "RBLBANK.NS",
-        "RBL": "RBLBANK.NS",
-        "UNION BANK": "UNIONBANK.NS",
-        "UCO BANK": "UCOBANK.NS",
-        "INDIAN BANK": "INDIANB.NS",
-        "JK BANK": "J&KBANK.NS",
-        "KARUR VYSYA": "KARURVYSYA.NS",
-        "CUB": "CUB.NS",
-        "CITY UNION BANK": "CUB.NS",
-        "MUTHOOT": "MUTHOOTFIN.NS",
-        "MUTHOOT FINANCE": "MUTHOOTFIN.NS",
-        "MANAPPURAM": "MANAPPURAM.NS",
-        "BAJAJ FINANCE": "BAJFINANCE.NS",
-        "BAJFIN": "BAJFINANCE.NS",
-        "BAJAJ FINSERV": "BAJAJFINSV.NS",
-        "SBILIFE": "SBILIFE.NS",
-        "HDFC LIFE": "HDFCLIFE.NS",
-        "ICICI PRU": "ICICIPRULI.NS",
-        "HDFC AMC": "HDFCAMC.NS",
-        "TCS": "TCS.NS", #IT sector stocks
-        "TATA CONSULTANCY": "TCS.NS",
-        "INFOSYS": "INFY.NS",
-        "INFY": "INFY.NS",
-        "WIPRO": "WIPRO.NS",
-        "WIPRO LTD": "WIPRO.NS",
-        "HCL": "HCLTECH.NS",
-        "HCL TECHNOLOGIES": "HCLTECH.NS",
-        "TECH MAHINDRA": "TECHM.NS",
-        "TECHM": "TECHM.NS",
-        "LTIMINDTREE": "LTIM.NS",
-        "LTIM": "LTIM.NS",
-        "PERSISTENT": "PERSISTENT.NS",
-        "MPHASIS": "MPHASIS.NS",
-        "COFORGE": "COFORGE.NS",
-        "KPIT": "KPITTECH.NS",
-        "KPIT TECHNOLOGIES": "KPITTECH.NS",
-        "SONATA": "SONATSOFTW.NS",
-        "SONATA SOFTWARE": "SONATSOFTW.NS",
-        "TANLA": "TANLA.NS",
-        "TANLA SOLUTIONS": "TANLA.NS",
-        "RATEGAIN": "RATEGAIN.NS",
-        "RATEGAIN TRAVEL": "RATEGAIN.NS",
-        "AIRTEL": "BHARTIARTL.NS",
-        "BHARTI AIRTEL": "BHARTIARTL.NS",
-        "VODAFONE IDEA": "IDEA.NS",
-        "VI": "IDEA.NS",
-        "JIO FIN": "JIOFIN.NS",
-        "JIO FINANCIAL": "JIOFIN.NS",
-        "INFO EDGE": "NAUKRI.NS",
-        "NAUKRI": "NAUKRI.NS",
-        "ZOMATO": "ZOMATO.NS",
-        "PAYTM": "PAYTM.NS",
-        "NYKAA": "NYKAA.NS",
-        "DELHIVERY": "DELHIVERY.NS",
-        "IRCTC": "IRCTC.NS",
-        "MAPMYINDIA": "MAPMYINDIA.NS",
-        "FLIPKART": "WMT",  # Parent Walmart (India not listed)
-        "INDIAMART": "INDIAMART.NS",
-        "AXISCADES": "AXISCADES.NS",
-        "SASKEN": "SASKEN.NS",
-        "SUBEX": "SUBEXLTD.NS",
-        "ORACLE FINANCIAL": "OFSS.NS",
-        "OFSS": "OFSS.NS",
-        "RELIANCE": "RELIANCE.NS", # Energy & Oil stocks
-        "RIL": "RELIANCE.NS",
-        "ONGC": "ONGC.NS",
-        "OIL INDIA": "OIL.NS",
-        "IOC": "IOC.NS",
-        "INDIAN OIL": "IOC.NS",
-        "BPCL": "BPCL.NS",
-        "BHARAT PETROLEUM": "BPCL.NS",
-        "HPCL": "HINDPETRO.NS",
-        "HINDUSTAN PETROLEUM": "HINDPETRO.NS",
-        "PETRONET LNG": "PETRONET.NS",
-        "PETRONET": "PETRONET.NS",
-        "GSPL": "GSPL.NS",
-        "GAIL": "GAIL.NS",
-        "EXIDE": "EXIDEIND.NS",
-        "AMARA RAJA": "AMARAJABAT.NS",
-        "AMARA RAJA BATTERY": "AMARAJABAT.NS",
-        "NTPC": "NTPC.NS", #Power & Renewables stocks
-        "TATA POWER": "TATAPOWER.NS",
-        "ADANI ENERGY": "ADANIENT.NS",
-        "ADANI GREEN": "ADANIGREEN.NS",
-        "ADANI TRANSMISSION": "ADANIENERGY.NS",  # New NSE code
-        "ADANI POWER": "ADANIPOWER.NS",
-        "POWERGRID": "POWERGRID.NS",
-        "JSW ENERGY": "JSWENERGY.NS",
-        "CESC": "CESC.NS",
-        "NHPC": "NHPC.NS",
-        "SJVN": "SJVN.NS",
-        "JSW STEEL": "JSWSTEEL.NS", #Metals & Mining stocks
-        "TATA STEEL": "TATASTEEL.NS",
-        "HINDALCO": "HINDALCO.NS",
-        "VEDANTA": "VEDL.NS",
-        "SAIL": "SAIL.NS",
-        "NMDC": "NMDC.NS",
-        "COAL INDIA": "COALINDIA.NS",
-        "KIOCL": "KIOCL.NS",
-        "MOIL": "MOIL.NS",
-        "JINDAL STEEL": "JINDALSTEL.NS",
-        "JINDAL": "JINDALSTEL.NS",
-        "APL APOLLO": "APLAPOLLO.NS",
-        "GRAVITA": "GRAVITA.NS",
-        "HIND ZINC": "HZL.NS",
-        "HZL": "HZL.NS",
-        "TATA MOTORS": "TATAMOTORS.NS",
-        "TAMO": "TATAMOTORS.NS",
-        "MARUTI": "MARUTI.NS",
-        "MARUTI SUZUKI": "MARUTI.NS",
-        "MAHINDRA": "M&M.NS",
-        "M&M": "M&M.NS",
-        "HERO": "HEROMOTOCO.NS",
-        "HEROMOTO": "HEROMOTOCO.NS",
-        "TVS": "TVSMOTOR.NS",
-        "TVSMOTOR": "TVSMOTOR.NS",
-        "BAJAJ AUTO": "BAJAJ-AUTO.NS",
-        "BAJAJAUTO": "BAJAJ-AUTO.NS",
-        "ASHOK LEYLAND": "ASHOKLEY.NS",
-        "ASHOKLEY": "ASHOKLEY.NS",
-        "EICHER": "EICHERMOT.NS",
-        "ROYAL ENFIELD": "EICHERMOT.NS",
-        "BHARAT FORGE": "BHARATFORG.NS",
-        "APOLLO TYRES": "APOLLOTYRE.NS",
-        "GOODYEAR": "GOODYEAR.NS",
-        "MRF": "MRF.NS",
-        "CEAT": "CEATLTD.NS",
-        "EXIDE": "EXIDEIND.NS",
-        "EXIDE INDUSTRIES": "EXIDEIND.NS",
-        "AMARA RAJA": "AMARAJABAT.NS",
-        "ARBL": "AMARAJABAT.NS",
-        "SUVEN": "SUVENPHAR.NS",
-        "Olectra": "OLECTRA.NS",
-        "OLECTRA GREENTECH": "OLECTRA.NS",
-        "SML ISUZU": "SMLISUZU.NS",
-        "ISUZU": "SMLISUZU.NS",
-        "ENDURANCE": "ENDURANCE.NS",
-        "SUNDRAM": "SUNDRMFAST.NS",
-        "VARROC": "VARROC.NS",
-        "MOTHERSUMI": "MOTHERSON.NS",
-        "MOTHERSON": "MOTHERSON.NS",
-        "INDIGO": "INDIGO.NS",
-        "INTERGLOBE": "INDIGO.NS",
-        "SPICEJET": "SPICEJET.NS",
-        "FRANKLIN TEMPLETON": "FLY.NS",  # (example aviation services company)
-        "GLOBAL VECTRA": "GLOBALVECT.NS",
-        "INDIAN HOTELS": "INDHOTEL.NS",
-        "TAJ HOTELS": "INDHOTEL.NS",
-        "TAJ": "INDHOTEL.NS",
-        "LEMON TREE": "LEMONTREE.NS",
-        "LEMONTREE": "LEMONTREE.NS",
-        "EIH": "EIHOTEL.NS",
-        "OBEROI": "EIHOTEL.NS",
-        "CHALET": "CHALET.NS",
-        "ROYAL ORCHID": "ROHLTD.NS",
-        "ROYAL ORCHID HOTELS": "ROHLTD.NS",
-        # Tourism, IRCTC & travel services
-        "IRCTC": "IRCTC.NS",
-        "YATRA": "YATRA.NS",
-        "THOMAS COOK": "THOMASCOOK.NS",
-        "THOMASCOOK": "THOMASCOOK.NS",
-        "ADANI PORTS": "ADANIPORTS.NS",
-        "ADANIPORT": "ADANIPORTS.NS",
-        "SHIPPING CORP": "SCI.NS",
-        "SCI": "SCI.NS",
-        "SEAMEC": "SEAMECLTD.NS",
-    }
+    return get_matcher().detect(text)
+
 
-    return list({sym for name, sym in mapping.items() if name in text_upper})
+def ticker_sentiments_for(news: News, tickers: List[str], confidence: float) -> Optional[Dict[str, dict]]:
+    """
+    {ticker: {"score", "confidence"}} — source-provided entries (AlphaVantage)
+    are kept; other tickers inherit the article sentiment and impact confidence.
+    """
+    existing = dict(news.ticker_sentiments or {})  # type: ignore
+    for t in tickers:
+        if t not in existing and news.sentiment_score is not None:
+            existing[t] = {"score": float(news.sentiment_score), "confidence": float(confidence)}  # type: ignore
+    return existing or None
 
 
 # ----------------------------------------------
-async def fetch_unenriched_news(db: AsyncSession, *, limit: int = 10) -> List[News]:
+def _unenriched_filter() -> list:
     cutoff = datetime.now(timezone.utc) - timedelta(hours=48)
+    return [
+        News.processed_at.isnot(None),
+        News.duplicate_of.is_(None),  # duplicates inherit from their canonical row
+        News.enriched_at.is_(None),  # matches the ix_news_unenriched partial index
+        News.published_at >= cutoff,
+    ]
+
 
+def unenriched_news_query(
+    *,
+    limit: int = 10,
+    claim: bool = False,
+    exclude_ids: Optional[Set[int]] = None,
+):
     q = (
         select(News)
-        .where(News.processed_at.isnot(None))
-        .where((News.impact_label.is_(None)) | (func.cardinality(News.tickers) == 0))
-        .where(News.published_at >= cutoff)
+        .where(*_unenriched_filter())
         .order_by(News.processed_at.desc())
         .limit(limit)
     )
+    if exclude_ids:
+        q = q.where(News.id.notin_(exclude_ids))
+    if claim:
+        q = q.with_for_update(skip_locked=True, of=News)
+    return q
+
+
+async def fetch_unenriched_news(
+    db: AsyncSession,
+    *,
+    limit: int = 10,
+    claim: bool = False,
+    exclude_ids: Optional[Set[int]] = None,
+) -> List[News]:
+    """
+    claim=True locks the rows (FOR UPDATE SKIP LOCKED) until the session
+    commits, so concurrent workers never pick the same articles.
+    """
+    q = unenriched_news_query(limit=limit, claim=claim, exclude_ids=exclude_ids)
     return (await db.execute(q)).scalars().all() #type:ignore
 
 
+async def count_unenriched_news(db: AsyncSession) -> int:
+    q = select(func.count(News.id)).where(*_unenriched_filter())
+    return int((await db.execute(q)).scalar() or 0)
+
+
 # ----------------------------------------------
-def build_llm_prompt(news_batch: List[News]) -> str:
-    items = [
-        {
-            "id": n.id,
-            "headline": n.title or "",
-            "snippet": (n.content or "")[:600],
-        }
-        for n in news_batch
-    ]
+# Prompt packing (token-budgeted)
+# ----------------------------------------------
+CHARS_PER_TOKEN = 4  # rough average for English news text
+OUTPUT_TOKENS_PER_ITEM = 80  # one result object in the response
 
-    return textwrap.dedent(f"""
+PROMPT_HEADER = textwrap.dedent("""
 You are an AI Indian stock market analyst.
 
 Return STRICT JSON ONLY:
-{{
-  "results": [
-    {{
-      "id": <news_id>,
-      "tickers": ["RELIANCE.NS"],
-      "impact_label": "bullish" | "bearish" | "neutral" | "uncertain",
-      "impact_confidence": 0.0 - 1.0,
-      "impact_summary": "Short 1-sentence impact",
-      "topics": []
-    }}
-  ]
-}}
+{"results":[{"id":<news_id>,"tickers":["RELIANCE.NS"],"impact_label":"bullish"|"bearish"|"neutral"|"uncertain","impact_confidence":0.0-1.0,"impact_summary":"Short 1-sentence impact","topics":[]}]}
 
 Rules:
 - Use ONLY valid Indian tickers (<SYMBOL>.NS)
 - If no confidence → tickers: [], impact_label="uncertain", confidence=0.5
 - NO markdown, NO backticks, NO text outside JSON
 
-News batch:
-{json.dumps(items, indent=2)}
-    """).strip()
+News batch (one JSON object per line; h=headline, s=snippet):
+""").strip()
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    return cut[: cut.rfind(" ")] if " " in cut else cut
+
+
+def _serialize_item(n: News) -> str:
+    return json.dumps(
+        {
+            "id": n.id,
+            "h": n.title or "",
+            "s": _truncate_to_tokens(n.content or "", settings.GEMINI_SNIPPET_TOKENS),
+        },
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+def build_llm_prompt(news_batch: List[News]) -> str:
+    return PROMPT_HEADER + "\n" + "\n".join(_serialize_item(n) for n in news_batch)
+
+
+def pack_prompts(
+    news_batch: List[News],
+    *,
+    prompt_budget: int = settings.GEMINI_PROMPT_TOKEN_BUDGET,
+    output_budget: int = settings.GEMINI_OUTPUT_TOKEN_BUDGET,
+) -> List[Tuple[str, List[News], int]]:
+    """
+    Split a batch into as few prompts as possible, each within the prompt
+    and expected-output token budgets. Returns (prompt, items, est_tokens).
+    """
+    header_tokens = estimate_tokens(PROMPT_HEADER)
+    max_items = max(1, output_budget // OUTPUT_TOKENS_PER_ITEM)
+
+    packs: List[Tuple[str, List[News], int]] = []
+    lines: List[str] = []
+    items: List[News] = []
+    used = header_tokens
+
+    def flush() -> None:
+        if items:
+            packs.append((PROMPT_HEADER + "\n" + "\n".join(lines), list(items), used))
+
+    for n in news_batch:
+        line = _serialize_item(n)
+        cost = estimate_tokens(line) + 1
+        if items and (used + cost > prompt_budget or len(items) >= max_items):
+            flush()
+            lines, items, used = [], [], header_tokens
+        lines.append(line)
+        items.append(n)
+        used += cost
+
+    flush()
+    return packs
 
 
 # ----------------------------------------------
-async def call_llm_for_signals(prompt: str) -> dict:
-    try:
-        response = await client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-        )
-        raw = response.text.strip()  # type: ignore
+async def call_llm_for_signals(prompt: str, *, estimated_tokens: Optional[int] = None) -> dict:
+    """
+    Stream the Gemini response and parse `results` item by item as it
+    arrives. Returns {"results": [...], "failed_ids": [...]}; items that
+    were malformed (or cut off by an error) are reported, not fatal.
+    """
+    parser = ResultsStreamParser()
+    results: List[Dict[str, Any]] = []
+    last_chunk = None
 
-        try:
-            return json.loads(raw)
-        except Exception:
-            match = re.search(r'(\{.*\}|\[.*\])', raw, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
+    try:
+        async with _gemini_slots:
+            stream = await client.models.generate_content_stream(
+                model="gemini-2.5-flash",
+                contents=prompt,
+            )
+            async for chunk in stream:
+                last_chunk = chunk
+                if chunk.text:
+                    results.extend(parser.feed(chunk.text))
 
     except Exception as e:
         logger.error(f"Gemini error: {e}")
 
-    return {}
+    results.extend(parser.close())
+    if last_chunk is not None:
+        _log_token_usage(last_chunk, estimated_tokens or estimate_tokens(prompt))
+    if parser.failed_ids:
+        logger.warning(f"⚠ Unparseable Gemini items for ids {parser.failed_ids}")
+
+    return {"results": results, "failed_ids": parser.failed_ids}
+
+
+# Running totals across all Gemini calls in this process
+token_usage: Dict[str, int] = {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+
+
+def _log_token_usage(response: Any, estimated: int) -> None:
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = int(getattr(usage, "prompt_token_count", 0) or 0)
+    output_tokens = int(getattr(usage, "candidates_token_count", 0) or 0)
+
+    token_usage["calls"] += 1
+    token_usage["prompt_tokens"] += prompt_tokens
+    token_usage["output_tokens"] += output_tokens
+    logger.info(
+        f"🧮 Gemini call: prompt {prompt_tokens} tokens (est {estimated}), output {output_tokens} tokens"
+    )
 
 
 # ----------------------------------------------
 def parse_llm_signals(raw: Dict[str, Any]) -> List[NewsSignal]:
-    results = raw.get("results", [])
-    return [
-        NewsSignal(
-            news_id=int(r["id"]),
-            tickers=[t.upper() for t in (r.get("tickers") or [])],
-            impact_label=r.get("impact_label", "uncertain"),
-            impact_confidence=float(r.get("impact_confidence") or 0.5),
-            impact_summary=r.get("impact_summary", ""),
-            topics=r.get("topics", []),
-        )
-        for r in results if r.get("id")
-    ]
+    signals: List[NewsSignal] = []
+    for r in raw.get("results", []):
+        try:
+            if not r.get("id"):
+                continue
+            signals.append(NewsSignal(
+                news_id=int(r["id"]),
+                tickers=[str(t).upper() for t in (r.get("tickers") or [])],
+                impact_label=r.get("impact_label", "uncertain"),
+                impact_confidence=float(r.get("impact_confidence") or 0.5),
+                impact_summary=r.get("impact_summary", ""),
+                topics=r.get("topics", []),
+            ))
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.warning(f"⚠ Skipping malformed signal {r!r}: {e}")
+    return signals
+
+
+def _enrichment_fields(news: News) -> tuple:
+    return (
+        list(news.tickers or []), news.impact_label, news.impact_confidence,  # type: ignore
+        news.impact_summary, list(news.topics or []), news.ticker_sentiments, news.sector_id,  # type: ignore
+    )
 
 
 # ----------------------------------------------
-async def enrich_news_batch(db: AsyncSession, *, batch_size: int = 10) -> int:
-    news_batch = await fetch_unenriched_news(db, limit=batch_size)
+MAX_LLM_ATTEMPTS = 2  # first try + one re-queue for items the response dropped or garbled
+
+
+@dataclass
+class DrainState:
+    """Per-drain bookkeeping shared by enrichment workers."""
+    attempts: Dict[int, int] = field(default_factory=dict)
+    claimed: int = 0
+    requeued: int = 0
+
+    def exhausted_ids(self) -> Set[int]:
+        return {nid for nid, n in self.attempts.items() if n >= MAX_LLM_ATTEMPTS}
+
+
+@dataclass
+class BatchOutcome:
+    """What one enrich_news_batch call did; filled in even if it later fails."""
+    claimed: int = 0
+    enriched: int = 0
+
+
+async def enrich_news_batch(
+    db: AsyncSession,
+    *,
+    batch_size: int = 10,
+    claim: bool = False,
+    state: Optional[DrainState] = None,
+    outcome: Optional[BatchOutcome] = None,
+) -> int:
+    """
+    Enrich one batch. With a DrainState, rows that already succeeded or
+    used up their attempts are skipped, and only ids missing from the LLM
+    response are left eligible for another batch. `outcome` records this
+    call's own claim, which the shared DrainState counters can't tell apart.
+    """
+    news_batch = await fetch_unenriched_news(
+        db, limit=batch_size, claim=claim, exclude_ids=state.exhausted_ids() if state else None
+    )
+    if outcome is not None:
+        outcome.claimed = len(news_batch)
+    if state is not None:
+        state.claimed += len(news_batch)
+        for n in news_batch:
+            state.attempts[n.id] = state.attempts.get(n.id, 0) + 1  # type: ignore
     if not news_batch:
         return 0
 
-    prompt = build_llm_prompt(news_batch)
-    parsed = await call_llm_for_signals(prompt)
-    signals = parse_llm_signals(parsed)
+    # ♻ Syndicated / repeated headlines reuse an earlier Gemini result
+    cached, to_send = enrichment_cache.lookup(news_batch)
+    signals = [NewsSignal(news_id=news_id, **result) for news_id, result in cached.items()]
+
+    packs = pack_prompts(to_send)
+    if cached:
+        enrichment_cache.llm_calls_saved += len(pack_prompts(news_batch)) - len(packs)
+        logger.info(f"♻ Reused cached enrichment for {len(cached)} articles")
+
+    responses = await asyncio.gather(
+        *(call_llm_for_signals(prompt, estimated_tokens=est) for prompt, _, est in packs)
+    )
+    fresh = [sig for parsed in responses for sig in parse_llm_signals(parsed)]
+    signals += fresh
+    if packs:
+        logger.info(f"📦 Packed {len(to_send)} articles into {len(packs)} Gemini call(s)")
+
+    by_id = {n.id: n for n in to_send}
+    for sig in fresh:
+        if sig.news_id in by_id:
+            enrichment_cache.store(by_id[sig.news_id], {
+                "tickers": sig.tickers,
+                "impact_label": sig.impact_label,
+                "impact_confidence": sig.impact_confidence,
+                "impact_summary": sig.impact_summary,
+                "topics": sig.topics,
+            })
 
     updated_count = 0
+    changed_ids: List[int] = []
+    now = datetime.now(timezone.utc)
 
     for sig in signals:
         news = next((n for n in news_batch if n.id == sig.news_id), None)  # type: ignore
@@ -358,41 +371,126 @@ async def enrich_news_batch(db: AsyncSession, *, batch_size: int = 10) -> int:
                 logger.info(f"📌 Auto-added {new_added} for news ID {news.id}")
             merged |= set(fallback)
 
-        news.tickers = list(merged) # type: ignore
+        before = _enrichment_fields(news)
+
+        # Keep source tickers first so the primary one wins sector ties
+        ordered = [t for t in dict.fromkeys([*(news.tickers or []), *sig.tickers, *fallback]) if t in merged]  # type: ignore
+        news.tickers = ordered # type: ignore
+        news.llm_tickers = sig.tickers  # type: ignore  # enrichment_cache.warm reuses these
         news.impact_label = sig.impact_label # type: ignore
         news.impact_confidence = sig.impact_confidence  # type: ignore
         news.impact_summary = sig.impact_summary # type: ignore
         news.topics = sig.topics # type: ignore 
-        news.processed_at = datetime.now(timezone.utc)  # type: ignore
+        news.ticker_sentiments = ticker_sentiments_for(news, ordered, sig.impact_confidence)  # type: ignore
 
         if merged:
-            sector = await SectorService.map_tickers_to_sector(db, list(merged))
+            sector = await SectorService.map_tickers_to_sector(db, ordered)
             if sector:
                 news.sector_id = sector # type: ignore
 
+        # Only a real change moves processed_at past the aggregator watermark
+        if _enrichment_fields(news) != before:
+            news.processed_at = now  # type: ignore
+            changed_ids.append(news.id)  # type: ignore
+        news.enriched_at = now  # type: ignore
+
         db.add(news)
         updated_count += 1
 
+    if state is not None:
+        returned = {sig.news_id for sig in signals}
+        for n in news_batch:
+            if n.id in returned:
+                state.attempts[n.id] = MAX_LLM_ATTEMPTS  # type: ignore  # done for this drain
+            elif state.attempts[n.id] < MAX_LLM_ATTEMPTS:  # type: ignore
+                state.requeued += 1
+                logger.info(f"♻ Re-queued news ID {n.id} (missing from LLM response)")
+
     if updated_count:
         await db.commit()
+        await NewsService.propagate_from_canonical(db, changed_ids)
 
+    if outcome is not None:
+        outcome.enriched = updated_count
     logger.info(f"✨ Enriched {updated_count} news records")
     return updated_count
 
 # --------------------------------------------------------
-# Spotlight Signals API (Trending / High-Confidence Feed)
+# Backlog driver (concurrent workers, time / call budget)
 # --------------------------------------------------------
-async def get_spotlight_signals(
-    db: AsyncSession,
+async def drain_enrichment_backlog(
     *,
-    min_confidence: float = 0.6,
-    max_hours: int = 48,
-    limit: int = 20,
-):
+    batch_size: int = settings.ENRICH_BATCH_SIZE,
+    workers: int = settings.ENRICH_MAX_CONCURRENCY,
+    time_budget: float = settings.ENRICH_TIME_BUDGET_SECONDS,
+    max_calls: int = settings.ENRICH_MAX_CALLS,
+) -> Dict[str, Any]:
+    """
+    Keep enriching batches until the backlog is empty or the time / batch
+    budget runs out. Each worker claims rows on its own session; a row is
+    sent again only if the LLM response dropped it, up to MAX_LLM_ATTEMPTS.
+    """
+    started = time.monotonic()
+    state = DrainState()
+    calls = 0  # batches claimed; each may pack into one or more Gemini requests
+    gemini_calls_before = token_usage["calls"]
+    enriched = 0
+
+    async with AsyncSessionLocal() as db:
+        backlog_before = await count_unenriched_news(db)
+
+    async def worker() -> None:
+        nonlocal calls, enriched
+        while calls < max_calls and time.monotonic() - started < time_budget:
+            calls += 1  # reserve the call before awaiting
+            outcome = BatchOutcome()
+            try:
+                async with AsyncSessionLocal() as db:
+                    await enrich_news_batch(
+                        db, batch_size=batch_size, claim=True, state=state, outcome=outcome
+                    )
+            except Exception as e:
+                logger.error(f"Enrichment worker error: {e}")
+            # Added after the await; `enriched += await ...` would drop other workers' counts
+            enriched += outcome.enriched
+            if not outcome.claimed:
+                calls -= 1  # this worker claimed nothing → no Gemini call was made
+                return
+
+    if backlog_before:
+        await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+    async with AsyncSessionLocal() as db:
+        backlog_after = await count_unenriched_news(db)
+
+    elapsed = time.monotonic() - started
+    stats = {
+        "backlog_before": backlog_before,
+        "backlog_after": backlog_after,
+        "enriched": enriched,
+        "batches": calls,
+        "requeued": state.requeued,
+        "llm_calls": token_usage["calls"] - gemini_calls_before,
+        "elapsed_s": round(elapsed, 2),
+        "drain_rate_per_s": round(enriched / elapsed, 3) if elapsed else 0.0,
+    }
+    logger.info(f"🚰 Enrichment drain: {stats}")
+    return stats
+
+
+# --------------------------------------------------------
+# Spotlight Signals API (Trending / High-Confidence Feed)
+# --------------------------------------------------------
+def spotlight_query(*, min_confidence: float = 0.6, max_hours: int = 48, limit: int = 20):
     cutoff = datetime.now(timezone.utc) - timedelta(hours=max_hours)
 
-    q = (
-        select(News)
+    # Only the returned columns — skips content / raw payloads of each row
+    return (
+        select(
+            News.id, News.title, News.source, News.tickers, News.sentiment_score,
+            News.impact_label, News.impact_confidence, News.impact_summary,
+            News.topics, News.published_at, News.image_url,
+        )
         .where(News.impact_confidence >= min_confidence)
         .where(func.cardinality(News.tickers) > 0)
         .where(News.published_at >= cutoff)
@@ -400,7 +498,16 @@ async def get_spotlight_signals(
         .limit(limit)
     )
 
-    items = (await db.execute(q)).scalars().all()
+
+async def get_spotlight_signals(
+    db: AsyncSession,
+    *,
+    min_confidence: float = 0.6,
+    max_hours: int = 48,
+    limit: int = 20,
+):
+    q = spotlight_query(min_confidence=min_confidence, max_hours=max_hours, limit=limit)
+    rows = (await db.execute(q)).all()
 
     return [
         {
@@ -416,5 +523,5 @@ async def get_spotlight_signals(
             "published_at": n.published_at,
             "image_url": n.image_url,
         }
-        for n in items
+        for n in rows
     ]
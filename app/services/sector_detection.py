@@ -1,71 +1,163 @@
+import asyncio
 import logging
+import time
+from typing import Dict, List, Optional
+
 import httpx
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.models.sector import Sector
 from app.core.config import settings
+from app.core.db import AsyncSessionLocal
 
 HF_API_URL = "https://router.huggingface.co/hf-inference/models/joeddav/xlm-roberta-large-xnli"
 HF_HEADERS = {"Authorization": f"Bearer {settings.HF_API_TOKEN}"}
 
 SECTOR_CONF_THRESHOLD = 0.55  # Adjustable threshold
+MIN_TEXT_LENGTH = 15
 
-async def detect_sector(db: AsyncSession, text: str) -> int | None:
+
+class SectorDetector:
     """
-    Detect sector using HuggingFace Zero-Shot Classifier.
-    Returns sector_id or None.
+    Zero-shot sector classifier with:
+      • cached sector name → id labels (invalidated when sectors change)
+      • one pooled HTTP client
+      • batched, concurrency-limited requests for many texts
     """
 
-    if not text or len(text.strip()) < 15:
-        return None
+    def __init__(
+        self,
+        batch_size: int = settings.SECTOR_BATCH_SIZE,
+        max_concurrency: int = settings.SECTOR_MAX_CONCURRENCY,
+        labels_ttl: float = settings.SECTOR_LABELS_TTL_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.labels_ttl = labels_ttl
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._labels: Optional[Dict[str, int]] = None
+        self._labels_loaded_at = 0.0
+        self._client: Optional[httpx.AsyncClient] = None
+
+    # -------------------------------------------------------------
+    # LABEL SET
+    # -------------------------------------------------------------
+    def invalidate(self) -> None:
+        self._labels = None
+
+    async def labels(self) -> Dict[str, int]:
+        """
+        Read on a private session, so the caller's transaction is left
+        alone and nothing sits idle in a transaction during the HTTP calls.
+        """
+        expired = time.monotonic() - self._labels_loaded_at > self.labels_ttl
+        if self._labels is None or expired:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(select(Sector.name, Sector.id))).all()
+            self._labels = {name: sector_id for name, sector_id in rows}
+            self._labels_loaded_at = time.monotonic()
+        return self._labels
 
-    # 🔹 Fetch sector names from database
-    sector_query = await db.execute(select(Sector.name))
-    sector_labels = [row[0] for row in sector_query.all()]
-    if not sector_labels:
-        logging.warning("⚠ No sectors found in database")
-        return None
+    # -------------------------------------------------------------
+    # HTTP
+    # -------------------------------------------------------------
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=HF_HEADERS,
+                timeout=30,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._client
 
-    try:
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _classify(self, texts: List[str], candidate_labels: List[str]) -> List[Optional[dict]]:
         payload = {
-        "inputs": text[:500],
-        "parameters": {"candidate_labels": sector_labels, "multi_class": False}
-}
-
-        # 🔄 Async request — replaces blocking requests.post
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(HF_API_URL, headers=HF_HEADERS, json=payload)
-
-        response.raise_for_status()
-        res = response.json()
-
-        # 🛠 HuggingFace real response format
-        # {
-        #   "sequence": "...",
-        #   "labels": [...],
-        #   "scores": [...]
-        # }
-        
-        if not isinstance(res, dict) or "labels" not in res:
+            "inputs": [t[:500] for t in texts],
+            "parameters": {"candidate_labels": candidate_labels, "multi_label": False},
+        }
+        async with self._semaphore:
+            try:
+                response = await self.client.post(HF_API_URL, json=payload)
+                response.raise_for_status()
+                res = response.json()
+            except Exception as e:
+                logging.error(f"❌ Sector detection error: {e}")
+                return [None] * len(texts)
+
+        # 🛠 HuggingFace response: {"sequence", "labels", "scores"} per input
+        if isinstance(res, dict):
+            res = [res]
+        if not isinstance(res, list) or len(res) != len(texts):
             logging.error(f"Unexpected response format: {res}")
-            return None
+            return [None] * len(texts)
+
+        return [r if isinstance(r, dict) and "labels" in r else None for r in res]
+
+    # -------------------------------------------------------------
+    # DETECTION
+    # -------------------------------------------------------------
+    async def detect_many(self, texts: List[str]) -> List[Optional[int]]:
+        """
+        Sector id (or None) for each text, in input order.
+        """
+        results: List[Optional[int]] = [None] * len(texts)
+
+        todo = [i for i, t in enumerate(texts) if t and len(t.strip()) >= MIN_TEXT_LENGTH]
+        if not todo:
+            return results
+
+        label_ids = await self.labels()
+        if not label_ids:
+            logging.warning("⚠ No sectors found in database")
+            return results
+        candidate_labels = list(label_ids)
 
-        # 🏆 Pick best label
-        best_label = res["labels"][0]
-        best_score = float(res["scores"][0])
+        batches = [todo[i:i + self.batch_size] for i in range(0, len(todo), self.batch_size)]
+        outputs = await asyncio.gather(
+            *(self._classify([texts[i] for i in batch], candidate_labels) for batch in batches)
+        )
 
-        logging.info(f"🔍 Sector detected: {best_label} ({best_score:.2f})")
+        for batch, batch_out in zip(batches, outputs):
+            for i, res in zip(batch, batch_out):
+                if not res:
+                    continue
 
-        if best_score < SECTOR_CONF_THRESHOLD:
-            logging.info("⚠ Sector confidence too low — skipping")
-            return None
+                # 🏆 Pick best label
+                best_label = res["labels"][0]
+                best_score = float(res["scores"][0])
+                logging.info(f"🔍 Sector detected: {best_label} ({best_score:.2f})")
 
-        # 🔗 Get sector_id
-        q = select(Sector).where(Sector.name == best_label)
-        result = await db.execute(q)
-        sector_obj = result.scalars().first()
-        return sector_obj.id if sector_obj else None #type: ignore
+                if best_score < SECTOR_CONF_THRESHOLD:
+                    continue
+                results[i] = label_ids.get(best_label)
 
-    except Exception as e:
-        logging.error(f"❌ Sector detection error: {e}")
-        return None
+        return results
+
+    async def detect(self, text: str) -> Optional[int]:
+        return (await self.detect_many([text]))[0]
+
+
+sector_detector = SectorDetector()
+
+
+# 🔄 Drop the cached label set whenever a sector is written in this process
+@event.listens_for(Sector, "after_insert")
+@event.listens_for(Sector, "after_update")
+@event.listens_for(Sector, "after_delete")
+def _invalidate_sector_labels(mapper, connection, target) -> None:
+    sector_detector.invalidate()
+
+
+async def detect_sector(db: AsyncSession, text: str) -> int | None:
+    """
+    Detect sector using HuggingFace Zero-Shot Classifier.
+    Returns sector_id or None. `db` is not used; the sector labels are
+    read on the detector's own session.
+    """
+    return await sector_detector.detect(text)
@@ -1,8 +1,75 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.models.sector import Sector
-from typing import List, Optional, Iterable
+from app.models.stock import Stock
+from app.core.config import settings
+from collections import Counter
+from typing import Dict, List, Optional, Iterable
 import logging
+import time
+
+
+class TickerSectorIndex:
+    """
+    In-memory ticker → sector_id map built from the stocks table.
+    Both "TCS.NS" and bare "TCS" resolve. Reloaded when a Stock row is
+    written in this process, or after STOCK_INDEX_TTL_SECONDS.
+    """
+
+    def __init__(self, ttl: float = settings.STOCK_INDEX_TTL_SECONDS):
+        self.ttl = ttl
+        self._index: Optional[Dict[str, int]] = None
+        self._loaded_at = 0.0
+
+    def invalidate(self) -> None:
+        self._index = None
+
+    async def ensure(self, db: AsyncSession) -> Dict[str, int]:
+        if self._index is None or time.monotonic() - self._loaded_at > self.ttl:
+            rows = (
+                await db.execute(
+                    select(Stock.ticker, Stock.sector_id).where(Stock.sector_id.isnot(None))
+                )
+            ).all()
+
+            index: Dict[str, int] = {}
+            for ticker, sector_id in rows:
+                symbol = ticker.upper().strip()
+                index[symbol] = sector_id
+            for ticker, sector_id in rows:
+                index.setdefault(ticker.upper().strip().split(".")[0], sector_id)
+
+            self._index = index
+            self._loaded_at = time.monotonic()
+            logging.info(f"🗂 Ticker→sector index loaded ({len(rows)} stocks)")
+        return self._index
+
+    def resolve(self, tickers: Iterable[str]) -> Optional[int]:
+        """Majority sector across tickers; ties go to the earliest (primary) ticker."""
+        if not self._index:
+            return None
+
+        votes: Counter = Counter()
+        for t in tickers:
+            if not t:
+                continue
+            symbol = t.upper().strip()
+            sector_id = self._index.get(symbol) or self._index.get(symbol.split(".")[0])
+            if sector_id:
+                votes[sector_id] += 1
+
+        return votes.most_common(1)[0][0] if votes else None
+
+
+ticker_sector_index = TickerSectorIndex()
+
+
+@event.listens_for(Stock, "after_insert")
+@event.listens_for(Stock, "after_update")
+@event.listens_for(Stock, "after_delete")
+def _invalidate_ticker_sector_index(mapper, connection, target) -> None:
+    ticker_sector_index.invalidate()
 
 
 class SectorService:
@@ -22,26 +89,20 @@ class SectorService:
         await db.refresh(sector)
         return sector
 
-    # 🔹 NEW — Assign sector based on tickers array
+    # 🔹 Assign sector based on tickers array
     @staticmethod
     async def map_tickers_to_sector(db: AsyncSession, tickers: Iterable[str]) -> Optional[int]:
         """
-        Return sector_id for tickers like ["AAPL", "TCS.NS"]
-        Requires Sector.tickers column to exist (VARCHAR[])
+        Return sector_id for tickers like ["AAPL", "TCS.NS"] from the
+        in-memory stocks index (no DB round-trip once loaded).
         """
 
         if not tickers:
             return None
 
         try:
-            tickers = [t.upper().strip() for t in tickers if t]
-            q = (
-                select(Sector)
-                .where(Sector.tickers.contains(tickers))  # PostgreSQL ARRAY overlap
-            )
-            result = await db.execute(q)
-            sector = result.scalars().first()
-            return sector.id if sector else None #type: ignore
+            await ticker_sector_index.ensure(db)
+            return ticker_sector_index.resolve(tickers)
 
         except Exception as e:
             logging.error(f"Sector mapping failed: {e}")
@@ -1,4 +1,4 @@
-from app.sentiment.llm_client import HFClient
+from app.sentiment.backend import get_sentiment_backend
 from typing import Optional
 
 
@@ -23,7 +23,7 @@ class SentimentService:
             return None  # Avoid sending junk to API
 
         try:
-            raw = await HFClient.analyze_text(text)
+            raw = await get_sentiment_backend().analyze_text(text)
             score = float(raw.get("sentiment", 0))
             confidence = float(raw.get("confidence", 0))
 
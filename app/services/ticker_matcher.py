@@ -0,0 +1,222 @@
+# app/services/ticker_matcher.py
+
+from __future__ import annotations
+import json
+import logging
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALIAS_FILE = Path(__file__).resolve().parent.parent / "data" / "ticker_aliases.json"
+
+
+# Words, or single punctuation marks so "M&M" / "J&K" stay matchable
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Aliases that are also everyday words ("yes", "hero", "idea"). They only
+# count next to exchange / listing context: "SAIL shares", "NSE: YES",
+# "HERO.NS", "Chalet Ltd".
+AMBIGUOUS_ALIASES = frozenset({
+    "YES", "VI", "IDEA", "BOB", "HERO", "TAJ", "SAIL", "CUB", "INDIGO",
+    "CHALET", "YATRA", "ENDURANCE", "PERSISTENT",
+})
+CONTEXT_TOKENS = frozenset({
+    "NSE", "BSE", "NS", "BO", "SHARE", "SHARES", "STOCK", "STOCKS", "SCRIP",
+    "LTD", "LIMITED",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.upper())
+
+
+class TickerMatcher:
+    """
+    Aho-Corasick automaton over company aliases ("HDFC BANK" → "HDFCBANK.NS").
+
+    The automaton walks word tokens instead of characters, so every match
+    sits on word boundaries ("AXIS" never fires inside "AXISCADES") and an
+    article is resolved in one linear pass over its tokens. Overlapping
+    matches resolve leftmost-longest ("HDFC LIFE" beats "HDFC").
+    Aliases in AMBIGUOUS_ALIASES additionally need a CONTEXT_TOKENS word
+    right before or after them.
+    """
+
+    def __init__(self, aliases: Mapping[str, str]):
+        # Node state lives in flat lists indexed by node id
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (alias length in tokens, symbol, needs listing context)
+        self._out: List[Optional[Tuple[int, str, bool]]] = [None]
+        self._dict_link: List[int] = [0]  # nearest suffix node that ends an alias
+
+        for alias, symbol in aliases.items():
+            tokens = tokenize(alias or "")
+            if tokens and symbol:
+                self._add(tokens, symbol.strip().upper(), " ".join(tokens) in AMBIGUOUS_ALIASES)
+
+        self._build_links()
+        self.size = sum(1 for o in self._out if o)
+
+    # -------------------------------------------------------------
+    # CONSTRUCTION
+    # -------------------------------------------------------------
+    def _add(self, tokens: List[str], symbol: str, needs_context: bool = False) -> None:
+        node = 0
+        for tok in tokens:
+            nxt = self._goto[node].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+                self._dict_link.append(0)
+            node = nxt
+        if self._out[node] is None:
+            self._out[node] = (len(tokens), symbol, needs_context)
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for tok, child in self._goto[node].items():
+                queue.append(child)
+
+                f = self._fail[node]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(tok, 0)
+
+                target = self._fail[child]
+                self._dict_link[child] = target if self._out[target] else self._dict_link[target]
+
+    # -------------------------------------------------------------
+    # MATCHING
+    # -------------------------------------------------------------
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Return non-overlapping (start, end, symbol) token spans, leftmost-longest.
+        """
+        if not text:
+            return []
+
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+
+        tokens = tokenize(text)
+
+        # Longest match starting at each token position
+        best: Dict[int, Tuple[int, str]] = {}
+        node = 0
+        for i, tok in enumerate(tokens):
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            if not node:
+                continue
+
+            hit = node if out[node] else dict_link[node]
+            while hit:
+                length, symbol, needs_context = out[hit]  # type: ignore[misc]
+                start = i - length + 1
+                prev = best.get(start)
+                if (prev is None or length > prev[0]) and (
+                    not needs_context or _has_context(tokens, start, i + 1)
+                ):
+                    best[start] = (length, symbol)
+                hit = dict_link[hit]
+
+        spans: List[Tuple[int, int, str]] = []
+        cursor = 0
+        for start in sorted(best):
+            if start < cursor:
+                continue
+            length, symbol = best[start]
+            spans.append((start, start + length, symbol))
+            cursor = start + length
+        return spans
+
+    def detect(self, text: str) -> List[str]:
+        """Unique ticker symbols mentioned in text, in order of first mention."""
+        return list(dict.fromkeys(symbol for _, _, symbol in self.find(text)))
+
+
+def _neighbour_word(tokens: List[str], i: int, step: int) -> Optional[str]:
+    """Nearest word token from i in direction step, skipping punctuation ("NSE: X", "X.NS")."""
+    while 0 <= i < len(tokens):
+        if tokens[i][0].isalnum():
+            return tokens[i]
+        i += step
+    return None
+
+
+def _has_context(tokens: List[str], start: int, end: int) -> bool:
+    return (
+        _neighbour_word(tokens, start - 1, -1) in CONTEXT_TOKENS
+        or _neighbour_word(tokens, end, 1) in CONTEXT_TOKENS
+    )
+
+
+# ----------------------------------------------
+# Alias sources
+# ----------------------------------------------
+def load_aliases_from_file(path: Path | str = DEFAULT_ALIAS_FILE) -> Dict[str, str]:
+    with open(path, encoding="utf-8") as fh:
+        return {str(k): str(v) for k, v in json.load(fh).items()}
+
+
+async def load_aliases_from_db(db) -> Dict[str, str]:
+    """
+    Aliases from the stocks table: ticker, bare symbol and company name.
+    """
+    from sqlalchemy.future import select
+    from app.models.stock import Stock
+
+    rows = (
+        await db.execute(
+            select(Stock.ticker, Stock.company_name).where(Stock.is_active == 1)
+        )
+    ).all()
+
+    aliases: Dict[str, str] = {}
+    for ticker, company_name in rows:
+        if not ticker:
+            continue
+        symbol = ticker.upper()
+        aliases[symbol] = symbol
+        aliases.setdefault(symbol.split(".")[0], symbol)
+        if company_name:
+            aliases.setdefault(company_name.upper(), symbol)
+    return aliases
+
+
+# ----------------------------------------------
+# Shared matcher (built once, swapped on reload)
+# ----------------------------------------------
+_matcher: Optional[TickerMatcher] = None
+
+
+def get_matcher() -> TickerMatcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = TickerMatcher(load_aliases_from_file())
+    return _matcher
+
+
+def reload_matcher(extra_aliases: Optional[Mapping[str, str]] = None) -> TickerMatcher:
+    """Rebuild from the alias file, overlaid with extra aliases (e.g. from the DB)."""
+    global _matcher
+    aliases = load_aliases_from_file()
+    if extra_aliases:
+        aliases.update(extra_aliases)
+    _matcher = TickerMatcher(aliases)
+    logger.info(f"🔤 Ticker matcher rebuilt with {_matcher.size} aliases")
+    return _matcher
+
+
+async def reload_matcher_from_db(db) -> TickerMatcher:
+    return reload_matcher(await load_aliases_from_db(db))
+
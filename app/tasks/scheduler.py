@@ -2,22 +2,29 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime, timezone
 
 from app.ingestion.news_ingestor import NewsIngestor
+from app.ingestion.seen_urls import seen_urls
+from app.ingestion.near_duplicates import near_duplicates
 from app.analytics.aggregator import compute_and_store_sentiment_aggregates
-from app.sentiment.llm_client import HFClient
+from app.sentiment.backend import get_sentiment_backend
+from app.core.config import settings
 from app.core.db import AsyncSessionLocal
+from app.core.response_cache import response_cache
 from app.services.news_service import NewsService
-from app.services.news_signal_service import enrich_news_batch
-from app.services.sector_detection import detect_sector
+from app.services.news_signal_service import drain_enrichment_backlog
+from app.services.sector_detection import sector_detector
 
 
 scheduler = AsyncIOScheduler()
 
+# Long-lived so its connection pool is reused across runs
+ingestor = NewsIngestor()
+
 
 def start_scheduler():
     scheduler.add_job(
         run_ingest_and_analyze,
         "interval",
-        minutes=30,  
+        minutes=settings.INGEST_INTERVAL_MINUTES,
         id="ingest_job",
         next_run_time=datetime.now(timezone.utc),
         misfire_grace_time=120,
@@ -26,7 +33,7 @@ def start_scheduler():
     scheduler.add_job(
         run_aggregator,
         "interval",
-        minutes=60, 
+        minutes=settings.AGG_BUCKET_MINUTES,
         id="agg_job",
         next_run_time=datetime.now(timezone.utc),
         misfire_grace_time=120,
@@ -36,79 +43,93 @@ def start_scheduler():
 
 
 async def run_ingest_and_analyze():
-    ingestor = NewsIngestor()
-
-    mediastack = await ingestor.fetch_from_mediastack(limit=15)
-    alpha = await ingestor.fetch_from_alpha_vantage()
-    yahoo = await ingestor.fetch_from_yahoo()
-
-    articles = (
-        [ingestor.normalize_mediastack(a) for a in mediastack]
-        + [ingestor.normalize_alpha(a) for a in alpha]
-        + [ingestor.normalize_yahoo(a) for a in yahoo]
-    )
+    articles = await ingestor.fetch_all(mediastack_limit=15)
 
     print(f"📰 Total normalized articles: {len(articles)}")
 
     async with AsyncSessionLocal() as db:
-        inserted_news = []
-
-        # Step 1️⃣ Insert news + Sentiment
-        for article in articles:
-            if not article.get("title") or not article.get("url"):
-                continue
-
-            try:
-                news = await NewsService.create(db, article)
-                if not news:
-                    continue  # duplicate skipped
-
-                text = f"{news.title}\n\n{news.content or ''}"
-                res = await HFClient.analyze_text(text)
-
-                await NewsService.update_sentiment(
-                    db,
-                    news_id=news.id,  # type: ignore
-                    score=res.get("sentiment", 0.0),
-                    label=res.get("label", "neutral"),
-                )
-
-                inserted_news.append(news.id)  # type: ignore
-
-            except Exception as e:
-                print("⛔ ingestion error:", e)
-                await db.rollback()
-
-        # Step 2️⃣ Enrichment: tickers + impact + topics
-        enriched_count = await enrich_news_batch(db, batch_size=10)
-        print(f"💡 Enrichment: {enriched_count} updated")
-
-        # Step 3️⃣ Sector detection AFTER tickers are finalized
-        for nid in inserted_news:
-            try:
-                news = await NewsService.get_by_id(db, nid) #type: ignore
-                if not news:
-                    continue
-
-                text = f"{news.title} {news.content or ''}"
-                sector_id = await detect_sector(db, text)
-
-                if sector_id:
-                    await NewsService.update_enrichment(
-                        db=db,
-                        news_id=nid,
-                        sector_id=sector_id,
-                    )
-
-            except Exception as e:
-                print(f"⚠ Sector mapping failed for {nid}: {e}")
+        # Step 1️⃣ Insert news — one multi-row INSERT, duplicates skipped by url
+        valid = [a for a in articles if a.get("title") and a.get("url")]
+        try:
+            inserted_news = await NewsService.create_many(db, valid)
+            seen_urls.add_many(a["url"] for a in valid)  # inserted or already stored
+        except Exception as e:
+            print("⛔ ingestion error:", e)
+            await db.rollback()
+            inserted_news = []
+
+        print(f"🆕 Inserted {len(inserted_news)} new of {len(valid)} articles")
+
+        # Step 1️⃣a Near-duplicates (same story, other source) skip the model stack
+        inserted_news, duplicate_links = near_duplicates.partition(inserted_news)
+        if duplicate_links:
+            print(f"🪞 {len(duplicate_links)} near-duplicates linked to canonical articles")
+
+        # Step 1️⃣b Sentiment — all new articles in a few batched calls
+        texts = [f"{n.title}\n\n{n.content or ''}" for n in inserted_news]
+        scores = await get_sentiment_backend().analyze_batch(texts)
+
+        try:
+            await NewsService.update_sentiment_many(
+                db,
+                [
+                    {
+                        "id": news.id,
+                        "score": res.get("sentiment", 0.0),
+                        "label": res.get("label", "neutral"),
+                    }
+                    for news, res in zip(inserted_news, scores)
+                ],
+            )
+        except Exception as e:
+            print("⛔ sentiment update error:", e)
+            await db.rollback()
+
+        # Step 2️⃣ Enrichment: tickers + impact + topics (drains the backlog)
+        drain = await drain_enrichment_backlog()
+        print(
+            f"💡 Enrichment: {drain['enriched']} updated in {drain['llm_calls']} calls, "
+            f"backlog {drain['backlog_before']} → {drain['backlog_after']} "
+            f"({drain['drain_rate_per_s']}/s)"
+        )
+
+        # Step 3️⃣ Sector detection — batched zero-shot calls for all new articles
+        try:
+            texts = [f"{n.title} {n.content or ''}" for n in inserted_news]
+            detected = await sector_detector.detect_many(texts)
+            await NewsService.update_sectors_many(
+                db,
+                {n.id: sid for n, sid in zip(inserted_news, detected) if sid},
+            )
+        except Exception as e:
+            print(f"⚠ Sector mapping failed: {e}")
+            await db.rollback()
+
+        # Step 4️⃣ Near-duplicates inherit sentiment, tickers and sector
+        try:
+            await NewsService.link_duplicates(db, duplicate_links)
+        except Exception as e:
+            print("⛔ duplicate linking error:", e)
+            await db.rollback()
+
+    # ♻ Cached read endpoints over news are stale now
+    response_cache.bump("news")
+
+    # 🧹 Keep the persistent sentiment cache within TTL / size limits
+    try:
+        pruned = await get_sentiment_backend().prune()  # type: ignore[attr-defined]
+        if pruned:
+            print(f"🧹 Pruned {pruned} sentiment cache rows")
+    except Exception as e:
+        print("⚠ sentiment cache prune error:", e)
 
 
 async def run_aggregator():
     try:
         async with AsyncSessionLocal() as db:
-            await compute_and_store_sentiment_aggregates(db)
+            stats = await compute_and_store_sentiment_aggregates(db)
             await db.commit()
-            print("📊 Aggregates updated")
+            print(f"📊 Aggregates updated ({stats['rows']} rows in {stats['buckets']} buckets)")
+        response_cache.bump("aggregates")
     except Exception as e:
         print("⛔ aggregator error:", e)
@@ -0,0 +1,96 @@
+"""
+Throughput and peak memory of the streaming export encoders.
+
+    python -m benchmarks.bench_export --rows 2000000
+    python -m benchmarks.bench_export --db news --format parquet
+
+Without --db, synthetic news rows are generated batch by batch and pushed
+through every encoder; with --db, a real export is streamed from Postgres
+through the server-side cursor. Output is discarded and only counted. Peak
+RSS should stay flat as --rows grows.
+"""
+
+import argparse
+import asyncio
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.services.export_service import (
+    EXPORT_BATCH_SIZE, FORMATS, NEWS_COLUMNS, ExportFilters, export,
+)
+
+TICKERS = ["RELIANCE.NS", "TCS.NS", "INFY.NS", "HDFCBANK.NS", "ITC.NS", "SBIN.NS"]
+LABELS = ["bullish", "bearish", "neutral"]
+
+
+async def synthetic_news(rows: int, batch_size: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for offset in range(0, rows, batch_size):
+        batch = []
+        for i in range(offset, min(offset + batch_size, rows)):
+            published = start + timedelta(seconds=37 * i)
+            batch.append((
+                i, "synthetic", f"https://example.com/{i}", f"Headline number {i} moves markets",
+                published, published + timedelta(minutes=3), rng.randint(1, 12),
+                rng.sample(TICKERS, rng.randint(1, 3)), rng.uniform(-1, 1), rng.choice(LABELS),
+                rng.choice(LABELS), rng.random(), ["earnings"], None,
+            ))
+        yield batch
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def drain(label: str, rows: int, chunks):
+    started = time.perf_counter()
+    written = 0
+    async for chunk in chunks:
+        written += len(chunk)
+    elapsed = time.perf_counter() - started
+    rate = f"{rows / elapsed:>12,.0f} rows/s" if rows else f"{'':>19}"
+    print(
+        f"{label:<10} {rate}  {written / elapsed / 1e6:>8.1f} MB/s  "
+        f"{elapsed:>7.2f}s  {written / 1e6:>9.1f} MB  peak RSS {peak_rss_mb():,.0f} MB"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    parser.add_argument("--format", choices=list(FORMATS), help="only this encoder")
+    parser.add_argument("--db", choices=["news", "aggregates"], help="export this dataset from DATABASE_URL")
+    args = parser.parse_args()
+
+    formats = [args.format] if args.format else list(FORMATS)
+
+    if args.db:
+        for fmt in formats:
+            _, body = export(args.db, fmt, ExportFilters(), batch_size=args.batch_size)
+            await drain(fmt, 0, body)
+        return
+
+    async def source_only(columns, batches):  # generation cost, to subtract from the encoders
+        async for _ in batches:
+            yield b""
+
+    columns = NEWS_COLUMNS
+    await drain("source", args.rows, source_only(columns, synthetic_news(args.rows, args.batch_size)))
+    for fmt in formats:
+        try:
+            if FORMATS[fmt].check:
+                FORMATS[fmt].check()
+        except ValueError as e:
+            print(f"{fmt:<10} skipped: {e}")
+            continue
+        await drain(fmt, args.rows, FORMATS[fmt].encode(columns, synthetic_news(args.rows, args.batch_size)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
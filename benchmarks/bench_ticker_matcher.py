@@ -0,0 +1,66 @@
+"""
+Throughput of ticker detection on a synthetic headline corpus.
+
+    python -m benchmarks.bench_ticker_matcher --headlines 200000
+
+Compares the Aho-Corasick matcher against the old per-alias substring scan.
+"""
+
+import argparse
+import random
+import time
+
+from app.services.ticker_matcher import TickerMatcher, load_aliases_from_file
+
+FILLER = (
+    "shares rally after quarterly results beat estimates as investors cheer "
+    "strong margins while analysts flag rising input costs and weak demand "
+    "in rural markets ahead of the festive season amid global uncertainty"
+).split()
+
+
+def build_corpus(aliases, n: int, seed: int = 7):
+    rng = random.Random(seed)
+    names = list(aliases)
+    corpus = []
+    for _ in range(n):
+        words = rng.sample(FILLER, 14)
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words)), rng.choice(names).title())
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def naive_detect(aliases, text: str):
+    text_upper = text.upper()
+    return list({sym for name, sym in aliases.items() if name in text_upper})
+
+
+def run(label: str, fn, corpus):
+    started = time.perf_counter()
+    mentions = sum(len(fn(t)) for t in corpus)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<16} {len(corpus) / elapsed:>12,.0f} headlines/s  "
+        f"{elapsed:>7.2f}s  {mentions:,} mentions"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headlines", type=int, default=100_000)
+    args = parser.parse_args()
+
+    aliases = load_aliases_from_file()
+
+    started = time.perf_counter()
+    matcher = TickerMatcher(aliases)
+    print(f"built automaton: {matcher.size} aliases in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    corpus = build_corpus(aliases, args.headlines)
+    run("aho-corasick", matcher.detect, corpus)
+    run("naive substring", lambda t: naive_detect(aliases, t), corpus)
+
+
+if __name__ == "__main__":
+    main()
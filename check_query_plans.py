@@ -0,0 +1,124 @@
+"""
+EXPLAIN every hot read query and fail if one falls back to a sequential
+scan on a large table.
+
+    python check_query_plans.py [--save plans.json]
+
+Sequential scans are disabled for the session (enable_seqscan = off), so
+on any table size the planner only picks one when no index can serve
+the query — i.e. an index is missing or the predicate stopped matching.
+Statements come from the query builders the app itself executes, so a
+change to an endpoint's query is checked as it ships.
+The all-time sector summary aggregation is not listed.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.future import select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.analytics.aggregator import (
+    _affected_buckets_query, _latest_query, _sector_buckets_query, _ticker_buckets_query,
+)
+from app.analytics.rollups import BASE_TIER, TIERS, floor_to, history_query
+from app.api.routes import ticker_history_query
+from app.core.config import settings
+from app.core.db import engine
+from app.models.news import News
+from app.services.dashboard_service import _tickers_averages_query, _tickers_news_query, _trending_query
+from app.services.export_service import ExportFilters, aggregates_query, news_query
+from app.services.news_service import NewsService
+from app.services.news_signal_service import spotlight_query, unenriched_news_query
+
+WATCHED_TABLES = {
+    "news", "news_tickers", "sentiment_aggregates", "sentiment_rollups", "ticker_sentiment_aggregates",
+}
+SAMPLE_TICKER = "RELIANCE.NS"
+SAMPLE_SECTOR_ID = 1
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def endpoint_queries() -> dict:
+    """The statements the routes, services and aggregator actually execute."""
+    now = datetime.now(timezone.utc)
+    page_after = (now - timedelta(days=30), 1_000_000)
+    buckets = [floor_to(now, BASE_TIER.width) - BASE_TIER.width * i for i in range(4)]
+    return {
+        "news_recent": NewsService._dated_page_query(select(News), 50, page_after),
+        "news_by_sector": NewsService._dated_page_query(NewsService._sector_query(SAMPLE_SECTOR_ID), 50, page_after),
+        "news_undated": NewsService._undated_page_query(select(News), 50, (None, 1_000_000)),
+        "ticker_news": _tickers_news_query([SAMPLE_TICKER]),
+        "ticker_averages": _tickers_averages_query([SAMPLE_TICKER]),
+        "ticker_history": ticker_history_query(SAMPLE_TICKER, 50, now - timedelta(days=30)),
+        "trending": _trending_query(),
+        "spotlight": spotlight_query(),
+        "unenriched_backlog": unenriched_news_query(limit=settings.ENRICH_BATCH_SIZE, claim=True),
+        "aggregator_changes": _affected_buckets_query(now - timedelta(minutes=settings.AGG_BUCKET_MINUTES), now),
+        "aggregator_bucket": _sector_buckets_query(buckets, now),
+        "ticker_buckets": _ticker_buckets_query(buckets, now),
+        "sector_latest_refresh": _latest_query([SAMPLE_SECTOR_ID]),
+        "sector_history": history_query(SAMPLE_SECTOR_ID, BASE_TIER, now - timedelta(days=3), now, 500),
+        "sector_history_rollup": history_query(SAMPLE_SECTOR_ID, TIERS["1d"], now - timedelta(days=365), now, 500),
+        "export_news": news_query(ExportFilters(since=now - timedelta(days=7), tickers=[SAMPLE_TICKER])),
+        "export_aggregates": aggregates_query(ExportFilters(since=now - timedelta(days=7))),
+    }
+
+
+def seq_scans(plan: dict) -> list:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in WATCHED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def main(save: str | None) -> int:
+    plans, failures = {}, []
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        for name, stmt in endpoint_queries().items():
+            raw = (await conn.execute(Explain(stmt))).scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            plans[name] = plan
+
+            scanned = seq_scans(plan)
+            status = f"❌ Seq Scan on {', '.join(scanned)}" if scanned else "✔ index"
+            print(f"{name:<20} {plan['Node Type']:<24} {status}")
+            if scanned:
+                failures.append(name)
+
+    if save:
+        with open(save, "w", encoding="utf-8") as f:
+            json.dump(plans, f, indent=2, default=str)
+        print(f"💾 Plans written to {save}")
+
+    if failures:
+        print(f"\n⚠ {len(failures)} queries regressed to sequential scans: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", help="write the JSON plans to this file")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.save)))
@@ -1,9 +1,10 @@
 import asyncio
 
 # ⭐ THIS IS THE FIX — IMPORT ALL MODELS
-from app.models import news, sector, sentiment_aggregate, stock
+from app.models import news, sector, sentiment_aggregate, stock, sentiment_cache, news_ticker, aggregator_state, sentiment_rollup, ticker_sentiment_aggregate, sector_sentiment_latest
 
 from app.core.db import engine, Base
+from app.core.migrations import apply_migrations
 
 
 async def create():
@@ -11,6 +12,7 @@ async def create():
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await apply_migrations(conn)
 
     print("Tables created successfully!")
 
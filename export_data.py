@@ -0,0 +1,61 @@
+"""
+Stream a slice of news or sector aggregates to a file, with constant memory.
+
+    python export_data.py news --format parquet --from 2025-01-01 --ticker TCS.NS -o tcs.parquet
+    python export_data.py aggregates --format csv --sector-id 3 > sector3.csv
+
+Rows are read through a server-side cursor in --batch-size batches and
+written as they arrive. Parquet needs pyarrow installed.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+
+from app.services.export_service import DATASETS, EXPORT_BATCH_SIZE, FORMATS, ExportFilters, export
+
+
+def utc(value: str) -> datetime:
+    ts = datetime.fromisoformat(value)
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+async def main(args) -> int:
+    filters = ExportFilters(
+        since=args.since,
+        until=args.until,
+        tickers=[t.upper() for t in args.ticker],
+        sector_id=args.sector_id,
+    )
+    try:
+        _, body = export(args.dataset, args.format, filters, batch_size=args.batch_size)
+    except ValueError as e:
+        print(f"⛔ {e}", file=sys.stderr)
+        return 2
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        async for chunk in body:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"💾 {written:,} bytes of {args.dataset} written to {args.output or 'stdout'}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", choices=list(DATASETS))
+    parser.add_argument("--format", choices=list(FORMATS), default="ndjson")
+    parser.add_argument("--from", dest="since", type=utc, help="inclusive start (ISO 8601, UTC if naive)")
+    parser.add_argument("--to", dest="until", type=utc, help="exclusive end (ISO 8601, UTC if naive)")
+    parser.add_argument("--ticker", action="append", default=[], help="repeatable; news only")
+    parser.add_argument("--sector-id", type=int)
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,2 @@
+-- Near-duplicate articles point at the canonical row they inherit results from
+ALTER TABLE news ADD COLUMN IF NOT EXISTS duplicate_of INTEGER;
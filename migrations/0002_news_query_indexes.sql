@@ -0,0 +1,24 @@
+-- Indexes for the hot read paths (routes, spotlight, enrichment backlog, aggregator).
+-- Names match News.__table_args__ / SentimentAggregate.__table_args__.
+
+-- Ticker containment (tickers @> ARRAY[...])
+CREATE INDEX IF NOT EXISTS ix_news_tickers_gin ON news USING gin (tickers);
+
+-- Recent news, spotlight window, aggregator window
+CREATE INDEX IF NOT EXISTS ix_news_published_at ON news (published_at DESC);
+CREATE INDEX IF NOT EXISTS ix_news_processed_at ON news (processed_at DESC);
+
+-- /news/by-sector/{sector_id}
+CREATE INDEX IF NOT EXISTS ix_news_sector_published_at ON news (sector_id, published_at DESC);
+
+-- Spotlight confidence threshold
+CREATE INDEX IF NOT EXISTS ix_news_impact_confidence ON news (impact_confidence);
+
+-- Processed but not yet enriched by Gemini (fetch_unenriched_news)
+CREATE INDEX IF NOT EXISTS ix_news_unenriched ON news (processed_at DESC)
+    WHERE processed_at IS NOT NULL AND duplicate_of IS NULL
+      AND (impact_label IS NULL OR cardinality(tickers) = 0);
+
+-- /aggregates/historical/{sector_id}
+CREATE INDEX IF NOT EXISTS ix_sentiment_aggregates_sector_window
+    ON sentiment_aggregates (sector_id, window_start);
@@ -0,0 +1,24 @@
+-- Normalized (news_id, ticker) rows for ticker lookups and trending rankings.
+-- Table and index names match app/models/news_ticker.py.
+CREATE TABLE IF NOT EXISTS news_tickers (
+    news_id INTEGER NOT NULL REFERENCES news (id) ON DELETE CASCADE,
+    ticker VARCHAR NOT NULL,
+    published_at TIMESTAMPTZ,
+    processed_at TIMESTAMPTZ,
+    sentiment_score DOUBLE PRECISION,
+    impact_confidence DOUBLE PRECISION,
+    PRIMARY KEY (news_id, ticker)
+);
+
+CREATE INDEX IF NOT EXISTS ix_news_tickers_ticker_published_at ON news_tickers (ticker, published_at DESC);
+CREATE INDEX IF NOT EXISTS ix_news_tickers_ticker_processed_at ON news_tickers (ticker, processed_at DESC);
+CREATE INDEX IF NOT EXISTS ix_news_tickers_published_at ON news_tickers (published_at DESC);
+
+-- Backfill from existing articles
+INSERT INTO news_tickers (news_id, ticker, published_at, processed_at, sentiment_score, impact_confidence)
+SELECT DISTINCT n.id, upper(t.ticker), coalesce(n.published_at, n.fetched_at),
+       n.processed_at, n.sentiment_score, n.impact_confidence
+FROM news n
+CROSS JOIN LATERAL unnest(n.tickers) AS t(ticker)
+WHERE t.ticker <> ''
+ON CONFLICT (news_id, ticker) DO NOTHING;
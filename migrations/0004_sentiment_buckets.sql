@@ -0,0 +1,21 @@
+-- Sector aggregates become fixed, aligned buckets upserted incrementally.
+
+ALTER TABLE sentiment_aggregates ADD COLUMN IF NOT EXISTS sentiment_sum DOUBLE PRECISION;
+ALTER TABLE sentiment_aggregates ADD COLUMN IF NOT EXISTS relevance_sum DOUBLE PRECISION;
+
+-- Legacy sliding-window rows overlap; the aggregator rebuilds every bucket
+-- from news on its first run (no watermark yet).
+DELETE FROM sentiment_aggregates WHERE sentiment_sum IS NULL;
+
+DROP INDEX IF EXISTS ix_sentiment_aggregates_sector_window;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_sentiment_aggregates_sector_window
+    ON sentiment_aggregates (sector_id, window_start);
+
+CREATE TABLE IF NOT EXISTS aggregator_state (
+    name VARCHAR(64) PRIMARY KEY,
+    watermark TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Bucket key: coalesce(published_at, fetched_at)
+CREATE INDEX IF NOT EXISTS ix_news_event_time ON news ((coalesce(published_at, fetched_at)));
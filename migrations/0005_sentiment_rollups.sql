@@ -0,0 +1,36 @@
+-- Hourly / daily rollup tiers over the sentiment_aggregates buckets.
+-- Names match app/models/sentiment_rollup.py and SentimentAggregate.__table_args__.
+CREATE TABLE IF NOT EXISTS sentiment_rollups (
+    resolution VARCHAR(8) NOT NULL,
+    sector_id INTEGER NOT NULL,
+    window_start TIMESTAMPTZ NOT NULL,
+    window_end TIMESTAMPTZ NOT NULL,
+    sentiment_sum DOUBLE PRECISION NOT NULL,
+    relevance_sum DOUBLE PRECISION NOT NULL,
+    news_count INTEGER NOT NULL,
+    avg_sentiment DOUBLE PRECISION,
+    avg_relevance DOUBLE PRECISION,
+    computed_at TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (resolution, sector_id, window_start)
+);
+
+CREATE INDEX IF NOT EXISTS ix_sentiment_rollups_resolution_window
+    ON sentiment_rollups (resolution, window_start);
+CREATE INDEX IF NOT EXISTS ix_sentiment_aggregates_window_start
+    ON sentiment_aggregates (window_start);
+
+-- Backfill from buckets already aggregated
+INSERT INTO sentiment_rollups (resolution, sector_id, window_start, window_end, sentiment_sum,
+                               relevance_sum, news_count, avg_sentiment, avg_relevance)
+SELECT tier.name, a.sector_id, b.start, b.start + tier.width,
+       sum(a.sentiment_sum), sum(a.relevance_sum), sum(a.news_count),
+       sum(a.sentiment_sum) / sum(a.news_count), sum(a.relevance_sum) / sum(a.news_count)
+FROM sentiment_aggregates a
+CROSS JOIN (VALUES ('1h', interval '1 hour'), ('1d', interval '1 day')) AS tier(name, width)
+CROSS JOIN LATERAL (
+    SELECT to_timestamp(floor(extract(epoch FROM a.window_start) / extract(epoch FROM tier.width))
+                        * extract(epoch FROM tier.width)) AS start
+) b
+WHERE a.sentiment_sum IS NOT NULL AND a.news_count > 0
+GROUP BY tier.name, tier.width, a.sector_id, b.start
+ON CONFLICT (resolution, sector_id, window_start) DO NOTHING;
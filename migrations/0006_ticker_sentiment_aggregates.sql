@@ -0,0 +1,30 @@
+-- Per-ticker sentiment buckets, maintained by the aggregator from news_tickers.
+-- Names match app/models/ticker_sentiment_aggregate.py.
+CREATE TABLE IF NOT EXISTS ticker_sentiment_aggregates (
+    ticker VARCHAR NOT NULL,
+    window_start TIMESTAMPTZ NOT NULL,
+    window_end TIMESTAMPTZ NOT NULL,
+    news_count INTEGER NOT NULL,
+    sentiment_sum DOUBLE PRECISION NOT NULL,
+    confidence_sum DOUBLE PRECISION NOT NULL,
+    weighted_sum DOUBLE PRECISION NOT NULL,
+    avg_sentiment DOUBLE PRECISION,
+    avg_confidence DOUBLE PRECISION,
+    weighted_score DOUBLE PRECISION,
+    computed_at TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (ticker, window_start)
+);
+
+CREATE INDEX IF NOT EXISTS ix_ticker_sentiment_aggregates_window_start
+    ON ticker_sentiment_aggregates (window_start);
+
+-- Per-ticker scores from source-provided ticker_sentiments (AlphaVantage)
+UPDATE news_tickers nt
+SET sentiment_score = coalesce((n.ticker_sentiments -> nt.ticker ->> 'score')::float, nt.sentiment_score),
+    impact_confidence = coalesce((n.ticker_sentiments -> nt.ticker ->> 'confidence')::float, nt.impact_confidence)
+FROM news n
+WHERE n.id = nt.news_id AND n.ticker_sentiments IS NOT NULL;
+
+-- Restart the incremental aggregator so its next run rebuilds every bucket,
+-- ticker buckets included, at the configured AGG_BUCKET_MINUTES width.
+DELETE FROM aggregator_state WHERE name = 'sector_buckets';
@@ -0,0 +1,11 @@
+-- Keyset pagination on (published_at, id) for /news/recent and /news/by-sector.
+-- Names match News.__table_args__; the new indexes supersede the
+-- published_at-only ones, which are dropped.
+CREATE INDEX IF NOT EXISTS ix_news_published_at_id ON news (published_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_news_sector_published_at_id ON news (sector_id, published_at DESC, id DESC);
+
+-- Articles without a publication time, paged after the dated ones
+CREATE INDEX IF NOT EXISTS ix_news_undated ON news (id DESC) WHERE published_at IS NULL;
+
+DROP INDEX IF EXISTS ix_news_published_at;
+DROP INDEX IF EXISTS ix_news_sector_published_at;
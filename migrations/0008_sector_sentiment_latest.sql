@@ -0,0 +1,20 @@
+-- Newest bucket per sector, maintained by the aggregator for /aggregates/latest.
+-- Names match app/models/sector_sentiment_latest.py.
+CREATE TABLE IF NOT EXISTS sector_sentiment_latest (
+    sector_id INTEGER PRIMARY KEY,
+    window_start TIMESTAMPTZ NOT NULL,
+    window_end TIMESTAMPTZ NOT NULL,
+    avg_sentiment DOUBLE PRECISION,
+    avg_relevance DOUBLE PRECISION,
+    news_count INTEGER,
+    computed_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Backfill from buckets already aggregated
+INSERT INTO sector_sentiment_latest (sector_id, window_start, window_end, avg_sentiment,
+                                     avg_relevance, news_count)
+SELECT DISTINCT ON (sector_id)
+       sector_id, window_start, window_end, avg_sentiment, avg_relevance, news_count
+FROM sentiment_aggregates
+ORDER BY sector_id, window_start DESC
+ON CONFLICT (sector_id) DO NOTHING;
@@ -0,0 +1,12 @@
+-- Completion marker for Gemini enrichment. The backlog used to be
+-- "impact_label IS NULL OR no tickers", so articles the LLM legitimately
+-- left without tickers were re-enriched on every drain.
+ALTER TABLE news ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMPTZ;
+
+UPDATE news SET enriched_at = processed_at
+    WHERE enriched_at IS NULL AND impact_label IS NOT NULL;
+
+-- Processed but not yet enriched (fetch_unenriched_news); name matches News.__table_args__
+DROP INDEX IF EXISTS ix_news_unenriched;
+CREATE INDEX IF NOT EXISTS ix_news_unenriched ON news (processed_at DESC)
+    WHERE processed_at IS NOT NULL AND duplicate_of IS NULL AND enriched_at IS NULL;
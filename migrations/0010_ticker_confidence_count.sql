@@ -0,0 +1,8 @@
+-- Articles counted in each ticker bucket's confidence average; those
+-- without an impact_confidence no longer pull avg_confidence towards 0.
+-- Name matches app/models/ticker_sentiment_aggregate.py.
+ALTER TABLE ticker_sentiment_aggregates
+    ADD COLUMN IF NOT EXISTS confidence_count INTEGER NOT NULL DEFAULT 0;
+
+-- Restart the incremental aggregator so its next run rebuilds every bucket
+DELETE FROM aggregator_state WHERE name = 'sector_buckets';
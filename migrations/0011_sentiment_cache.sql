@@ -0,0 +1,14 @@
+-- Persistent tier of the sentiment cache (CachedSentimentBackend).
+-- Names match app/models/sentiment_cache.py.
+CREATE TABLE IF NOT EXISTS sentiment_cache (
+    model VARCHAR(256) NOT NULL,
+    text_hash VARCHAR(64) NOT NULL,
+    sentiment DOUBLE PRECISION NOT NULL,
+    confidence DOUBLE PRECISION NOT NULL,
+    label VARCHAR(32) NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (model, text_hash)
+);
+
+-- TTL reads and prune()
+CREATE INDEX IF NOT EXISTS ix_sentiment_cache_created_at ON sentiment_cache (created_at);
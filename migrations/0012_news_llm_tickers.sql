@@ -0,0 +1,4 @@
+-- Tickers exactly as Gemini returned them, so the enrichment cache can be
+-- warmed with the raw signal rather than the merged news.tickers.
+-- Name matches News.llm_tickers; older rows stay NULL and are not reused.
+ALTER TABLE news ADD COLUMN IF NOT EXISTS llm_tickers VARCHAR[];
@@ -0,0 +1,7 @@
+import os
+
+# app.core.db builds its engine at import time; nothing here connects to it
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/test")
+
+# The Gemini client is also built at import time and needs some key
+os.environ.setdefault("GEMINI_API_KEY", "test")
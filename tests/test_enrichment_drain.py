@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.models.news import News
+from app.services import news_signal_service as svc
+
+
+class StubSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def add(self, obj):
+        pass
+
+    async def commit(self):
+        pass
+
+
+class StubBacklog:
+    """
+    Unenriched rows handed out by a SKIP LOCKED-style claim. Each claim
+    yields to the loop first, like a round trip, so two workers' claims
+    overlap and the second one can come back empty.
+    """
+
+    def __init__(self, ids):
+        self.rows = [News(id=i, title=f"Headline {i}", content="", tickers=[]) for i in ids]
+        self.claims = []
+
+    async def fetch(self, db, *, limit=10, claim=False, exclude_ids=None):
+        await asyncio.sleep(0)
+        batch, self.rows = self.rows[:limit], self.rows[limit:]
+        self.claims.append([n.id for n in batch])
+        return batch
+
+    async def count(self, db):
+        return len(self.rows)
+
+
+async def stub_llm(prompt, *, estimated_tokens=None):
+    await asyncio.sleep(0)  # still enriching while the other worker claims
+    ids = [int(line.split('"id":')[1].split(",")[0]) for line in prompt.splitlines() if line.startswith('{"id":')]
+    return {
+        "results": [
+            {"id": i, "tickers": [], "impact_label": "neutral", "impact_confidence": 0.5,
+             "impact_summary": "", "topics": []}
+            for i in ids
+        ],
+        "failed_ids": [],
+    }
+
+
+@pytest.fixture
+def backlog(monkeypatch):
+    rows = StubBacklog([1, 2, 3])
+    monkeypatch.setattr(svc, "AsyncSessionLocal", StubSession)
+    monkeypatch.setattr(svc, "fetch_unenriched_news", rows.fetch)
+    monkeypatch.setattr(svc, "count_unenriched_news", rows.count)
+    monkeypatch.setattr(svc, "call_llm_for_signals", stub_llm)
+    monkeypatch.setattr(svc, "detect_tickers_from_text", lambda text: [])
+    monkeypatch.setattr(svc.enrichment_cache, "lookup", lambda batch: ({}, list(batch)))
+    monkeypatch.setattr(svc.enrichment_cache, "store", lambda article, result: None)
+
+    async def no_propagation(db, canonical_ids):
+        pass
+
+    monkeypatch.setattr(svc.NewsService, "propagate_from_canonical", no_propagation)
+    return rows
+
+
+def test_worker_stops_on_its_own_empty_claim(backlog):
+    stats = asyncio.run(svc.drain_enrichment_backlog(batch_size=1, workers=2, time_budget=60, max_calls=10))
+
+    # Worker B's last claim comes back empty while A claims row 3; B stops
+    # there instead of claiming again, and the empty claims aren't batches
+    assert backlog.claims == [[1], [2], [3], [], []]
+    assert stats["enriched"] == 3
+    assert stats["batches"] == 3
+    assert stats["backlog_after"] == 0
+
+
+def test_idle_workers_do_not_spend_the_call_budget(backlog):
+    stats = asyncio.run(svc.drain_enrichment_backlog(batch_size=1, workers=2, time_budget=60, max_calls=3))
+
+    assert stats["enriched"] == 3
+    assert stats["batches"] == 3
@@ -0,0 +1,88 @@
+import json
+
+from app.services.llm_stream_parser import ResultsStreamParser
+
+
+def item(news_id, summary="Short impact", tickers=("RELIANCE.NS",)):
+    return {
+        "id": news_id,
+        "tickers": list(tickers),
+        "impact_label": "bullish",
+        "impact_confidence": 0.8,
+        "impact_summary": summary,
+        "topics": [],
+    }
+
+
+def parse(text, chunk_size=None):
+    """Feed `text` in chunks of `chunk_size` characters (all at once if None)."""
+    parser = ResultsStreamParser()
+    size = chunk_size or len(text)
+    results = []
+    for i in range(0, len(text), size):
+        results.extend(parser.feed(text[i:i + size]))
+    results.extend(parser.close())
+    return results, parser.failed_ids
+
+
+def test_chunk_boundaries_inside_strings_and_escapes():
+    tricky = item(1, summary='Says "buy" {now}, then \\ backs off ] [')
+    text = json.dumps({"results": [tricky, item(2, tickers=["TCS.NS"])]})
+
+    for size in (1, 2, 3, 7):
+        results, failed = parse(text, chunk_size=size)
+        assert results == [tricky, item(2, tickers=["TCS.NS"])]
+        assert failed == []
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    first = json.dumps(item(1))
+    parser = ResultsStreamParser()
+
+    assert parser.feed('{"results": [' + first[:-1]) == []
+    assert parser.feed(first[-1] + ", ") == [item(1)]
+    assert parser.feed(json.dumps(item(2)) + "]}") == [item(2)]
+    assert parser.close() == []
+
+
+def test_truncated_final_object_is_reported():
+    text = '{"results": [' + json.dumps(item(1)) + ", " + json.dumps(item(2)) + ', {"id": 3, "tickers": ["INF'
+
+    results, failed = parse(text, chunk_size=5)
+    assert results == [item(1), item(2)]
+    assert failed == [3]
+
+
+def test_malformed_item_between_good_ones():
+    text = (
+        '{"results": ['
+        + json.dumps(item(1))
+        + ', {"id": 2, "impact_label": bullish, "impact_confidence": 0.4}, '
+        + json.dumps(item(3))
+        + "]}"
+    )
+
+    results, failed = parse(text, chunk_size=4)
+    assert results == [item(1), item(3)]
+    assert failed == [2]
+
+
+def test_unclosed_string_does_not_swallow_later_items():
+    text = (
+        '{"results": ['
+        + '{"id": 1, "impact_summary": "cut off}, '
+        + json.dumps(item(2))
+        + "]}"
+    )
+
+    results, failed = parse(text, chunk_size=3)
+    assert results == [item(2)]
+    assert failed == [1]
+
+
+def test_markdown_fenced_bare_array():
+    text = "```json\n" + json.dumps([item(1), item(2)]) + "\n```"
+
+    results, failed = parse(text, chunk_size=6)
+    assert results == [item(1), item(2)]
+    assert failed == []
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.sentiment.local_engine import LocalSentimentEngine
+
+LABELS = ["positive", "negative", "neutral"]
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with the `__call__` / `pad` surface the engine uses."""
+
+    def __init__(self):
+        self.calls = 0
+        self.padded_widths = []
+
+    def __call__(self, texts, truncation=True, max_length=512):
+        self.calls += 1
+        ids = [list(range(1, len(t.split()) + 1))[:max_length] for t in texts]
+        return {"input_ids": ids, "attention_mask": [[1] * len(i) for i in ids]}
+
+    def pad(self, features, padding="longest", return_tensors=None):
+        width = max(len(f["input_ids"]) for f in features)
+        self.padded_widths.append(width)
+        return {
+            key: [f[key] + [0] * (width - len(f[key])) for f in features]
+            for key in features[0]
+        }
+
+
+class StubEngine(LocalSentimentEngine):
+    """Scores by real (unpadded) length: >3 words positive, else negative."""
+
+    def __init__(self, **kwargs):
+        super().__init__("stub-model", **kwargs)
+        self._tokenizer = StubTokenizer()
+        self._model = object()  # skips _load
+        self._labels = LABELS
+        self.forward_sizes = []
+
+    def _forward(self, features):
+        self.forward_sizes.append(len(features["input_ids"]))
+        return [
+            [0.9, 0.05, 0.05] if sum(mask) > 3 else [0.05, 0.9, 0.05]
+            for mask in features["attention_mask"]
+        ]
+
+
+TEXTS = [
+    "one two three four five six",
+    "short",
+    "a b c d e",
+    "tiny text",
+    "x y z w",
+]
+
+
+def test_buckets_pad_to_their_own_longest_text():
+    engine = StubEngine(max_batch=2)
+    results = engine._infer(TEXTS, bucket_size=2)
+
+    assert engine._tokenizer.calls == 1  # tokenized once, not per bucket
+    assert engine.forward_sizes == [2, 2, 1]
+    assert engine._tokenizer.padded_widths == [2, 5, 6]  # sorted by length
+    assert [r["label"] for r in results] == ["positive", "negative", "positive", "negative", "positive"]
+    assert results[0]["sentiment"] == pytest.approx(0.9)
+    assert results[1]["sentiment"] == pytest.approx(-0.9)
+
+
+def test_analyze_batch_honours_batch_size():
+    engine = StubEngine(max_batch=32)
+    results = asyncio.run(engine.analyze_batch(TEXTS, batch_size=3))
+
+    assert len(results) == len(TEXTS)
+    assert engine.forward_sizes == [3, 2]
+
+
+def test_analyze_text_calls_are_coalesced():
+    engine = StubEngine(max_batch=8, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(*(engine.analyze_text(t) for t in TEXTS))
+        await engine.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert [r["label"] for r in results] == ["positive", "negative", "positive", "negative", "positive"]
+    assert engine.forward_sizes == [5]
+
+
+def test_aclose_cancels_waiting_callers():
+    engine = StubEngine(max_batch=8, max_wait_ms=10_000)
+
+    async def run():
+        waiting = asyncio.ensure_future(engine.analyze_text("never scored"))
+        await asyncio.sleep(0.01)  # let the batcher pick it up
+        await engine.aclose()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    asyncio.run(run())
+    assert engine.forward_sizes == []
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta, timezone
+
+from app.analytics.rollups import BASE_TIER, covering_base_buckets, floor_to
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=timezone.utc)
+DAY = timedelta(days=1)
+SLOTS_PER_DAY = int(DAY / BASE_TIER.width)
+
+
+def test_recent_buckets_are_kept_as_is():
+    recent = [floor_to(NOW - timedelta(hours=h), BASE_TIER.width) for h in (1, 5)]
+    assert covering_base_buckets(recent, NOW) == sorted(recent)
+
+
+def test_old_bucket_pulls_in_its_whole_day():
+    old = floor_to(NOW - timedelta(days=BASE_TIER.retention_days + 10), BASE_TIER.width) + BASE_TIER.width
+    covered = covering_base_buckets([old], NOW)
+
+    day = floor_to(old, DAY)
+    assert covered[0] == day
+    assert covered[-1] == day + DAY - BASE_TIER.width
+    assert len(covered) == SLOTS_PER_DAY
+
+
+def test_day_straddling_the_cutoff_is_covered():
+    cutoff = NOW - timedelta(days=BASE_TIER.retention_days)
+    after_cutoff = floor_to(cutoff, BASE_TIER.width) + BASE_TIER.width
+    assert floor_to(after_cutoff, DAY) < cutoff  # the day straddles the cutoff
+
+    covered = covering_base_buckets([after_cutoff], NOW)
+    assert len(covered) == SLOTS_PER_DAY
+    assert all(floor_to(b, DAY) == floor_to(after_cutoff, DAY) for b in covered)
@@ -0,0 +1,146 @@
+import asyncio
+import os
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import cache as core_cache
+from app.core.config import settings
+from app.sentiment import cache as sentiment_cache
+from app.sentiment.cache import CachedSentimentBackend, text_hash
+
+# Persistent-tier tests need a disposable Postgres database
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+class StubBackend:
+    """Scores every text positive, except "broken" which fails (confidence 0)."""
+
+    def __init__(self):
+        self.scored = []
+
+    async def analyze_batch(self, texts, batch_size=None):
+        self.scored.append(list(texts))
+        return [
+            {"sentiment": 0.0, "confidence": 0.0, "label": "neutral"} if t == "broken"
+            else {"sentiment": 0.5, "confidence": 0.9, "label": "positive"}
+            for t in texts
+        ]
+
+
+def make_cache(persist=False):
+    backend = StubBackend()
+    cached = CachedSentimentBackend(backend, "stub-model")
+    cached.persist = persist
+    return cached, backend
+
+
+def test_text_hash_ignores_whitespace_and_width():
+    assert text_hash("Nifty  up\n today ") == text_hash("Nifty up today")
+    assert text_hash("ＮＩＦＴＹ") == text_hash("NIFTY")  # NFKC folds full-width forms
+    assert text_hash("Nifty up") != text_hash("Nifty down")
+
+
+def test_misses_are_scored_once_then_hit():
+    cached, backend = make_cache()
+
+    first = asyncio.run(cached.analyze_batch(["rally", "slump", " rally "]))
+    second = asyncio.run(cached.analyze_batch(["slump", "rally"]))
+
+    assert len(backend.scored) == 1 and len(backend.scored[0]) == 2  # one inference per distinct text
+    assert [r["label"] for r in first] == ["positive"] * 3
+    assert second == first[1:]
+    assert cached.stats()["memory"]["hits"] == 2
+
+
+def test_failed_scores_are_not_cached():
+    cached, backend = make_cache()
+
+    asyncio.run(cached.analyze_batch(["broken"]))
+    asyncio.run(cached.analyze_batch(["broken"]))
+
+    assert backend.scored == [["broken"], ["broken"]]
+
+
+def test_memory_entries_expire_after_ttl(monkeypatch):
+    cached, backend = make_cache()
+    clock = [1000.0]
+    monkeypatch.setattr(core_cache, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    asyncio.run(cached.analyze_batch(["rally"]))
+    clock[0] += cached.ttl.total_seconds() - 1
+    asyncio.run(cached.analyze_batch(["rally"]))
+    clock[0] += 2
+    asyncio.run(cached.analyze_batch(["rally"]))
+
+    assert backend.scored == [["rally"], ["rally"]]
+
+
+# -------------------------------------------------------------
+# PERSISTENT TIER
+# -------------------------------------------------------------
+@pytest.fixture
+def cache_db(monkeypatch):
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+
+    from sqlalchemy import update
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from app.models.sentiment_cache import SentimentCacheEntry
+
+    table = SentimentCacheEntry.__table__
+    engine = create_async_engine(TEST_DATABASE_URL)
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(sentiment_cache, "AsyncSessionLocal", sessions)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: table.drop(c, checkfirst=True))
+            await conn.run_sync(lambda c: table.create(c))
+
+    async def age(keys, delta):
+        async with engine.begin() as conn:
+            await conn.execute(
+                update(table)
+                .where(table.c.text_hash.in_(keys))
+                .values(created_at=datetime.now(timezone.utc) - delta)
+            )
+
+    async def count():
+        async with engine.connect() as conn:
+            return len((await conn.execute(table.select())).all())
+
+    asyncio.run(setup())
+    yield age, count
+    asyncio.run(engine.dispose())
+
+
+def test_db_tier_serves_other_processes_within_ttl(cache_db):
+    age, _ = cache_db
+    writer, _ = make_cache(persist=True)
+    asyncio.run(writer.analyze_batch(["rally", "slump"]))
+
+    reader, backend = make_cache(persist=True)  # empty memory tier
+    asyncio.run(reader.analyze_batch(["rally"]))
+    assert backend.scored == []
+    assert reader.db_hits == 1
+
+    asyncio.run(age([text_hash("slump")], reader.ttl + timedelta(minutes=1)))
+    asyncio.run(reader.analyze_batch(["slump"]))
+    assert backend.scored == [["slump"]]
+    assert reader.db_misses == 1
+
+
+def test_prune_drops_expired_then_oldest_overflow(cache_db, monkeypatch):
+    age, count = cache_db
+    cached, _ = make_cache(persist=True)
+    monkeypatch.setattr(settings, "SENTIMENT_CACHE_MAX_ROWS", 3)
+
+    # Stored in one statement, so all five share created_at
+    asyncio.run(cached.analyze_batch(["a", "b", "c", "d", "e"]))
+    asyncio.run(age([text_hash("e")], cached.ttl + timedelta(minutes=1)))
+
+    assert asyncio.run(cached.prune()) == 2  # one expired + one past the cap
+    assert asyncio.run(count()) == 3
+    assert asyncio.run(cached.prune()) == 0